@@ -0,0 +1,162 @@
+# cython: language_level = 3
+
+"""
+_vec3.pyx: The Vec3 class, compiled with Cython for speed
+
+This is part of the OpenMM molecular simulation toolkit originating from
+Simbios, the NIH National Center for Physics-Based Simulation of
+Biological Structures at Stanford, funded under the NIH Roadmap for
+Medical Research, grant U54 GM072970. See https://simtk.org.
+
+Portions copyright (c) 2012-2025 Stanford University and the Authors.
+Authors: Peter Eastman
+Contributors:
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+THE AUTHORS, CONTRIBUTORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE
+USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+__author__ = "Peter Eastman"
+__version__ = "1.0"
+
+from collections import namedtuple
+import numpy
+from openmm.unit import Quantity, Unit, is_quantity
+
+cdef extern from "Python.h":
+    void PyObject_GC_UnTrack(object op)
+
+cdef inline object _createVec3(object x, object y, object z):
+    """Create a Vec3 directly, bypassing the Python level __new__() method."""
+    return tuple.__new__(Vec3, (x, y, z))
+
+class Vec3(namedtuple('Vec3', ['x', 'y', 'z'])):
+    """Vec3 is a 3-element tuple that supports many math operations."""
+
+    __slots__ = ()
+
+    def __new__(cls, x, y, z):
+        """Create a new Vec3."""
+        if cls is Vec3:
+            return _createVec3(x, y, z)
+        return tuple.__new__(cls, (x, y, z))
+
+    def __getnewargs__(self):
+        "Support for pickle protocol 2: http://docs.python.org/2/library/pickle.html#pickling-and-unpickling-normal-class-instances"
+        return self[0], self[1], self[2]
+
+    def __add__(self, other):
+        """Add two Vec3s."""
+        cdef tuple s = <tuple>self
+        return _createVec3(s[0]+other[0], s[1]+other[1], s[2]+other[2])
+
+    def __radd__(self, other):
+        """Add two Vec3s."""
+        cdef tuple s = <tuple>self
+        return _createVec3(s[0]+other[0], s[1]+other[1], s[2]+other[2])
+
+    def __sub__(self, other):
+        """Add two Vec3s."""
+        cdef tuple s = <tuple>self
+        return _createVec3(s[0]-other[0], s[1]-other[1], s[2]-other[2])
+
+    def __rsub__(self, other):
+        """Add two Vec3s."""
+        cdef tuple s = <tuple>self
+        return _createVec3(other[0]-s[0], other[1]-s[1], other[2]-s[2])
+
+    def __mul__(self, other):
+        """Multiply a Vec3 by a constant."""
+        if isinstance(other, Unit):
+            return Quantity(self, other)
+        cdef tuple s = <tuple>self
+        return _createVec3(other*s[0], other*s[1], other*s[2])
+
+    def __rmul__(self, other):
+        """Multiply a Vec3 by a constant."""
+        if isinstance(other, Unit):
+            return Quantity(self, other)
+        cdef tuple s = <tuple>self
+        return _createVec3(other*s[0], other*s[1], other*s[2])
+
+    def __div__(self, other):
+        """Divide a Vec3 by a constant."""
+        cdef tuple s = <tuple>self
+        return _createVec3(s[0]/other, s[1]/other, s[2]/other)
+    __truediv__ = __div__
+
+    def __deepcopy__(self, memo):
+        cdef tuple s = <tuple>self
+        return _createVec3(s[0], s[1], s[2])
+
+    def __neg__(self):
+        cdef tuple s = <tuple>self
+        return _createVec3(-s[0], -s[1], -s[2])
+
+Vec3.__module__ = 'openmm.vec3'
+
+def _checkArrayShape(array):
+    """Raise a ValueError if an array does not have shape (N, 3)."""
+    if array.ndim != 2 or array.shape[1] != 3:
+        raise ValueError('Expected an array of shape (N, 3), but the shape is %s' % (array.shape,))
+
+def vec3ListToArray(vectors):
+    """Convert a list of Vec3s (or other 3-element sequences) to a Numpy array of shape (N, 3).
+
+    If the input is a Quantity, the result is a Quantity with the same units.
+    """
+    if is_quantity(vectors):
+        return Quantity(vec3ListToArray(vectors._value), vectors.unit)
+    if isinstance(vectors, numpy.ndarray):
+        _checkArrayShape(vectors)
+        return numpy.array(vectors, dtype=numpy.float64)
+    cdef Py_ssize_t n = len(vectors), i
+    result = numpy.empty((n, 3), dtype=numpy.float64)
+    cdef double[:, ::1] values = result
+    cdef tuple t
+    for i in range(n):
+        v = vectors[i]
+        if type(v) is Vec3 or type(v) is tuple:
+            t = <tuple>v
+            values[i, 0] = t[0]
+            values[i, 1] = t[1]
+            values[i, 2] = t[2]
+        else:
+            values[i, 0] = v[0]
+            values[i, 1] = v[1]
+            values[i, 2] = v[2]
+    return result
+
+def arrayToVec3List(array):
+    """Convert an array of shape (N, 3) to a list of Vec3s.
+
+    If the input is a Quantity, the result is a Quantity with the same units.
+    """
+    if is_quantity(array):
+        return Quantity(arrayToVec3List(array._value), array.unit)
+    array = numpy.asarray(array, dtype=numpy.float64)
+    _checkArrayShape(array)
+    cdef double[:, :] values = array
+    cdef Py_ssize_t n = values.shape[0], i
+    cdef list result = [None]*n
+    for i in range(n):
+        # A Vec3 containing only floats can never be part of a reference cycle, so there is no need for the
+        # garbage collector to track it.  This is what Python does for ordinary tuples of floats.
+        v = _createVec3(values[i, 0], values[i, 1], values[i, 2])
+        PyObject_GC_UnTrack(v)
+        result[i] = v
+    return result
@@ -35,6 +35,7 @@ __version__ = "1.0"
 from functools import wraps
 from openmm.app.internal import amber_file_parser
 from openmm.unit import Quantity, nanometers, picoseconds
+from openmm.vec3 import vec3ListToArray
 import warnings
 try:
     import numpy as np
@@ -97,7 +98,7 @@ class AmberInpcrdFile(object):
         """
         if asNumpy:
             if self._numpyPositions is None:
-                self._numpyPositions = Quantity(np.array(self.positions.value_in_unit(nanometers)), nanometers)
+                self._numpyPositions = Quantity(vec3ListToArray(self.positions.value_in_unit(nanometers)), nanometers)
             return self._numpyPositions
         return self.positions
 
@@ -114,7 +115,7 @@ class AmberInpcrdFile(object):
             raise AttributeError('velocities not found in %s' % self.file)
         if asNumpy:
             if self._numpyVelocities is None:
-                self._numpyVelocities = Quantity(np.array(self.velocities.value_in_unit(nanometers/picoseconds)), nanometers/picoseconds)
+                self._numpyVelocities = Quantity(vec3ListToArray(self.velocities.value_in_unit(nanometers/picoseconds)), nanometers/picoseconds)
             return self._numpyVelocities
         return self.velocities
 
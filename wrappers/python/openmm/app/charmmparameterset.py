@@ -34,7 +34,10 @@ OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE
 USE OR OTHER DEALINGS IN THE SOFTWARE.
 """
 from __future__ import absolute_import
+import hashlib
 import os
+import pickle
+import tempfile
 from openmm.app.internal.charmm._charmmfile import (
             CharmmFile, CharmmStreamFile)
 from openmm.app.internal.charmm.topologyobjects import (
@@ -44,6 +47,10 @@ from openmm.app.internal.charmm.exceptions import CharmmFileError
 from openmm.app.element import Element, get_by_symbol
 import warnings
 
+# The version of the snapshot files written by CharmmParameterSet.loadSet().  Increment this
+# whenever a change to the parameter set classes makes existing snapshots invalid.
+_SNAPSHOT_VERSION = 1
+
 class CharmmParameterSet(object):
     """
     Stores a parameter set defined by CHARMM files. It stores the equivalent of
@@ -149,7 +156,7 @@ class CharmmParameterSet(object):
         for strf in strs: self.readStreamFile(strf)
 
     @classmethod
-    def loadSet(cls, tfile=None, pfile=None, sfiles=[], permissive=False):
+    def loadSet(cls, tfile=None, pfile=None, sfiles=[], permissive=False, snapshot=None):
         """
         Instantiates a CharmmParameterSet from a Topology file and a Parameter
         file (or just a Parameter file if it has all information)
@@ -164,6 +171,13 @@ class CharmmParameterSet(object):
             List or tuple of stream (STR) file names.
         permissive : bool=False
             Accept non-bonbded parameters for undefined atom types
+        snapshot : str=None
+            Name of a file in which to cache the parsed parameter set.  If the
+            file exists and was created from files with the same contents, the
+            parameter set is loaded from it instead of parsing the files.
+            Otherwise the files are parsed and the result is saved to it.  The
+            snapshot is stored with pickle, so only load snapshots you created
+            yourself.  This is ignored unless all files are given by name.
 
         Returns
         -------
@@ -179,20 +193,78 @@ class CharmmParameterSet(object):
         came before (or simply append to the existing set if they are
         different)
         """
+        if isinstance(sfiles, str):
+            # The API docstring requests a list, but allow for users to pass a
+            # string with a single filename instead
+            sfiles = [sfiles]
+        elif sfiles is None:
+            sfiles = []
+        key = None
+        if snapshot is not None:
+            key = cls._snapshotKey(tfile, pfile, sfiles, permissive)
+            if key is not None:
+                inst = cls._loadSnapshot(snapshot, key)
+                if inst is not None:
+                    return inst
         inst = cls()
         if tfile is not None:
             inst.readTopologyFile(tfile)
         if pfile is not None:
             inst.readParameterFile(pfile, permissive=permissive)
-        if isinstance(sfiles, str):
-            # The API docstring requests a list, but allow for users to pass a
-            # string with a single filename instead
-            inst.readStreamFile(sfiles)
-        elif sfiles is not None:
-            for sfile in sfiles:
-                inst.readStreamFile(sfile)
+        for sfile in sfiles:
+            inst.readStreamFile(sfile)
+        if key is not None:
+            inst._saveSnapshot(snapshot, key)
+        return inst
+
+    @staticmethod
+    def _snapshotKey(tfile, pfile, sfiles, permissive):
+        """Compute the key identifying a snapshot created from a set of files, based
+        on their contents.  Returns None if any of them is not specified by name."""
+        def fileHash(filename):
+            if filename is None:
+                return None
+            with open(filename, 'rb') as f:
+                return hashlib.sha256(f.read()).hexdigest()
+        if not all(f is None or isinstance(f, str) for f in [tfile, pfile]+list(sfiles)):
+            return None
+        return (_SNAPSHOT_VERSION, bool(permissive), fileHash(tfile), fileHash(pfile), tuple(fileHash(f) for f in sfiles))
+
+    @classmethod
+    def _loadSnapshot(cls, snapshot, key):
+        """Load a parameter set from a snapshot file.  Returns None if the file does
+        not exist, cannot be read, or was created from different files."""
+        if not os.path.isfile(snapshot):
+            return None
+        try:
+            with open(snapshot, 'rb') as f:
+                if pickle.load(f) != key:
+                    return None
+                inst = pickle.load(f)
+        except Exception:
+            # The snapshot is damaged or was written by an incompatible version, so just parse the files.
+            return None
+        if not isinstance(inst, cls):
+            return None
         return inst
 
+    def _saveSnapshot(self, snapshot, key):
+        """Save this parameter set to a snapshot file."""
+        # Write to a temporary file and then rename it, so other processes never see a partly written snapshot.
+        directory = os.path.dirname(os.path.abspath(snapshot))
+        try:
+            fd, tempname = tempfile.mkstemp(dir=directory, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    pickle.dump(key, f, pickle.HIGHEST_PROTOCOL)
+                    pickle.dump(self, f, pickle.HIGHEST_PROTOCOL)
+                os.replace(tempname, snapshot)
+            except:
+                os.remove(tempname)
+                raise
+        except (OSError, pickle.PicklingError) as e:
+            warnings.warn('Could not save CHARMM parameter snapshot %s: %s' % (snapshot, e))
+
     def readParameterFile(self, pfile, permissive=False):
         """Reads all of the parameters from a parameter file. Versions 36 and later
         of the CHARMM force field files have an ATOMS section defining all of
@@ -39,6 +39,7 @@ from math import pi, cos, sin, sqrt
 import os
 import re
 import sys
+import numpy as np
 import openmm as mm
 from openmm.vec3 import Vec3
 import openmm.unit as u
@@ -479,35 +480,13 @@ class CharmmPsfFile(object):
             self.box_vectors = periodicBoxVectors
 
     def _build_exclusion_list(self):
-        pair_12_set = set()
-        pair_13_set = set()
-        pair_14_set = set()
-        for bond in self.bond_list:
-            a1, a2 = bond.atom1, bond.atom2
-            pair = (min(a1.idx, a2.idx), max(a1.idx, a2.idx),)
-            pair_12_set.add(pair)
-        for bond in self.bond_list:
-            a2, a3 = bond.atom1, bond.atom2
-            for a1 in a2.bond_partners:
-                pair = (min(a1.idx, a3.idx), max(a1.idx, a3.idx),)
-                if a1 != a3:
-                    pair_13_set.add(pair)
-            for a4 in a3.bond_partners:
-                pair = (min(a2.idx, a4.idx), max(a2.idx, a4.idx),)
-                if a2 != a4:
-                    pair_13_set.add(pair)
-        for bond in self.bond_list:
-            a2, a3 = bond.atom1, bond.atom2
-            for a1 in a2.bond_partners:
-                for a4 in a3.bond_partners:
-                    pair = (min(a1.idx, a4.idx), max(a1.idx, a4.idx),)
-                    if a1 != a3 and a2 != a4 and a1 != a4:
-                        pair_14_set.add(pair)
-
+        # Pairs are classified by the smallest number of bonds separating them,
         # in case there are 3,4,5-member rings
-        self.pair_12_list = list(sorted(pair_12_set))
-        self.pair_13_list = list(sorted(pair_13_set - pair_12_set))
-        self.pair_14_list = list(sorted(pair_14_set - pair_13_set.union(pair_12_set)))
+        bonds = [(bond.atom1.idx, bond.atom2.idx) for bond in self.bond_list]
+        pairs = ff._findExclusions(bonds, 3, len(self.atom_list))
+        self.pair_12_list = [(a1, a2) for a1, a2, sep in pairs if sep == 1]
+        self.pair_13_list = [(a1, a2) for a1, a2, sep in pairs if sep == 2]
+        self.pair_14_list = [(a1, a2) for a1, a2, sep in pairs if sep == 3]
 
     @staticmethod
     def _convert(string, type, message):
@@ -936,30 +915,36 @@ class CharmmPsfFile(object):
         except AttributeError:
             pass
 
-        # Set up the constraints
+        # Flatten the atoms and bonds into arrays, so terms can be selected
+        # and added to the forces in bulk
+        atomic_numbers = np.array([atom.type.atomic_number for atom in self.atom_list], dtype=np.int64)
+        atom_in_water = np.array([atom.residue.resname in WATNAMES for atom in self.atom_list], dtype=bool)
+        bond_atoms = np.array([(bond.atom1.idx, bond.atom2.idx) for bond in self.bond_list], dtype=np.int64).reshape(-1, 2)
+        bond_params = np.array([(bond.bond_type.req, bond.bond_type.k) for bond in self.bond_list], dtype=np.float64).reshape(-1, 2)
+        bond_lengths = bond_params[:,0]*length_conv
+        bond_has_h = np.any(atomic_numbers[bond_atoms] == 1, axis=1)
+        bond_in_water = atom_in_water[bond_atoms[:,0]] & np.all(np.sort(atomic_numbers[bond_atoms], axis=1) == (1, 8), axis=1)
+
         def _is_bond_in_water(bond):
             return bond.atom1.residue.resname in WATNAMES and \
                    tuple(sorted([bond.atom1.type.atomic_number, bond.atom2.type.atomic_number])) == (1, 8)
 
+        # Set up the constraints
         n_cons_bond = n_cons_angle = 0
         if verbose and (constraints is not None or rigidWater):
             print('Adding constraints...')
 
-        for bond in self.bond_list:
-            if constraints in (ff.AllBonds, ff.HAngles):
-                system.addConstraint(bond.atom1.idx, bond.atom2.idx,
-                                     bond.bond_type.req*length_conv)
-                n_cons_bond += 1
-            elif constraints is ff.HBonds:
-                if bond.atom1.type.atomic_number == 1 or bond.atom2.type.atomic_number == 1:
-                    system.addConstraint(bond.atom1.idx, bond.atom2.idx,
-                                         bond.bond_type.req*length_conv)
-                    n_cons_bond += 1
-            elif rigidWater:
-                if _is_bond_in_water(bond):
-                    system.addConstraint(bond.atom1.idx, bond.atom2.idx,
-                                         bond.bond_type.req*length_conv)
-                    n_cons_bond += 1
+        if constraints in (ff.AllBonds, ff.HAngles):
+            constrained_bonds = np.ones(len(bond_atoms), dtype=bool)
+        elif constraints is ff.HBonds:
+            constrained_bonds = bond_has_h
+        elif rigidWater:
+            constrained_bonds = bond_in_water
+        else:
+            constrained_bonds = np.zeros(len(bond_atoms), dtype=bool)
+        for (i, j), length in zip(bond_atoms[constrained_bonds].tolist(), bond_lengths[constrained_bonds].tolist()):
+            system.addConstraint(i, j, length)
+            n_cons_bond += 1
 
         # Add virtual sites
         if hasattr(self, 'lonepair_list'):
@@ -998,87 +983,71 @@ class CharmmPsfFile(object):
         omit_all = not flexibleConstraints and constraints in (ff.AllBonds, ff.HAngles)
         omit_h = not flexibleConstraints and constraints is not None
         omit_h_in_water = not flexibleConstraints and (constraints is not None or rigidWater)
-        for bond in self.bond_list:
-            if omit_all: continue
-            if omit_h and (bond.atom1.type.atomic_number == 1 or bond.atom2.type.atomic_number == 1): continue
-            if omit_h_in_water and _is_bond_in_water(bond): continue
-            force.addBond(bond.atom1.idx, bond.atom2.idx,
-                          bond.bond_type.req*length_conv,
-                          2*bond.bond_type.k*bond_frc_conv)
+        keep = np.full(len(bond_atoms), not omit_all)
+        if omit_h:
+            keep &= ~bond_has_h
+        if omit_h_in_water:
+            keep &= ~bond_in_water
+        force.addBonds(bond_atoms[keep], np.column_stack((bond_lengths[keep], 2*bond_params[keep,1]*bond_frc_conv)))
         system.addForce(force)
         # Add Angle forces
         if verbose: print('Adding angles...')
         force = mm.HarmonicAngleForce()
         force.setForceGroup(self.ANGLE_FORCE_GROUP)
+        angle_atoms = np.array([(angle.atom1.idx, angle.atom2.idx, angle.atom3.idx) for angle in self.angle_list], dtype=np.int64).reshape(-1, 3)
+        angle_params = np.array([(angle.angle_type.theteq, angle.angle_type.k) for angle in self.angle_list], dtype=np.float64).reshape(-1, 2)
+        angle_numbers = atomic_numbers[angle_atoms]
+        # Only angles including hydrogen can be constrained
+        nh = (angle_numbers[:,0] == 1).astype(np.int64) + (angle_numbers[:,2] == 1)
+        angle_has_h = (nh > 0)
         if constraints is ff.HAngles:
-            num_constrained_bonds = system.getNumConstraints()
-            atom_constraints = [[]] * system.getNumParticles()
-            for i in range(num_constrained_bonds):
-                c = system.getConstraintParameters(i)
-                dist = c[2].value_in_unit(u.nanometer)
-                atom_constraints[c[0]].append((c[1], dist))
-                atom_constraints[c[1]].append((c[0], dist))
-        for angle in self.angle_list:
-            # Only constrain angles including hydrogen here
-            if (angle.atom1.type.atomic_number != 1 and angle.atom3.type.atomic_number != 1):
-                continue
-            a1 = angle.atom1.type.atomic_number
-            a2 = angle.atom2.type.atomic_number
-            a3 = angle.atom3.type.atomic_number
-            nh = int(a1==1) + int(a3==1)
-            if constraints is ff.HAngles:
-                constrained = (nh == 2 or (nh == 1 and a2 == 8))
-            elif rigidWater:
-                constrained = (nh == 2 and a2 == 8 and angle.atom1.residue.resname in WATNAMES)
-            else:
-                constrained = False # no constraints
-            if constrained:
-                l1 = l2 = None
-                for bond in angle.atom2.bonds:
-                    if bond.atom1 is angle.atom1 or bond.atom2 is angle.atom1:
-                        l1 = bond.bond_type.req * length_conv
-                    elif bond.atom1 is angle.atom3 or bond.atom2 is angle.atom3:
-                        l2 = bond.bond_type.req * length_conv
-                # Compute the distance between the atoms and add a constraint
-                length = sqrt(l1*l1 + l2*l2 - 2*l1*l2*
-                              cos(angle.angle_type.theteq*pi/180))
-                system.addConstraint(angle.atom1.idx, angle.atom3.idx, length)
-                n_cons_angle += 1
-            if flexibleConstraints or not constrained:
-                force.addAngle(angle.atom1.idx, angle.atom2.idx,
-                               angle.atom3.idx, angle.angle_type.theteq*pi/180,
-                               2*angle.angle_type.k*angle_frc_conv)
+            constrained_angles = (nh == 2) | ((nh == 1) & (angle_numbers[:,1] == 8))
+        elif rigidWater:
+            constrained_angles = (nh == 2) & (angle_numbers[:,1] == 8) & atom_in_water[angle_atoms[:,0]]
+        else:
+            constrained_angles = np.zeros(len(angle_atoms), dtype=bool) # no constraints
+        for i in np.flatnonzero(constrained_angles).tolist():
+            angle = self.angle_list[i]
+            l1 = l2 = None
+            for bond in angle.atom2.bonds:
+                if bond.atom1 is angle.atom1 or bond.atom2 is angle.atom1:
+                    l1 = bond.bond_type.req * length_conv
+                elif bond.atom1 is angle.atom3 or bond.atom2 is angle.atom3:
+                    l2 = bond.bond_type.req * length_conv
+            # Compute the distance between the atoms and add a constraint
+            length = sqrt(l1*l1 + l2*l2 - 2*l1*l2*
+                          cos(angle.angle_type.theteq*pi/180))
+            system.addConstraint(angle.atom1.idx, angle.atom3.idx, length)
+            n_cons_angle += 1
         if verbose and (constraints is not None or rigidWater):
             print('    Number of bond constraints:', n_cons_bond)
             print('    Number of angle constraints:', n_cons_angle)
-        for angle in self.angle_list:
-            # Already did the angles with hydrogen above. So skip those here
-            if (angle.atom1.type.atomic_number == 1 or angle.atom3.type.atomic_number == 1):
-                continue
-            force.addAngle(angle.atom1.idx, angle.atom2.idx,
-                           angle.atom3.idx, angle.angle_type.theteq*pi/180,
-                           2*angle.angle_type.k*angle_frc_conv)
+        # Add the angles with hydrogen first, followed by all the others
+        if flexibleConstraints:
+            h_angles = np.flatnonzero(angle_has_h)
+        else:
+            h_angles = np.flatnonzero(angle_has_h & ~constrained_angles)
+        order = np.concatenate((h_angles, np.flatnonzero(~angle_has_h)))
+        force.addAngles(angle_atoms[order], np.column_stack((angle_params[order,0]*pi/180, 2*angle_params[order,1]*angle_frc_conv)))
         system.addForce(force)
 
         # Add the urey-bradley terms
         if verbose: print('Adding Urey-Bradley terms')
         force = mm.HarmonicBondForce()
         force.setForceGroup(self.UREY_BRADLEY_FORCE_GROUP)
-        for ub in self.urey_bradley_list:
-            force.addBond(ub.atom1.idx, ub.atom2.idx,
-                          ub.ub_type.req*length_conv,
-                          2*ub.ub_type.k*bond_frc_conv)
+        ub_atoms = [(ub.atom1.idx, ub.atom2.idx) for ub in self.urey_bradley_list]
+        ub_params = np.array([(ub.ub_type.req, ub.ub_type.k) for ub in self.urey_bradley_list], dtype=np.float64).reshape(-1, 2)
+        force.addBonds(ub_atoms, np.column_stack((ub_params[:,0]*length_conv, 2*ub_params[:,1]*bond_frc_conv)))
         system.addForce(force)
 
         # Add dihedral forces
         if verbose: print('Adding torsions...')
         force = mm.PeriodicTorsionForce()
         force.setForceGroup(self.DIHEDRAL_FORCE_GROUP)
-        for tor in self.dihedral_parameter_list:
-            force.addTorsion(tor.atom1.idx, tor.atom2.idx, tor.atom3.idx,
-                             tor.atom4.idx, tor.dihedral_type.per,
-                             tor.dihedral_type.phase*pi/180,
-                             tor.dihedral_type.phi_k*dihe_frc_conv)
+        torsion_atoms = [(tor.atom1.idx, tor.atom2.idx, tor.atom3.idx, tor.atom4.idx) for tor in self.dihedral_parameter_list]
+        torsion_periodicity = [tor.dihedral_type.per for tor in self.dihedral_parameter_list]
+        torsion_params = np.array([(tor.dihedral_type.phase, tor.dihedral_type.phi_k) for tor in self.dihedral_parameter_list], dtype=np.float64).reshape(-1, 2)
+        force.addTorsions(torsion_atoms, torsion_periodicity, np.column_stack((torsion_params[:,0]*pi/180, torsion_params[:,1]*dihe_frc_conv)))
         system.addForce(force)
 
         if verbose: print('Adding impropers...')
@@ -1212,40 +1181,36 @@ class CharmmPsfFile(object):
 
         # Add per-particle nonbonded parameters (LJ params)
         sigma_scale = 2**(-1/6) * 2
+        charges = np.array([atm.charge for atm in self.atom_list], dtype=np.float64)
         if not has_nbfix_terms:
-            for atm in self.atom_list:
-                force.addParticle(atm.charge, sigma_scale*atm.type.rmin*length_conv,
-                                  abs(atm.type.epsilon*ene_conv))
+            lj_params = np.array([(atm.type.rmin, atm.type.epsilon) for atm in self.atom_list], dtype=np.float64).reshape(-1, 2)
+            force.addParticles(np.column_stack((charges, sigma_scale*lj_params[:,0]*length_conv,
+                                                np.abs(lj_params[:,1]*ene_conv))))
         else:
             if nonbondedMethod is ff.LJPME:
                 raise ValueError('LJPME is not supported when NBFIX terms are present')
-            for atm in self.atom_list:
-                force.addParticle(atm.charge, 1.0, 0.0)
+            force.addParticles(np.column_stack((charges, np.ones(len(charges)), np.zeros(len(charges)))))
             # Now add the custom nonbonded force that implements NBFIX. First
-            # thing we need to do is condense our number of types
-            lj_idx_list = [0 for atom in self.atom_list]
-            lj_radii, lj_depths = [], []
-            num_lj_types = 0
+            # thing we need to do is condense our number of types.  Only
+            # non-NBFIXed and non-NBTholed atom types can be compressed, so
+            # they are identified by their parameters and all others by the
+            # type itself.  Types are numbered in order of first appearance.
+            lj_idx_list = []
             lj_type_list = []
-            for i, atom in enumerate(self.atom_list):
+            lj_type_index = {}
+            for atom in self.atom_list:
                 atom = atom.type
-                if lj_idx_list[i]: continue # already assigned
-                num_lj_types += 1
-                lj_idx_list[i] = num_lj_types
-                ljtype = (atom.rmin, atom.epsilon)
-                lj_type_list.append(atom)
-                lj_radii.append(atom.rmin)
-                lj_depths.append(atom.epsilon)
-                for j in range(i+1, len(self.atom_list)):
-                    atom2 = self.atom_list[j].type
-                    if lj_idx_list[j] > 0: continue # already assigned
-                    if atom2 is atom:
-                        lj_idx_list[j] = num_lj_types
-                    elif not atom.nbfix and not atom.nbthole and not atom2.nbfix and not atom2.nbthole:
-                        # Only non-NBFIXed and non-NBTholed atom types can be compressed
-                        ljtype2 = (atom2.rmin, atom2.epsilon)
-                        if ljtype == ljtype2:
-                            lj_idx_list[j] = num_lj_types
+                if atom.nbfix or atom.nbthole:
+                    key = id(atom)
+                else:
+                    key = (atom.rmin, atom.epsilon)
+                if key not in lj_type_index:
+                    lj_type_index[key] = len(lj_type_list)
+                    lj_type_list.append(atom)
+                lj_idx_list.append(lj_type_index[key])
+            num_lj_types = len(lj_type_list)
+            lj_radii = [atom.rmin for atom in lj_type_list]
+            lj_depths = [atom.epsilon for atom in lj_type_list]
             # Now everything is assigned. Create the A-coefficient and
             # B-coefficient arrays
             acoef = [0 for i in range(num_lj_types*num_lj_types)]
@@ -1294,7 +1259,7 @@ class CharmmPsfFile(object):
                 cforce.setUseSwitchingFunction(True)
                 cforce.setSwitchingDistance(switchDistance)
             for i in lj_idx_list:
-                cforce.addParticle((i - 1,)) # adjust for indexing from 0
+                cforce.addParticle((i,))
 
         # Add NBTHOLE terms
         if has_drude_particle and has_nbthole_terms:
@@ -1367,57 +1332,71 @@ class CharmmPsfFile(object):
             print('    Number of 1-3 pairs: %i' % len(self.pair_13_list))
             print('    Number of 1-4 pairs: %i' % len(self.pair_14_list))
 
-        # Add 1-4 interactions
+        # Add 1-4 interactions.  The exceptions are collected in arrays and
+        # added all at once at the end.
         sigma_scale = 2**(-1/6)
         nbxmod = abs(params.nbxmod)
+        exception_atoms = []
+        exception_params = []
+        pairs_14 = np.array(self.pair_14_list, dtype=np.int64).reshape(-1, 2)
         if nbxmod == 4:
-            for ia1, ia4 in self.pair_14_list:
-                force.addException(ia1, ia4, 0.0, 0.1, 0.0)
+            exception_atoms.append(pairs_14)
+            exception_params.append(np.tile((0.0, 0.1, 0.0), (len(pairs_14), 1)))
         if nbxmod == 5:
-            for ia1, ia4 in self.pair_14_list:
-                atom1 = self.atom_list[ia1]
-                atom4 = self.atom_list[ia4]
-                charge_prod = (atom1.charge * atom4.charge) * params.e14fac
-                try:
-                    rij, wdij, rij14, wdij14 = atom1.type.nbfix[atom4.type.name]
-                    epsilon = wdij14*ene_conv
-                    sigma = rij14*length_conv*sigma_scale
-                except KeyError:
-                    epsilon = sqrt(abs(atom1.type.epsilon_14 * atom4.type.epsilon_14)) * ene_conv
-                    sigma = (atom1.type.rmin_14 + atom4.type.rmin_14) * (length_conv * sigma_scale)
-                force.addException(ia1, ia4, charge_prod, sigma, epsilon)
+            lj14_params = np.array([(atm.type.rmin_14, atm.type.epsilon_14) for atm in self.atom_list], dtype=np.float64).reshape(-1, 2)
+            ia1, ia4 = pairs_14[:,0], pairs_14[:,1]
+            charge_prod = (charges[ia1] * charges[ia4]) * params.e14fac
+            epsilon = np.sqrt(np.abs(lj14_params[ia1,1] * lj14_params[ia4,1])) * ene_conv
+            sigma = (lj14_params[ia1,0] + lj14_params[ia4,0]) * (length_conv * sigma_scale)
+            # Override the combining rules for pairs with NBFIX terms
+            for i, (i1, i4) in enumerate(pairs_14.tolist()):
+                nbfix = self.atom_list[i1].type.nbfix
+                if nbfix and self.atom_list[i4].type.name in nbfix:
+                    rij, wdij, rij14, wdij14 = nbfix[self.atom_list[i4].type.name]
+                    epsilon[i] = wdij14*ene_conv
+                    sigma[i] = rij14*length_conv*sigma_scale
+            exception_atoms.append(pairs_14)
+            exception_params.append(np.column_stack((charge_prod, sigma, epsilon)))
 
         # Add excluded atoms
         # Drude and lonepairs will be excluded based on their parent atoms
         parent_exclude_list=[[] for _ in self.atom_list]
+        excluded = []
         for lpsite in self.lonepair_list:
             idx = lpsite[1]
             idxa = lpsite[0]
             parent_exclude_list[idx].append(idxa)
-            force.addException(idx, idxa, 0.0, 0.1, 0.0)
+            excluded.append((idx, idxa))
         if has_drude_particle:
             for pair in self.drudepair_list:
                 idx = pair[0]
                 idxa = pair[1]
                 parent_exclude_list[idx].append(idxa)
-                force.addException(idx, idxa, 0.0, 0.1, 0.0)
+                excluded.append((idx, idxa))
         # If lonepairs and Drude particles are bonded to the same parent atom, add exception
         for excludeterm in parent_exclude_list:
             if(len(excludeterm) >= 2):
                 for i in range(len(excludeterm)):
                     for j in range(i):
-                        force.addException(excludeterm[j], excludeterm[i], 0.0, 0.1, 0.0)
+                        excluded.append((excludeterm[j], excludeterm[i]))
         # Exclude 1-2 and 1-3 pairs as well as the lonepair/Drude attached onto them
+        excluded_pairs = []
         if nbxmod > 1:
-            for ia1, ia2 in self.pair_12_list:
-                for excludeatom in [ia1]+parent_exclude_list[ia1]:
-                    for excludeatom2 in [ia2]+parent_exclude_list[ia2]:
-                        force.addException(excludeatom, excludeatom2, 0.0, 0.1, 0.0)
+            excluded_pairs += self.pair_12_list
         if nbxmod > 2:
-            for ia1, ia3 in self.pair_13_list:
+            excluded_pairs += self.pair_13_list
+        if len(excluded) == 0:
+            excluded = excluded_pairs
+        else:
+            for ia1, ia2 in excluded_pairs:
                 for excludeatom in [ia1]+parent_exclude_list[ia1]:
-                    for excludeatom2 in [ia3]+parent_exclude_list[ia3]:
-                        force.addException(excludeatom, excludeatom2, 0.0, 0.1, 0.0)
+                    for excludeatom2 in [ia2]+parent_exclude_list[ia2]:
+                        excluded.append((excludeatom, excludeatom2))
+        excluded = np.array(excluded, dtype=np.int64).reshape(-1, 2)
+        exception_atoms.append(excluded)
+        exception_params.append(np.tile((0.0, 0.1, 0.0), (len(excluded), 1)))
+        exception_atoms = np.concatenate(exception_atoms)
+        force.addExceptions(exception_atoms, np.concatenate(exception_params))
         system.addForce(force)
 
         # Add Drude particles (Drude force)
@@ -1479,14 +1458,10 @@ class CharmmPsfFile(object):
         # If we needed a CustomNonbondedForce, map all of the exceptions from
         # the NonbondedForce to the CustomNonbondedForce
         if has_nbfix_terms:
-            for i in range(force.getNumExceptions()):
-                ii, jj, q, eps, sig = force.getExceptionParameters(i)
-                cforce.addExclusion(ii, jj)
+            cforce.addExclusions(exception_atoms)
             system.addForce(cforce)
         if has_drude_particle and has_nbthole_terms:
-            for i in range(force.getNumExceptions()):
-                ii, jj, q, eps, sig = force.getExceptionParameters(i)
-                nbtforce.addExclusion(ii, jj)
+            nbtforce.addExclusions(exception_atoms)
 
         # Using CustomBondForce to Calculate 1-4 atom pairs' NBThole interaction which have been excluded 
         if has_drude_particle and has_nbthole_terms:
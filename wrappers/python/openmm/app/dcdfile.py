@@ -32,14 +32,13 @@ from __future__ import absolute_import
 __author__ = "Peter Eastman"
 __version__ = "1.0"
 
-import array
 import os
 import time
 import struct
 import math
 from openmm.unit import picoseconds, nanometers, is_quantity, norm
 from openmm import Vec3
-from openmm.app.internal.unitcell import computeLengthsAndAngles
+from openmm.app.internal.unitcell import computeLengthsAndAngles, computePeriodicBoxVectors
 
 class DCDFile(object):
     """DCDFile provides methods for creating DCD files.
@@ -50,9 +49,27 @@ class DCDFile(object):
     standard byte ordering (big-endian or little-endian) for this format.  This class always generates
     files with little-endian ordering.
 
-    To use this class, create a DCDFile object, then call writeModel() once for each model in the file."""
+    To use this class, create a DCDFile object, then call writeModel() once for each model in the file.
+    To read an existing file, call DCDFile.read().  This returns a DCDTrajectory, which provides random
+    access to the frames without loading the whole file into memory."""
 
-    def __init__(self, file, topology, dt, firstStep=0, interval=1, append=False):
+    @staticmethod
+    def read(file):
+        """Open an existing DCD file for reading.
+
+        Parameters
+        ----------
+        file : string
+            The name of the file to read
+
+        Returns
+        -------
+        DCDTrajectory
+            An object providing access to the frames in the file
+        """
+        return DCDTrajectory(file)
+
+    def __init__(self, file, topology, dt, firstStep=0, interval=1, append=False, bufferSize=1):
         """Create a DCD file and write out the header, or open an existing file to append.
 
         Parameters
@@ -70,11 +87,18 @@ class DCDFile(object):
             to the trajectory
         append : bool=False
             If True, open an existing DCD file to append to.  If False, create a new file.
+        bufferSize : int=1
+            The number of models to accumulate in memory before writing them to
+            the file.  If this is greater than 1, call flush() after writing the
+            last model to make sure all of them have been written.
         """
         self._file = file
         self._topology = topology
         self._firstStep = firstStep
         self._interval = interval
+        self._bufferSize = bufferSize
+        self._buffer = []
+        self._headerChanged = False
         self._modelCount = 0
         if is_quantity(dt):
             dt = dt.value_in_unit(picoseconds)
@@ -127,12 +151,11 @@ class DCDFile(object):
         if is_quantity(positions):
             positions = positions.value_in_unit(nanometers)
         import numpy as np
-        positions = np.asarray(positions)
+        positions = np.asarray(positions, dtype=np.float64)
         if np.isnan(positions).any():
             raise ValueError('Particle position is NaN.  For more information, see https://github.com/openmm/openmm/wiki/Frequently-Asked-Questions#nan')
         if np.isinf(positions).any():
             raise ValueError('Particle position is infinite.  For more information, see https://github.com/openmm/openmm/wiki/Frequently-Asked-Questions#nan')
-        file = self._file
 
         self._modelCount += 1
         if self._interval > 1 and self._firstStep+self._modelCount*self._interval > 1<<31:
@@ -142,18 +165,11 @@ class DCDFile(object):
             self._firstStep //= self._interval
             self._dt *= self._interval
             self._interval = 1
-            file.seek(0, os.SEEK_SET)
-            file.write(struct.pack('<i4c9if', 84, b'C', b'O', b'R', b'D', 0, self._firstStep, self._interval, 0, 0, 0, 0, 0, 0, self._dt))
+            self._headerChanged = True
 
-        # Update the header.
-
-        file.seek(8, os.SEEK_SET)
-        file.write(struct.pack('<i', self._modelCount))
-        file.seek(20, os.SEEK_SET)
-        file.write(struct.pack('<i', self._firstStep+(self._modelCount-1)*self._interval))
-        # Write the data.
+        # Build the data for this model.
 
-        file.seek(0, os.SEEK_END)
+        data = []
         boxVectors = self._topology.getPeriodicBoxVectors()
         if boxVectors is not None:
             if periodicBoxVectors is not None:
@@ -169,14 +185,186 @@ class DCDFile(object):
             angle1 = math.sin(math.pi/2-gamma)
             angle2 = math.sin(math.pi/2-beta)
             angle3 = math.sin(math.pi/2-alpha)
-            file.write(struct.pack('<i6di', 48, a_length, angle1, b_length, angle2, angle3, c_length, 48))
+            data.append(struct.pack('<i6di', 48, a_length, angle1, b_length, angle2, angle3, c_length, 48))
         length = struct.pack('<i', 4*len(positions))
+        coords = (10*positions.T).astype('<f4')
         for i in range(3):
-            file.write(length)
-            data = array.array('f', (10*x[i] for x in positions))
-            data.tofile(file)
-            file.write(length)
+            data.append(length)
+            data.append(coords[i].tobytes())
+            data.append(length)
+        self._buffer.append(b''.join(data))
+        if len(self._buffer) >= self._bufferSize:
+            self.flush()
+
+    def flush(self):
+        """Write any buffered models to the file and update the header to reflect them."""
+        if len(self._buffer) == 0:
+            return
+        file = self._file
+        file.seek(0, os.SEEK_END)
+        file.write(b''.join(self._buffer))
+        self._buffer = []
+
+        # Update the header.
+
+        if self._headerChanged:
+            file.seek(0, os.SEEK_SET)
+            file.write(struct.pack('<i4c9if', 84, b'C', b'O', b'R', b'D', 0, self._firstStep, self._interval, 0, 0, 0, 0, 0, 0, self._dt))
+            self._headerChanged = False
+        file.seek(8, os.SEEK_SET)
+        file.write(struct.pack('<i', self._modelCount))
+        file.seek(20, os.SEEK_SET)
+        file.write(struct.pack('<i', self._firstStep+(self._modelCount-1)*self._interval))
+        file.seek(0, os.SEEK_END)
         try:
             file.flush()
         except AttributeError:
             pass
+
+
+class DCDTrajectory(object):
+    """DCDTrajectory provides read access to the frames stored in a DCD file.
+
+    The file is memory mapped rather than read into memory, so only the parts of it that are actually
+    accessed are loaded from disk.  Both byte orders are supported.  Create it by calling DCDFile.read().
+
+    The coordinates attribute is a read-only NumPy array of shape (frames, atoms, 3) that views the
+    coordinates directly in the file.  They are stored in angstroms, as in the file.  Indexing it
+    (for example coordinates[::10, atoms]) only touches the data that is selected.  getPositions()
+    provides the same data converted to nanometers.
+    """
+
+    def __init__(self, file):
+        """Open a DCD file for reading.
+
+        Parameters
+        ----------
+        file : string
+            The name of the file to read
+        """
+        import numpy as np
+        self._data = np.memmap(file, dtype=np.uint8, mode='r')
+        if len(self._data) < 8:
+            raise ValueError('Invalid DCD header')
+        if struct.unpack('<i', self._data[:4])[0] == 84:
+            order = '<'
+        elif struct.unpack('>i', self._data[:4])[0] == 84:
+            order = '>'
+        else:
+            raise ValueError('Invalid DCD header')
+        if bytes(self._data[4:8]) != b'CORD':
+            raise ValueError('Invalid DCD header')
+        icntrl = struct.unpack(order+'9if10i', self._data[8:88])
+        self._firstStep = icntrl[1]
+        self._interval = icntrl[2]
+        self._dt = icntrl[9]*0.04888821
+        if icntrl[8] != 0:
+            raise ValueError('DCD files with fixed atoms are not supported')
+        if icntrl[11] != 0:
+            raise ValueError('DCD files with four dimensional coordinates are not supported')
+        hasBox = (icntrl[10] != 0)
+        commentsBytes = struct.unpack(order+'i', self._data[92:96])[0]
+        offset = 96+commentsBytes+4
+        self._numAtoms = struct.unpack(order+'i', self._data[offset+4:offset+8])[0]
+        offset += 12
+
+        # Work out the layout of each frame.  The number of frames is determined from the file size
+        # rather than the header, which may not be up to date.
+
+        boxSize = 56 if hasBox else 0
+        axisSize = 4*self._numAtoms+8
+        frameSize = boxSize+3*axisSize
+        numFrames = max(0, (len(self._data)-offset)//frameSize)
+        if numFrames == 0:
+            # The file has a header but no frames yet, so there is nothing to view in it.
+            self.coordinates = np.zeros((0, self._numAtoms, 3))
+            self._unitCells = np.zeros((0, 6)) if hasBox else None
+            return
+        self.coordinates = np.ndarray((numFrames, self._numAtoms, 3), dtype=order+'f4', buffer=self._data,
+                                      offset=offset+boxSize+4, strides=(frameSize, 4, axisSize))
+        if hasBox:
+            self._unitCells = np.ndarray((numFrames, 6), dtype=order+'f8', buffer=self._data,
+                                         offset=offset+4, strides=(frameSize, 8))
+        else:
+            self._unitCells = None
+
+    def __len__(self):
+        return self.getNumFrames()
+
+    def getNumFrames(self):
+        """Get the number of frames in the file."""
+        return self.coordinates.shape[0]
+
+    def getNumAtoms(self):
+        """Get the number of atoms in each frame."""
+        return self._numAtoms
+
+    def getFirstStep(self):
+        """Get the index of the first step in the trajectory."""
+        return self._firstStep
+
+    def getInterval(self):
+        """Get the number of time steps between frames."""
+        return self._interval
+
+    def getTimeStep(self):
+        """Get the time step used in the trajectory."""
+        return self._dt*picoseconds
+
+    def getPositions(self, frame, atomSubset=None, asNumpy=False):
+        """Get the atom positions for one or more frames.
+
+        Parameters
+        ----------
+        frame : int or slice or array
+            The index of the frame to return, or an index or slice selecting several frames
+        atomSubset : list=None
+            Indices of the atoms to return.  If None, all atoms are returned.
+        asNumpy : bool=False
+            If true, the positions are returned as a NumPy array.  Otherwise a single frame
+            is returned as a list of Vec3 objects.  Multiple frames are always returned as
+            a NumPy array of shape (frames, atoms, 3).
+
+        Returns
+        -------
+        the positions in nanometers
+        """
+        import numpy as np
+        positions = self.coordinates[frame]
+        if atomSubset is not None:
+            positions = positions[..., atomSubset, :]
+        positions = 0.1*positions.astype(np.float64)
+        if positions.ndim == 2 and not asNumpy:
+            return [Vec3(x, y, z) for x, y, z in positions]*nanometers
+        return positions*nanometers
+
+    def getPeriodicBoxVectors(self, frame):
+        """Get the periodic box vectors for a frame.
+
+        Parameters
+        ----------
+        frame : int
+            The index of the frame
+
+        Returns
+        -------
+        the periodic box vectors, or None if the file does not contain unit cell information
+        """
+        if self._unitCells is None:
+            return None
+        a, angle1, b, angle2, angle3, c = (float(x) for x in self._unitCells[frame])
+
+        # Programs that write the CHARMM format store the cosines of the angles, but some older
+        # ones store the angles in degrees.
+
+        if all(-1 <= x <= 1 for x in (angle1, angle2, angle3)):
+            gamma, beta, alpha = (math.acos(x) for x in (angle1, angle2, angle3))
+        else:
+            gamma, beta, alpha = (math.radians(x) for x in (angle1, angle2, angle3))
+        return computePeriodicBoxVectors(0.1*a, 0.1*b, 0.1*c, alpha, beta, gamma)
+
+    def close(self):
+        """Close the file.  The coordinates array may not be used after this is called."""
+        self.coordinates = None
+        self._unitCells = None
+        self._data = None
@@ -33,6 +33,7 @@ __author__ = "Peter Eastman"
 __version__ = "1.0"
 
 from openmm.app import DCDFile, Topology
+import numpy as np
 
 class DCDReporter(object):
     """DCDReporter outputs a series of frames from a Simulation to a DCD file.
@@ -40,7 +41,7 @@ class DCDReporter(object):
     To use it, create a DCDReporter, then add it to the Simulation's list of reporters.
     """
 
-    def __init__(self, file, reportInterval, append=False, enforcePeriodicBox=None, atomSubset=None):
+    def __init__(self, file, reportInterval, append=False, enforcePeriodicBox=None, atomSubset=None, bufferSize=1):
         """Create a DCDReporter.
 
         Parameters
@@ -58,11 +59,18 @@ class DCDReporter(object):
             conditions.
         atomSubset: list
             Atom indices (zero indexed) of the particles to output.  If None (the default), all particles will be output.
+        bufferSize: int=1
+            The number of frames to accumulate in memory before writing them to the file.  Any remaining
+            frames are written when flush() or close() is called, when the Simulation saves a checkpoint
+            or state, or when the reporter is deleted.
         """
         self._reportInterval = reportInterval
         self._append = append
         self._enforcePeriodicBox = enforcePeriodicBox
         self._atomSubset = atomSubset
+        self._bufferSize = bufferSize
+        if atomSubset is not None:
+            self._atomIndices = np.array(atomSubset, dtype=np.int64)
         if append:
             mode = 'r+b'
         else:
@@ -84,7 +92,7 @@ class DCDReporter(object):
             A dictionary describing the required information for the next report
         """
         steps = self._reportInterval - simulation.currentStep%self._reportInterval
-        return {'steps':steps, 'periodic':self._enforcePeriodicBox, 'include':['positions']}
+        return {'steps':steps, 'periodic':self._enforcePeriodicBox, 'include':['positions'], 'asynchronous':True}
 
     def report(self, simulation, state):
         """Generate a report.
@@ -110,12 +118,24 @@ class DCDReporter(object):
                     topology.addAtom(atoms[i].name, atoms[i].element, residue)
             self._dcd = DCDFile(
                 self._out, topology, simulation.integrator.getStepSize(),
-                self._reportInterval, self._reportInterval, self._append
+                self._reportInterval, self._reportInterval, self._append, self._bufferSize
             )
         positions = state.getPositions(asNumpy=True)
         if self._atomSubset is not None:
-            positions = [positions[i] for i in self._atomSubset]
+            positions = positions[self._atomIndices]
         self._dcd.writeModel(positions, periodicBoxVectors=state.getPeriodicBoxVectors())
 
+    def flush(self):
+        """Write any buffered frames to the file."""
+        if self._dcd is not None:
+            self._dcd.flush()
+
+    def close(self):
+        """Write any buffered frames to the file, then close it.  No more frames may be reported after this
+        is called."""
+        if not self._out.closed:
+            self.flush()
+            self._out.close()
+
     def __del__(self):
-        self._out.close()
+        self.close()
@@ -35,19 +35,24 @@ __version__ = "1.0"
 
 import os
 import itertools
+import hashlib
 import xml.etree.ElementTree as etree
 import math
 import warnings
 from math import sqrt, cos
 from copy import deepcopy
 from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from difflib import SequenceMatcher
+import numpy as np
 import openmm as mm
 import openmm.unit as unit
 from . import element as elem
+from .topology import Topology
 from openmm.app.internal.singleton import Singleton
 from openmm.app.internal import compiled, amoebaforces
 from openmm.app.internal.argtracker import ArgTracker
+from openmm.app.internal import safesave
 
 # Directories from which to load built in force fields.
 
@@ -218,6 +223,7 @@ class ForceField(object):
         self._scripts = []
         self._templateMatchers = []
         self._templateGenerators = []
+        self._contentHash = hashlib.sha256()
         self.loadFile(files)
 
     def loadFile(self, files, resname_prefix=''):
@@ -266,6 +272,8 @@ class ForceField(object):
                 raise Exception('ForceField.loadFile() encountered an error reading file "%s": %s' % (filename, e))
 
             trees.append(tree)
+            self._contentHash.update(resname_prefix.encode())
+            self._contentHash.update(etree.tostring(tree.getroot()))
             i += 1
 
             # Process includes in this file.
@@ -459,6 +467,7 @@ class ForceField(object):
             self._atomClasses[atomClass] = typeSet
         typeSet.add(name)
         self._atomClasses[''].add(name)
+        self._contentHash.update(('atomType %r\n' % sorted(parameters.items())).encode())
 
     def registerResidueTemplate(self, template):
         """Register a new residue template."""
@@ -485,6 +494,7 @@ class ForceField(object):
             self._templateSignatures[signature].append(template)
         else:
             self._templateSignatures[signature] = [template]
+        self._contentHash.update(_describeTemplate(template).encode())
 
     def registerPatch(self, patch):
         """Register a new patch that can be applied to templates."""
@@ -500,6 +510,7 @@ class ForceField(object):
     def registerScript(self, script):
         """Register a new script to be executed after building the System."""
         self._scripts.append(script)
+        self._contentHash.update(('script %s\n' % script).encode())
 
     def registerTemplateMatcher(self, matcher):
         """Register an object that can override the default logic for matching templates to residues.
@@ -519,6 +530,7 @@ class ForceField(object):
         .. CAUTION:: This method is experimental, and its API is subject to change.
         """
         self._templateMatchers.append(matcher)
+        self._contentHash.update(('matcher %r\n' % matcher).encode())
 
     def registerTemplateGenerator(self, generator):
         """Register a residue template generator that can be used to parameterize residues that do not match existing forcefield templates.
@@ -565,6 +577,7 @@ class ForceField(object):
 
         """
         self._templateGenerators.append(generator)
+        self._contentHash.update(('generator %r\n' % generator).encode())
 
     def _findAtomTypes(self, attrib, num):
         """Parse the attributes on an XML tag to find the set of atom types for each atom it involves.
@@ -1027,22 +1040,8 @@ class ForceField(object):
             templateSignatures = self._templateSignatures
         signature = _createResidueSignature([atom.element for atom in res.atoms()])
         if signature in templateSignatures:
-            allMatches = []
-            for t in templateSignatures[signature]:
-                match = compiled.matchResidueToTemplate(res, t, bondedToAtom, ignoreExternalBonds, ignoreExtraParticles)
-                if match is not None:
-                    allMatches.append((t, match))
-            if len(allMatches) == 1:
-                template = allMatches[0][0]
-                matches = allMatches[0][1]
-            elif len(allMatches) > 1:
-                # We found multiple matches.  This is OK if and only if they assign identical types and parameters to all atoms.
-                t1, m1 = allMatches[0]
-                for t2, m2 in allMatches[1:]:
-                    if not t1.areParametersIdentical(t2, m1, m2):
-                        raise Exception('Multiple non-identical matching templates found for residue %d (%s): %s.' % (res.index, res.name, ', '.join(match[0].name for match in allMatches)))
-                template = allMatches[0][0]
-                matches = allMatches[0][1]
+            allMatches = _findAllTemplateMatches(res, templateSignatures[signature], bondedToAtom, ignoreExternalBonds, ignoreExtraParticles)
+            return _selectTemplateMatch(res, allMatches)
         return [template, matches]
 
     def _buildBondedToAtomList(self, topology):
@@ -1187,7 +1186,8 @@ class ForceField(object):
 
     def createSystem(self, topology, nonbondedMethod=NoCutoff, nonbondedCutoff=1.0*unit.nanometer,
                      constraints=None, rigidWater=None, removeCMMotion=True, hydrogenMass=None, residueTemplates=dict(),
-                     ignoreExternalBonds=False, switchDistance=None, flexibleConstraints=False, drudeMass=0.4*unit.amu, **args):
+                     ignoreExternalBonds=False, switchDistance=None, flexibleConstraints=False, drudeMass=0.4*unit.amu,
+                     cacheDir=None, numWorkers=1, **args):
         """Construct an OpenMM System representing a Topology with this force field.
 
         Parameters
@@ -1233,6 +1233,20 @@ class ForceField(object):
         drudeMass : mass=0.4*amu
             The mass to use for Drude particles.  Any mass added to a Drude particle is
             subtracted from its parent atom to keep their total mass the same.
+        cacheDir : str=None
+            If this is specified, Systems are cached as serialized XML files in this
+            directory.  If a System has previously been created for an identical Topology,
+            force field, and set of arguments, it is loaded from the cache instead of being
+            built again.  The cache key covers the contents of all files loaded with
+            loadFile(), along with atom types, residue templates, and scripts registered
+            directly.  Template generators and matchers are identified by their repr(), so
+            Systems built with them are only reused by other processes if the repr() is the
+            same in every process.
+        numWorkers : int=1
+            The number of worker processes to use for matching residues to templates.  If
+            this is greater than 1, distinct residues are divided between a pool of processes.
+            This can reduce the time to create Systems that contain many different kinds of
+            residues.  The result is identical to matching them in a single process.
         args
             Arbitrary additional keyword arguments may also be specified.
             This allows extra parameters to be specified that are specific to
@@ -1243,16 +1257,32 @@ class ForceField(object):
         system
             the newly created System
         """
+        if cacheDir is not None:
+            cacheArgs = dict(args, nonbondedMethod=nonbondedMethod, nonbondedCutoff=nonbondedCutoff, constraints=constraints,
+                             rigidWater=rigidWater, removeCMMotion=removeCMMotion, hydrogenMass=hydrogenMass,
+                             residueTemplates=sorted((res.index, name) for res, name in residueTemplates.items()),
+                             ignoreExternalBonds=ignoreExternalBonds, switchDistance=switchDistance,
+                             flexibleConstraints=flexibleConstraints, drudeMass=drudeMass)
+            cacheFile = os.path.join(cacheDir, 'system-%s.xml' % self._getSystemCacheKey(topology, cacheArgs))
         args['switchDistance'] = switchDistance
         args['flexibleConstraints'] = flexibleConstraints
         args['drudeMass'] = drudeMass
         args = ArgTracker(args)
+        if cacheDir is not None and os.path.isfile(cacheFile):
+            # The first line of the file lists the arguments that were used when building the System.
+
+            with open(cacheFile) as input:
+                usedArgs = input.readline().split()
+                serializedSystem = input.read()
+            args.accessed.update(usedArgs)
+            args.checkArgs(self.createSystem)
+            return mm.XmlSerializer.deserialize(serializedSystem)
         data = ForceField._SystemData(topology)
         rigidResidue = [False]*topology.getNumResidues()
 
         # Find the template matching each residue and assign atom types.
 
-        templateForResidue = self._matchAllResiduesToTemplates(data, topology, residueTemplates, ignoreExternalBonds)
+        templateForResidue = self._matchAllResiduesToTemplates(data, topology, residueTemplates, ignoreExternalBonds, numWorkers=numWorkers)
         for res in topology.residues():
             if res.name == 'HOH':
                 # Determine whether this should be a rigid water.
@@ -1418,35 +1448,61 @@ class ForceField(object):
         for script in self._scripts:
             exec(script, locals())
         args.checkArgs(self.createSystem)
+        if cacheDir is not None:
+            os.makedirs(cacheDir, exist_ok=True)
+            safesave.save('%s\n%s' % (' '.join(sorted(args.accessed)), mm.XmlSerializer.serialize(sys)), cacheFile)
         return sys
 
+    def _getSystemCacheKey(self, topology, args):
+        """Compute a hash that identifies the System createSystem() builds for a Topology and set of arguments."""
+        key = self._contentHash.copy()
+        key.update(mm.Platform.getOpenMMVersion().encode())
+        for name in sorted(args):
+            key.update(('%s=%r\n' % (name, args[name])).encode())
+        for chain in topology.chains():
+            key.update(('chain %d %s\n' % (chain.index, chain.id)).encode())
+            for res in chain.residues():
+                key.update(('residue %d %s %s %s\n' % (res.index, res.name, res.id, res.insertionCode)).encode())
+                for atom in res.atoms():
+                    symbol = (None if atom.element is None else atom.element.symbol)
+                    key.update(('atom %s %s\n' % (atom.name, symbol)).encode())
+        for bond in topology.bonds():
+            key.update(('bond %d %d %s %s\n' % (bond[0].index, bond[1].index, bond.type, bond.order)).encode())
+        key.update(repr(topology.getPeriodicBoxVectors()).encode())
+        return key.hexdigest()
+
 
-    def _matchAllResiduesToTemplates(self, data, topology, residueTemplates, ignoreExternalBonds, ignoreExtraParticles=False, recordParameters=True):
+    def _matchAllResiduesToTemplates(self, data, topology, residueTemplates, ignoreExternalBonds, ignoreExtraParticles=False, recordParameters=True, numWorkers=1):
         """Return a list of which template matches each residue in the topology, and assign atom types."""
         templateForResidue = [None]*topology.getNumResidues()
         unmatchedResidues = []
-        for chain in topology.chains():
-            for res in chain.residues():
-                if res in residueTemplates:
-                    tname = residueTemplates[res]
-                    template = self._templates[tname]
-                    matches = compiled.matchResidueToTemplate(res, template, data.bondedToAtom, ignoreExternalBonds, ignoreExtraParticles)
-                    if matches is None:
-                        raise Exception('User-supplied template %s does not match the residue %d (%s)' % (tname, res.index, res.name))
-                else:
-                    # Attempt to match one of the existing templates.
-                    [template, matches] = self._getResidueTemplateMatches(res, data.bondedToAtom, ignoreExternalBonds=ignoreExternalBonds, ignoreExtraParticles=ignoreExtraParticles)
+        residues = [res for chain in topology.chains() for res in chain.residues()]
+
+        # Attempt to match one of the existing templates to every residue without a user-specified template.
+
+        residuesToMatch = [res for res in residues if res not in residueTemplates]
+        allMatches = _matchResiduesToTemplates(self, residuesToMatch, None, data.bondedToAtom, ignoreExternalBonds, ignoreExtraParticles, numWorkers)
+        templateMatches = dict(zip(residuesToMatch, allMatches))
+        for res in residues:
+            if res in residueTemplates:
+                tname = residueTemplates[res]
+                template = self._templates[tname]
+                matches = compiled.matchResidueToTemplate(res, template, data.bondedToAtom, ignoreExternalBonds, ignoreExtraParticles)
                 if matches is None:
-                    unmatchedResidues.append(res)
-                else:
-                    if recordParameters:
-                        data.recordMatchedAtomParameters(res, template, matches)
-                    templateForResidue[res.index] = template
+                    raise Exception('User-supplied template %s does not match the residue %d (%s)' % (tname, res.index, res.name))
+            else:
+                [template, matches] = templateMatches[res]
+            if matches is None:
+                unmatchedResidues.append(res)
+            else:
+                if recordParameters:
+                    data.recordMatchedAtomParameters(res, template, matches)
+                templateForResidue[res.index] = template
 
         # Try to apply patches to find matches for any unmatched residues.
 
         if len(unmatchedResidues) > 0:
-            unmatchedResidues = _applyPatchesToMatchResidues(self, data, unmatchedResidues, templateForResidue, data.bondedToAtom, ignoreExternalBonds, ignoreExtraParticles)
+            unmatchedResidues = _applyPatchesToMatchResidues(self, data, unmatchedResidues, templateForResidue, data.bondedToAtom, ignoreExternalBonds, ignoreExtraParticles, numWorkers)
 
         # If we still haven't found a match for a residue, attempt to use residue template generators to create
         # new templates (and potentially atom types/parameters).
@@ -1483,11 +1539,10 @@ def _findBondsForExclusions(data, sys):
 
     # If a virtual site does *not* share exclusions with another atom, add a bond between it and its first parent atom.
 
-    for i in range(sys.getNumParticles()):
-        if sys.isVirtualSite(i):
-            (site, atoms, excludeWith) = data.virtualSites[data.atoms[i]]
-            if excludeWith is None:
-                bondIndices.append((i, site.getParticle(0)))
+    for atom in sorted(data.virtualSites, key=lambda a: a.index):
+        (site, atoms, excludeWith) = data.virtualSites[atom]
+        if excludeWith is None:
+            bondIndices.append((atom.index, site.getParticle(0)))
 
     # Certain particles, such as lone pairs and Drude particles, share exclusions with a parent atom.
     # If the parent atom does not interact with an atom, the child particle does not either.
@@ -1505,39 +1560,74 @@ def _findBondsForExclusions(data, sys):
     return bondIndices
 
 def _findExclusions(bondIndices, maxSeparation, numAtoms):
-    """Identify pairs of atoms in the same molecule separated by no more than maxSeparation bonds."""
-    bondedTo = [set() for i in range(numAtoms)]
-    for i, j in bondIndices:
-        bondedTo[i].add(j)
-        bondedTo[j].add(i)
-
-    # Identify all neighbors of each atom with each separation.
-
-    bondedWithSeparation = [bondedTo]
-    for i in range(maxSeparation-1):
-        lastBonds = bondedWithSeparation[-1]
-        newBonds = deepcopy(lastBonds)
-        for atom in range(numAtoms):
-            for a1 in lastBonds[atom]:
-                for a2 in bondedTo[a1]:
-                    newBonds[atom].add(a2)
-        bondedWithSeparation.append(newBonds)
+    """Identify pairs of atoms in the same molecule separated by no more than maxSeparation bonds.
+
+    This returns a list of (atom1, atom2, separation) tuples with atom1 < atom2, sorted by atom indices.
+    Each pair of atoms is encoded as a single integer atom1*numAtoms+atom2, and the bonded neighbors of
+    each atom are stored in compressed sparse row format, so each additional level of separation is found
+    with a few array operations instead of loops over atoms.
+    """
+    bonds = np.array(bondIndices, dtype=np.int64).reshape(-1, 2)
+    bonds = bonds[bonds[:,0] != bonds[:,1]]
+    bondKeys = _sortedUnique(np.concatenate([bonds[:,0]*numAtoms+bonds[:,1], bonds[:,1]*numAtoms+bonds[:,0]]))
+    neighbors = bondKeys % numAtoms
+    offsets = np.zeros(numAtoms+1, dtype=np.int64)
+    np.cumsum(np.bincount(bondKeys // numAtoms, minlength=numAtoms), out=offsets[1:])
+
+    # Starting from the bonded pairs, repeatedly step to the neighbors of the last atom in each pair,
+    # keeping only pairs that have not been reached with fewer bonds.
+
+    visited = _sortedUnique(np.concatenate([bondKeys, np.arange(numAtoms, dtype=np.int64)*(numAtoms+1)]))
+    frontier = bondKeys
+    pairKeys = [bondKeys]
+    separations = [np.ones(len(bondKeys), dtype=np.int64)]
+    for sep in range(2, maxSeparation+1):
+        first = frontier // numAtoms
+        last = frontier % numAtoms
+        counts = offsets[last+1]-offsets[last]
+        total = np.sum(counts)
+        start = np.cumsum(counts)-counts
+        steps = np.arange(total)-np.repeat(start, counts)+np.repeat(offsets[last], counts)
+        newKeys = _sortedUnique(np.repeat(first, counts)*numAtoms+neighbors[steps])
+        position = np.minimum(np.searchsorted(visited, newKeys), len(visited)-1)
+        newKeys = newKeys[visited[position] != newKeys]
+        if len(newKeys) == 0:
+            break
+        visited = _sortedUnique(np.concatenate([visited, newKeys]))
+        frontier = newKeys
+        pairKeys.append(newKeys)
+        separations.append(np.full(len(newKeys), sep, dtype=np.int64))
 
     # Build the list of pairs.
 
-    pairs = []
-    for atom in range(numAtoms):
-        for otherAtom in bondedWithSeparation[-1][atom]:
-            if otherAtom > atom:
-                # Determine the minimum number of bonds between them.
-                sep = maxSeparation
-                for i in reversed(range(maxSeparation-1)):
-                    if otherAtom in bondedWithSeparation[i][atom]:
-                        sep -= 1
-                    else:
-                        break
-                pairs.append((atom, otherAtom, sep))
-    return pairs
+    pairKeys = np.concatenate(pairKeys)
+    separations = np.concatenate(separations)
+    atom1 = pairKeys // numAtoms
+    atom2 = pairKeys % numAtoms
+    keep = (atom1 < atom2)
+    order = np.argsort(pairKeys[keep])
+    return list(zip(atom1[keep][order].tolist(), atom2[keep][order].tolist(), separations[keep][order].tolist()))
+
+
+def _describeTemplate(template):
+    """Create a string describing a residue template, for use in the key of the System cache."""
+    lines = ['template %s %s %d %s' % (template.name, template.rigidWater, template.overrideLevel, sorted(template.attributes.items()))]
+    for atom in template.atoms:
+        symbol = (None if atom.element is None else atom.element.symbol)
+        lines.append('atom %s %s %s %d %r' % (atom.name, atom.type, symbol, atom.externalBonds, sorted(atom.parameters.items())))
+    for bond in template.bonds:
+        lines.append('bond %d %d' % bond)
+    for site in template.virtualSites:
+        lines.append('site %r' % sorted(vars(site).items()))
+    return '\n'.join(lines)+'\n'
+
+
+def _sortedUnique(values):
+    """Return the sorted unique elements of an integer array."""
+    values = np.sort(values)
+    if len(values) > 1:
+        values = values[np.concatenate([[True], values[1:] != values[:-1]])]
+    return values
 
 
 def _findGroups(bondedTo):
@@ -1596,7 +1686,107 @@ def _createResidueSignature(elements):
     return s
 
 
-def _applyPatchesToMatchResidues(forcefield, data, residues, templateForResidue, bondedToAtom, ignoreExternalBonds, ignoreExtraParticles):
+def _findAllTemplateMatches(res, templates, bondedToAtom, ignoreExternalBonds, ignoreExtraParticles):
+    """Return a list of (template, matches) for every template in a list that matches a residue."""
+    allMatches = []
+    for t in templates:
+        match = compiled.matchResidueToTemplate(res, t, bondedToAtom, ignoreExternalBonds, ignoreExtraParticles)
+        if match is not None:
+            allMatches.append((t, match))
+    return allMatches
+
+
+def _selectTemplateMatch(res, allMatches):
+    """Given all the templates that match a residue, select the one to use.  Return [template, matches], or [None, None]
+    if there are no matches."""
+    if len(allMatches) == 0:
+        return [None, None]
+    if len(allMatches) > 1:
+        # We found multiple matches.  This is OK if and only if they assign identical types and parameters to all atoms.
+        t1, m1 = allMatches[0]
+        for t2, m2 in allMatches[1:]:
+            if not t1.areParametersIdentical(t2, m1, m2):
+                raise Exception('Multiple non-identical matching templates found for residue %d (%s): %s.' % (res.index, res.name, ', '.join(match[0].name for match in allMatches)))
+    return [allMatches[0][0], allMatches[0][1]]
+
+
+def _matchResiduesToTemplates(forcefield, residues, templateSignatures, bondedToAtom, ignoreExternalBonds, ignoreExtraParticles, numWorkers=1):
+    """Find the template matching each residue in a list, returning a list of [template, matches] for them.
+
+    Residues with identical names, atoms, and bonds always match the same template in the same way, so each distinct
+    residue is only matched once.  If numWorkers is greater than 1, the distinct residues are divided between a pool
+    of worker processes.  Custom template matchers are free to look at anything about a residue, so when any have been
+    registered, every residue is matched separately in this process.
+    """
+    if len(forcefield._templateMatchers) > 0:
+        return [forcefield._getResidueTemplateMatches(res, bondedToAtom, templateSignatures, ignoreExternalBonds, ignoreExtraParticles) for res in residues]
+    if templateSignatures is None:
+        templateSignatures = forcefield._templateSignatures
+    keys = [_createResidueGraphSignature(res, bondedToAtom) for res in residues]
+    representatives = {}
+    for key, res in zip(keys, residues):
+        if key not in representatives:
+            representatives[key] = res
+    matchCache = {}
+    if numWorkers > 1 and len(representatives) > 1:
+        # Only send the workers the templates they might need.
+
+        signatures = [_createResidueSignature([atom.element for atom in res.atoms()]) for res in representatives.values()]
+        workerSignatures = dict((s, templateSignatures[s]) for s in set(signatures) if s in templateSignatures)
+        chunkSize = max(1, len(representatives)//(4*numWorkers))
+        with ProcessPoolExecutor(numWorkers, initializer=_initializeTemplateMatchWorker, initargs=(workerSignatures,)) as executor:
+            results = executor.map(_findTemplateMatchesInWorker, representatives, signatures, itertools.repeat(ignoreExternalBonds), itertools.repeat(ignoreExtraParticles), chunksize=chunkSize)
+
+            # Convert the template indices returned by the workers back to the original templates.
+
+            for (key, res), signature, result in zip(representatives.items(), signatures, results):
+                allMatches = [(templateSignatures[signature][i], match) for i, match in result]
+                matchCache[key] = _selectTemplateMatch(res, allMatches)
+    else:
+        for key, res in representatives.items():
+            matchCache[key] = forcefield._getResidueTemplateMatches(res, bondedToAtom, templateSignatures, ignoreExternalBonds, ignoreExtraParticles)
+    return [matchCache[key] for key in keys]
+
+
+_workerTemplateSignatures = None
+
+def _initializeTemplateMatchWorker(templateSignatures):
+    """Record the templates to match against in a worker process created by _matchResiduesToTemplates()."""
+    global _workerTemplateSignatures
+    _workerTemplateSignatures = templateSignatures
+
+
+def _findTemplateMatchesInWorker(key, signature, ignoreExternalBonds, ignoreExtraParticles):
+    """Find all templates that match a residue in a worker process.  The residue is described by the key returned
+    by _createResidueGraphSignature().  This returns a list of (template index, matches) for the matching templates."""
+    topology = Topology()
+    res = topology.addResidue(key[0], topology.addChain())
+    bondedToAtom = []
+    for name, element, bondedTo in key[1:]:
+        topology.addAtom(name, element, res)
+        bondedToAtom.append(bondedTo)
+    templates = _workerTemplateSignatures.get(signature, [])
+    allMatches = _findAllTemplateMatches(res, templates, bondedToAtom, ignoreExternalBonds, ignoreExtraParticles)
+    indexForTemplate = dict((id(t), i) for i, t in enumerate(templates))
+    return [(indexForTemplate[id(t)], match) for t, match in allMatches]
+
+
+def _createResidueGraphSignature(res, bondedToAtom):
+    """Create a key that uniquely identifies the name, atoms, and bonds of a residue.
+
+    Two residues with the same key are guaranteed to match the same template with the same
+    atom mapping.  Each atom contributes its name, its element, and the local indices of the atoms
+    it is bonded to, with -1 representing a bond to an atom in a different residue.
+    """
+    atoms = list(res.atoms())
+    localIndex = dict((atom.index, i) for i, atom in enumerate(atoms))
+    key = [res.name]
+    for atom in atoms:
+        key.append((atom.name, atom.element, tuple(localIndex.get(j, -1) for j in bondedToAtom[atom.index])))
+    return tuple(key)
+
+
+def _applyPatchesToMatchResidues(forcefield, data, residues, templateForResidue, bondedToAtom, ignoreExternalBonds, ignoreExtraParticles, numWorkers=1):
     """Try to apply patches to find matches for residues."""
     # Start by creating all templates than can be created by applying a combination of one-residue patches
     # to a single template.  The number of these is usually not too large, and they often cover a large fraction
@@ -1621,8 +1811,8 @@ def _applyPatchesToMatchResidues(forcefield, data, residues, templateForResidue,
     # Now see if any of those templates matches any of the residues.
 
     unmatchedResidues = []
-    for res in residues:
-        [template, matches] = forcefield._getResidueTemplateMatches(res, bondedToAtom, patchedTemplateSignatures, ignoreExternalBonds, ignoreExtraParticles)
+    allMatches = _matchResiduesToTemplates(forcefield, residues, patchedTemplateSignatures, bondedToAtom, ignoreExternalBonds, ignoreExtraParticles, numWorkers)
+    for res, (template, matches) in zip(residues, allMatches):
         if matches is None:
             unmatchedResidues.append(res)
         else:
@@ -2206,6 +2396,8 @@ class HarmonicBondGenerator(object):
             sys.addForce(force)
         else:
             force = existing[0]
+        particles = []
+        parameters = []
         for bond in data.bonds:
             type1 = data.atomType[data.atoms[bond.atom1]]
             type2 = data.atomType[data.atoms[bond.atom2]]
@@ -2220,8 +2412,10 @@ class HarmonicBondGenerator(object):
                         # flexibleConstraints allows us to add parameters even if the DOF is
                         # constrained
                         if not bond.isConstrained or args.get('flexibleConstraints', False):
-                            force.addBond(bond.atom1, bond.atom2, self.length[i], self.k[i])
+                            particles.append((bond.atom1, bond.atom2))
+                            parameters.append((self.length[i], self.k[i]))
                     break
+        force.addBonds(particles, parameters)
 
 parsers["HarmonicBondForce"] = HarmonicBondGenerator.parseElement
 
@@ -2273,6 +2467,8 @@ class HarmonicAngleGenerator(object):
             sys.addForce(force)
         else:
             force = existing[0]
+        particles = []
+        parameters = []
         for (angle, isConstrained) in zip(data.angles, data.isAngleConstrained):
             type1 = data.atomType[data.atoms[angle[0]]]
             type2 = data.atomType[data.atoms[angle[1]]]
@@ -2305,8 +2501,10 @@ class HarmonicAngleGenerator(object):
                                 data.addConstraint(sys, angle[0], angle[2], length)
                     if self.k[i] != 0:
                         if not isConstrained or args.get('flexibleConstraints', False):
-                            force.addAngle(angle[0], angle[1], angle[2], self.angle[i], self.k[i])
+                            particles.append(angle)
+                            parameters.append((self.angle[i], self.k[i]))
                     break
+        force.addAngles(particles, parameters)
 
 parsers["HarmonicAngleForce"] = HarmonicAngleGenerator.parseElement
 
@@ -2376,6 +2574,9 @@ class PeriodicTorsionGenerator(object):
             sys.addForce(force)
         else:
             force = existing[0]
+        particles = []
+        periodicity = []
+        parameters = []
         wildcard = self.ff._atomClasses['']
         proper_cache = {}
         for torsion in data.propers:
@@ -2405,7 +2606,9 @@ class PeriodicTorsionGenerator(object):
             if match is not None:
                 for i in range(len(match.phase)):
                     if match.k[i] != 0:
-                        force.addTorsion(torsion[0], torsion[1], torsion[2], torsion[3], match.periodicity[i], match.phase[i], match.k[i])
+                        particles.append(torsion)
+                        periodicity.append(match.periodicity[i])
+                        parameters.append((match.phase[i], match.k[i]))
         impr_cache = {}
         for torsion in data.impropers:
             t1, t2, t3, t4 = [data.atomType[data.atoms[torsion[i]]] for i in range(4)]
@@ -2432,11 +2635,14 @@ class PeriodicTorsionGenerator(object):
                     if tordef.k[i] != 0:
                         if tordef.ordering == 'smirnoff':
                             # Add all torsions in trefoil
-                            force.addTorsion(a1, a2, a3, a4, tordef.periodicity[i], tordef.phase[i], tordef.k[i])
-                            force.addTorsion(a1, a3, a4, a2, tordef.periodicity[i], tordef.phase[i], tordef.k[i])
-                            force.addTorsion(a1, a4, a2, a3, tordef.periodicity[i], tordef.phase[i], tordef.k[i])
+                            particles += [(a1, a2, a3, a4), (a1, a3, a4, a2), (a1, a4, a2, a3)]
+                            periodicity += 3*[tordef.periodicity[i]]
+                            parameters += 3*[(tordef.phase[i], tordef.k[i])]
                         else:
-                            force.addTorsion(a1, a2, a3, a4, tordef.periodicity[i], tordef.phase[i], tordef.k[i])
+                            particles.append((a1, a2, a3, a4))
+                            periodicity.append(tordef.periodicity[i])
+                            parameters.append((tordef.phase[i], tordef.k[i]))
+        force.addTorsions(particles, periodicity, parameters)
 parsers["PeriodicTorsionForce"] = PeriodicTorsionGenerator.parseElement
 
 ## @private
@@ -2669,9 +2875,7 @@ class NonbondedGenerator(object):
         if nonbondedMethod not in methodMap:
             raise ValueError('Illegal nonbonded method for NonbondedForce')
         force = mm.NonbondedForce()
-        for atom in data.atoms:
-            values = self.params.getAtomParameters(atom, data)
-            force.addParticle(values[0], values[1], values[2])
+        force.addParticles([self.params.getAtomParameters(atom, data) for atom in data.atoms])
         force.setNonbondedMethod(methodMap[nonbondedMethod])
         force.setCutoffDistance(nonbondedCutoff)
         if args['switchDistance'] is not None:
@@ -2867,10 +3071,10 @@ class LennardJonesGenerator(object):
         # Create the exceptions.
 
         bondIndices = _findBondsForExclusions(data, sys)
-        forceCopy = deepcopy(self.force)
-        forceCopy.createExclusionsFromBonds(bondIndices, 2)
-        self.force.createExclusionsFromBonds(bondIndices, 3)
-        if self.force.getNumExclusions() > forceCopy.getNumExclusions() and self.lj14scale != 0:
+        pairs = _findExclusions(bondIndices, 3, sys.getNumParticles())
+        self.force.addExclusions([(p1, p2) for p1, p2, sep in pairs])
+        pairs14 = [(p1, p2) for p1, p2, sep in pairs if sep == 3]
+        if len(pairs14) > 0 and self.lj14scale != 0:
             # We need to create a CustomBondForce and use it to implement the scaled 1-4 interactions.
 
             bonded = mm.CustomBondForce('%g*epsilon*((sigma/r)^12-(sigma/r)^6)' % (4*self.lj14scale))
@@ -2878,27 +3082,24 @@ class LennardJonesGenerator(object):
             bonded.addPerBondParameter('epsilon')
             bonded.setName('LennardJones14')
             sys.addForce(bonded)
-            skip = set(tuple(forceCopy.getExclusionParticles(i)) for i in range(forceCopy.getNumExclusions()))
-            for i in range(self.force.getNumExclusions()):
-                p1,p2 = self.force.getExclusionParticles(i)
+            for p1, p2 in pairs14:
                 a1 = data.atoms[p1]
                 a2 = data.atoms[p2]
-                if (p1,p2) not in skip and (p2,p1) not in skip:
-                    nbfix = self.getNBFIX(data.atomType[a1], data.atomType[a2])
-                    if nbfix is not None:
-                        sigma, epsilon = nbfix
-                    else:
-                        values1 = self.ljTypes.getAtomParameters(a1, data)
-                        values2 = self.ljTypes.getAtomParameters(a2, data)
-                        extra1 = self.ljTypes.getExtraParameters(a1, data)
-                        extra2 = self.ljTypes.getExtraParameters(a2, data)
-                        sigma1 = float(extra1['sigma14']) if 'sigma14' in extra1 else values1[0]
-                        sigma2 = float(extra2['sigma14']) if 'sigma14' in extra2 else values2[0]
-                        epsilon1 = float(extra1['epsilon14']) if 'epsilon14' in extra1 else values1[1]
-                        epsilon2 = float(extra2['epsilon14']) if 'epsilon14' in extra2 else values2[1]
-                        sigma = 0.5*(sigma1+sigma2)
-                        epsilon = sqrt(epsilon1*epsilon2)
-                    bonded.addBond(p1, p2, (sigma, epsilon))
+                nbfix = self.getNBFIX(data.atomType[a1], data.atomType[a2])
+                if nbfix is not None:
+                    sigma, epsilon = nbfix
+                else:
+                    values1 = self.ljTypes.getAtomParameters(a1, data)
+                    values2 = self.ljTypes.getAtomParameters(a2, data)
+                    extra1 = self.ljTypes.getExtraParameters(a1, data)
+                    extra2 = self.ljTypes.getExtraParameters(a2, data)
+                    sigma1 = float(extra1['sigma14']) if 'sigma14' in extra1 else values1[0]
+                    sigma2 = float(extra2['sigma14']) if 'sigma14' in extra2 else values2[0]
+                    epsilon1 = float(extra1['epsilon14']) if 'epsilon14' in extra1 else values1[1]
+                    epsilon2 = float(extra2['epsilon14']) if 'epsilon14' in extra2 else values2[1]
+                    sigma = 0.5*(sigma1+sigma2)
+                    epsilon = sqrt(epsilon1*epsilon2)
+                bonded.addBond(p1, p2, (sigma, epsilon))
 
 parsers["LennardJonesForce"] = LennardJonesGenerator.parseElement
 
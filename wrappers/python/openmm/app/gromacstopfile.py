@@ -40,11 +40,13 @@ from . import amberprmtopfile as prmtop
 import openmm.unit as unit
 import openmm as mm
 import math
+import numpy as np
 import os
 import re
 import shutil
-from collections import OrderedDict, defaultdict
+from collections import OrderedDict
 from itertools import combinations, combinations_with_replacement
+from functools import partial
 from copy import deepcopy
 
 HBonds = ff.HBonds
@@ -698,9 +700,7 @@ class GromacsTopFile(object):
         atom_types = []
         for moleculeName, moleculeCount in self._molecules:
             moleculeType = self._moleculeTypes[moleculeName]
-            for _ in range(moleculeCount):
-                for atom in moleculeType.atoms:
-                    atom_types.append(atom[1])
+            atom_types += [atom[1] for atom in moleculeType.atoms]*max(moleculeCount, 0)
         has_nbfix_terms = any([pair in self._nonbondTypes for pair in combinations_with_replacement(sorted(set(atom_types)), 2)])
 
         if has_nbfix_terms:
@@ -748,10 +748,15 @@ class GromacsTopFile(object):
         harmonicTorsion = None
         cmap = None
         mapIndices = {}
-        bondIndices = []
         topologyAtoms = list(self.topology.atoms())
-        exclusions = []
-        pairs = []
+
+        # Atom indices and parameters of the terms for all molecules are collected into arrays, which are
+        # added to the Forces once all molecules have been processed.
+
+        bondIndices = [np.zeros((0, 2), dtype=np.int64)]
+        exclusions = [np.zeros((0, 2), dtype=np.int64)]
+        pairIndices = [np.zeros((0, 2), dtype=np.int64)]
+        pairParams = [np.zeros((0, 3))]
         fudgeQQ = float(self._defaults[4])
         fudgeLJ = float(self._defaults[3])
 
@@ -774,438 +779,486 @@ class GromacsTopFile(object):
                     types.append(key)
 
         if has_nbfix_terms:
-            # Build a lookup table and angle/dihedral indices list to
-            # let us handle exclusion manually.
-            angleIndices = []
-            torsionIndices = []
-            atom_partners = defaultdict(lambda : defaultdict(set))
-            atom_charges = []
+            # Exceptions are created manually for 1-4 pairs and for atoms separated by one or two bonds.
+            nbfix14Indices = [np.zeros((0, 2), dtype=np.int64)]
+            nbfix14Params = [np.zeros((0, 3))]
+            nbfixExclusions = [np.zeros((0, 2), dtype=np.int64)]
 
-        # Loop over molecules and create the specified number of each type.
+        # Loop over molecule types.  The parameters for each type are resolved only once, producing lists
+        # of terms with atom indices relative to the start of the molecule.  They are then added for every
+        # copy of the molecule with the indices offset.
 
+        degToRad = math.pi/180
         for moleculeName, moleculeCount in self._molecules:
+            if moleculeCount <= 0:
+                continue
             moleculeType = self._moleculeTypes[moleculeName]
             exclusionsFromBonds = moleculeType.findExclusionsFromBonds(self._genpairs)
-            for i in range(moleculeCount):
+            numAtoms = len(moleculeType.atoms)
 
-                # Record the types of all atoms.
+            # Every copy of the molecule has identical atoms in the Topology, so the first one can be
+            # used to decide which terms become constraints.
 
-                baseAtomIndex = sys.getNumParticles()
-                atomTypes = [atom[1] for atom in moleculeType.atoms]
-                try:
-                    bondedTypes = [self._atomTypes[t][1] for t in atomTypes]
-                except KeyError as e:
-                    raise ValueError('Unknown atom type: ' + e.message)
-                bondedTypes = [b if b is not None else a for a, b in zip(atomTypes, bondedTypes)]
+            baseAtomIndex = sys.getNumParticles()
 
-                # Add atoms.
+            # Each entry in forceTerms is a tuple (function, atom indices, extra arguments) describing a
+            # call that adds a term to a Force.  Terms for Forces that support adding many terms at once
+            # are instead stored in bulkTerms, which maps each Force to lists of atom indices and of
+            # parameters for each term.
 
-                for fields in moleculeType.atoms:
-                    if len(fields) >= 8:
-                        mass = float(fields[7])
-                    else:
-                        mass = float(self._atomTypes[fields[1]][3])
-                    sys.addParticle(mass)
+            forceTerms = []
+            bulkTerms = OrderedDict()
+            constraintTerms = []
 
-                # Add bonds.
+            # Record the types of all atoms.
 
-                atomBonds = [{} for x in range(len(moleculeType.atoms))]
-                for fields in moleculeType.bonds:
-                    atoms = [int(x)-1 for x in fields[:2]]
-                    types = tuple(bondedTypes[i] for i in atoms)
-                    bondType = fields[2]
-                    reversedTypes = types[::-1]+(bondType,)
-                    types = types+(bondType,)
-                    if len(fields) >= 5:
-                        params = fields[3:5]
-                    elif types in self._bondTypes:
-                        params = self._bondTypes[types][3:5]
-                    elif reversedTypes in self._bondTypes:
-                        params = self._bondTypes[reversedTypes][3:5]
-                    else:
-                        raise ValueError('No parameters specified for bond: '+fields[0]+', '+fields[1])
-                    # Decide whether to use a constraint or a bond.
-                    useConstraint = False
-                    if rigidWater and topologyAtoms[baseAtomIndex+atoms[0]].residue.name == 'HOH':
-                        useConstraint = True
-                    if constraints in (AllBonds, HAngles):
-                        useConstraint = True
-                    elif constraints is HBonds:
-                        elements = [topologyAtoms[baseAtomIndex+i].element for i in atoms]
-                        if elem.hydrogen in elements:
-                            useConstraint = True
-                    # Add the bond or constraint.
-                    length = float(params[0])
-                    if useConstraint:
-                        sys.addConstraint(baseAtomIndex+atoms[0], baseAtomIndex+atoms[1], length)
-                    elif bondType == '1':
-                        if bondType not in bonds:
-                            bonds[bondType] = mm.HarmonicBondForce()
-                            sys.addForce(bonds[bondType])
-                        bonds[bondType].addBond(baseAtomIndex+atoms[0], baseAtomIndex+atoms[1], length, float(params[1]))
-                    elif bondType == '2':
-                        if bondType not in bonds:
-                            bonds[bondType] = mm.CustomBondForce('0.25*k*(r^2-r0^2)^2')
-                            bonds[bondType].addPerBondParameter('r0')
-                            bonds[bondType].addPerBondParameter('k')
-                            bonds[bondType].setName('GROMOSBondForce')
-                            sys.addForce(bonds[bondType])
-                        bonds[bondType].addBond(baseAtomIndex+atoms[0], baseAtomIndex+atoms[1], (length, float(params[1])))
-                    else:
-                        raise ValueError('Internal error: bondType has unexpected value: '+bondType)
-                    # Record information that will be needed for constraining angles.
-                    atomBonds[atoms[0]][atoms[1]] = length
-                    atomBonds[atoms[1]][atoms[0]] = length
+            atomTypes = [atom[1] for atom in moleculeType.atoms]
+            try:
+                bondedTypes = [self._atomTypes[t][1] for t in atomTypes]
+            except KeyError as e:
+                raise ValueError('Unknown atom type: ' + e.message)
+            bondedTypes = [b if b is not None else a for a, b in zip(atomTypes, bondedTypes)]
 
-                # Add angles.
+            # Find atom masses.
 
-                degToRad = math.pi/180
-                for fields in moleculeType.angles:
-                    atoms = [int(x)-1 for x in fields[:3]]
-                    types = tuple(bondedTypes[i] for i in atoms)
-                    angleType = fields[3]
-                    if len(fields) >= 6:
-                        params = fields[4:]
-                    elif types in self._angleTypes:
-                        params = self._angleTypes[types][4:]
-                    elif types[::-1] in self._angleTypes:
-                        params = self._angleTypes[types[::-1]][4:]
-                    else:
-                        raise ValueError('No parameters specified for angle: '+fields[0]+', '+fields[1]+', '+fields[2])
-                    # Decide whether to use a constraint or a bond.
-                    useConstraint = False
-                    if rigidWater and topologyAtoms[baseAtomIndex+atoms[0]].residue.name == 'HOH':
+            masses = []
+            for fields in moleculeType.atoms:
+                if len(fields) >= 8:
+                    mass = float(fields[7])
+                else:
+                    mass = float(self._atomTypes[fields[1]][3])
+                masses.append(mass)
+
+            # Add bonds.
+
+            atomBonds = [{} for x in range(numAtoms)]
+            for fields in moleculeType.bonds:
+                atoms = [int(x)-1 for x in fields[:2]]
+                types = tuple(bondedTypes[i] for i in atoms)
+                bondType = fields[2]
+                reversedTypes = types[::-1]+(bondType,)
+                types = types+(bondType,)
+                if len(fields) >= 5:
+                    params = fields[3:5]
+                elif types in self._bondTypes:
+                    params = self._bondTypes[types][3:5]
+                elif reversedTypes in self._bondTypes:
+                    params = self._bondTypes[reversedTypes][3:5]
+                else:
+                    raise ValueError('No parameters specified for bond: '+fields[0]+', '+fields[1])
+                # Decide whether to use a constraint or a bond.
+                useConstraint = False
+                if rigidWater and topologyAtoms[baseAtomIndex+atoms[0]].residue.name == 'HOH':
+                    useConstraint = True
+                if constraints in (AllBonds, HAngles):
+                    useConstraint = True
+                elif constraints is HBonds:
+                    elements = [topologyAtoms[baseAtomIndex+i].element for i in atoms]
+                    if elem.hydrogen in elements:
                         useConstraint = True
-                    if constraints is HAngles:
-                        elements = [topologyAtoms[baseAtomIndex+i].element for i in atoms]
-                        if elements[0] == elem.hydrogen and elements[2] == elem.hydrogen:
-                            useConstraint = True
-                        elif elements[1] == elem.oxygen and (elements[0] == elem.hydrogen or elements[2] == elem.hydrogen):
-                            useConstraint = True
-                    # Add the bond or constraint.
-                    theta = float(params[0])*degToRad
-                    if useConstraint:
-                        # Compute the distance between atoms and add a constraint
-                        if atoms[0] in atomBonds[atoms[1]] and atoms[2] in atomBonds[atoms[1]]:
-                            l1 = atomBonds[atoms[1]][atoms[0]]
-                            l2 = atomBonds[atoms[1]][atoms[2]]
-                            length = math.sqrt(l1*l1 + l2*l2 - 2*l1*l2*math.cos(theta))
-                            sys.addConstraint(baseAtomIndex+atoms[0], baseAtomIndex+atoms[2], length)
-                    else:
-                        if angleType in ('1', '5'):
-                            if angleType not in angles:
-                                angles[angleType] = mm.HarmonicAngleForce()
-                                sys.addForce(angles[angleType])
-                            angles[angleType].addAngle(baseAtomIndex+atoms[0], baseAtomIndex+atoms[1], baseAtomIndex+atoms[2], theta, float(params[1]))
-                            if angleType == '5':
-                                # This is a Urey-Bradley term, so also add the bond.
-                                if '1' not in bonds:
-                                    bonds['1'] = mm.HarmonicBondForce()
-                                    sys.addForce(bonds['1'])
-                                k = float(params[3])
-                                if k != 0:
-                                    bonds['1'].addBond(baseAtomIndex + atoms[0], baseAtomIndex + atoms[2], float(params[2]), k)
-                        elif angleType == '2':
-                            if angleType not in angles:
-                                angles[angleType] = mm.CustomAngleForce('0.5*k*(cos(theta)-cos(theta0))^2')
-                                angles[angleType].addPerAngleParameter('theta0')
-                                angles[angleType].addPerAngleParameter('k')
-                                angles[angleType].setName('GROMOSAngleForce')
-                                sys.addForce(angles[angleType])
-                            angles[angleType].addAngle(baseAtomIndex+atoms[0], baseAtomIndex+atoms[1], baseAtomIndex+atoms[2], (theta, float(params[1])))
-                        else:
-                            raise ValueError('Internal error: angleType has unexpected value: '+angleType)
-
-                # Add torsions.
-
-                for fields in moleculeType.dihedrals:
-                    atoms = [int(x)-1 for x in fields[:4]]
-                    types = tuple(bondedTypes[i] for i in atoms)
-                    dihedralType = fields[4]
-                    reversedTypes = types[::-1]+(dihedralType,)
-                    types = types+(dihedralType,)
-                    if (dihedralType in ('1', '4', '5', '9') and len(fields) > 7) or (dihedralType == '3' and len(fields) > 10) or (dihedralType == '2' and len(fields) > 6):
-                        paramsList = [fields]
-                    else:
-                        # Look for a matching dihedral type.
-                        paramsList = None
-                        if (types[1], types[2]) in dihedralTypeTable:
-                            dihedralTypes = dihedralTypeTable[(types[1], types[2])]
-                        else:
-                            dihedralTypes = wildcardDihedralTypes
-                        for key in dihedralTypes:
-                            if all(a == b or a == 'X' for a, b in zip(key, types)) or all(a == b or a == 'X' for a, b in zip(key, reversedTypes)):
-                                paramsList = self._dihedralTypes[key]
-                                if 'X' not in key:
-                                    break
-                        if paramsList is None:
-                            raise ValueError('No parameters specified for dihedral: '+fields[0]+', '+fields[1]+', '+fields[2]+', '+fields[3])
-                    for params in paramsList:
-                        if dihedralType in ('1', '4', '9'):
-                            # Periodic torsion
-                            k = float(params[6])
-                            if k != 0:
-                                if periodic is None:
-                                    periodic = mm.PeriodicTorsionForce()
-                                    sys.addForce(periodic)
-                                periodic.addTorsion(baseAtomIndex+atoms[0], baseAtomIndex+atoms[1], baseAtomIndex+atoms[2], baseAtomIndex+atoms[3], int(float(params[7])), float(params[5])*degToRad, k)
-                        elif dihedralType == '2':
-                            # Harmonic torsion
-                            k = float(params[6])
-                            phi0 = float(params[5])
+                # Add the bond or constraint.
+                length = float(params[0])
+                if useConstraint:
+                    constraintTerms.append((atoms[0], atoms[1], length))
+                elif bondType == '1':
+                    if bondType not in bonds:
+                        bonds[bondType] = mm.HarmonicBondForce()
+                        sys.addForce(bonds[bondType])
+                    _appendBulkTerm(bulkTerms, bonds[bondType], atoms, (length, float(params[1])))
+                elif bondType == '2':
+                    if bondType not in bonds:
+                        bonds[bondType] = mm.CustomBondForce('0.25*k*(r^2-r0^2)^2')
+                        bonds[bondType].addPerBondParameter('r0')
+                        bonds[bondType].addPerBondParameter('k')
+                        bonds[bondType].setName('GROMOSBondForce')
+                        sys.addForce(bonds[bondType])
+                    forceTerms.append((bonds[bondType].addBond, atoms, ((length, float(params[1])),)))
+                else:
+                    raise ValueError('Internal error: bondType has unexpected value: '+bondType)
+                # Record information that will be needed for constraining angles.
+                atomBonds[atoms[0]][atoms[1]] = length
+                atomBonds[atoms[1]][atoms[0]] = length
+
+            # Add angles.
+
+            for fields in moleculeType.angles:
+                atoms = [int(x)-1 for x in fields[:3]]
+                types = tuple(bondedTypes[i] for i in atoms)
+                angleType = fields[3]
+                if len(fields) >= 6:
+                    params = fields[4:]
+                elif types in self._angleTypes:
+                    params = self._angleTypes[types][4:]
+                elif types[::-1] in self._angleTypes:
+                    params = self._angleTypes[types[::-1]][4:]
+                else:
+                    raise ValueError('No parameters specified for angle: '+fields[0]+', '+fields[1]+', '+fields[2])
+                # Decide whether to use a constraint or a bond.
+                useConstraint = False
+                if rigidWater and topologyAtoms[baseAtomIndex+atoms[0]].residue.name == 'HOH':
+                    useConstraint = True
+                if constraints is HAngles:
+                    elements = [topologyAtoms[baseAtomIndex+i].element for i in atoms]
+                    if elements[0] == elem.hydrogen and elements[2] == elem.hydrogen:
+                        useConstraint = True
+                    elif elements[1] == elem.oxygen and (elements[0] == elem.hydrogen or elements[2] == elem.hydrogen):
+                        useConstraint = True
+                # Add the bond or constraint.
+                theta = float(params[0])*degToRad
+                if useConstraint:
+                    # Compute the distance between atoms and add a constraint
+                    if atoms[0] in atomBonds[atoms[1]] and atoms[2] in atomBonds[atoms[1]]:
+                        l1 = atomBonds[atoms[1]][atoms[0]]
+                        l2 = atomBonds[atoms[1]][atoms[2]]
+                        length = math.sqrt(l1*l1 + l2*l2 - 2*l1*l2*math.cos(theta))
+                        constraintTerms.append((atoms[0], atoms[2], length))
+                else:
+                    if angleType in ('1', '5'):
+                        if angleType not in angles:
+                            angles[angleType] = mm.HarmonicAngleForce()
+                            sys.addForce(angles[angleType])
+                        _appendBulkTerm(bulkTerms, angles[angleType], atoms, (theta, float(params[1])))
+                        if angleType == '5':
+                            # This is a Urey-Bradley term, so also add the bond.
+                            if '1' not in bonds:
+                                bonds['1'] = mm.HarmonicBondForce()
+                                sys.addForce(bonds['1'])
+                            k = float(params[3])
                             if k != 0:
-                                if harmonicTorsion is None:
-                                    harmonicTorsion = mm.CustomTorsionForce('0.5*k*(thetap-theta0)^2; thetap = step(-(theta-theta0+pi))*2*pi+theta+step(theta-theta0-pi)*(-2*pi); pi = %.15g' % math.pi)
-                                    harmonicTorsion.addPerTorsionParameter('theta0')
-                                    harmonicTorsion.addPerTorsionParameter('k')
-                                    harmonicTorsion.setName('HarmonicTorsionForce')
-                                    sys.addForce(harmonicTorsion)
-                                # map phi0 into correct space
-                                phi0 = phi0 - 360 if phi0 > 180 else phi0
-                                harmonicTorsion.addTorsion(baseAtomIndex+atoms[0], baseAtomIndex+atoms[1], baseAtomIndex+atoms[2], baseAtomIndex+atoms[3], (phi0*degToRad, k))
-                        else:
-                            # RB Torsion
-                            c = [float(x) for x in params[5:11]]
-                            if any(x != 0 for x in c):
-                                if rb is None:
-                                    rb = mm.RBTorsionForce()
-                                    sys.addForce(rb)
-                                if dihedralType == '5':
-                                    # Convert Fourier coefficients to RB coefficients.
-                                    c = [c[1]+0.5*(c[0]+c[2]), 0.5*(-c[0]+3*c[2]), -c[1]+4*c[3], -2*c[2], -4*c[3], 0]
-                                rb.addTorsion(baseAtomIndex+atoms[0], baseAtomIndex+atoms[1], baseAtomIndex+atoms[2], baseAtomIndex+atoms[3], c[0], c[1], c[2], c[3], c[4], c[5])
-
-                # Add CMAP terms.
-
-                for fields in moleculeType.cmaps:
-                    atoms = [int(x)-1 for x in fields[:5]]
-                    types = tuple(bondedTypes[i] for i in atoms)
-                    if len(fields) >= 8 and len(fields) >= 8+int(fields[6])*int(fields[7]):
-                        params = fields
-                    elif types in self._cmapTypes:
-                        params = self._cmapTypes[types]
-                    elif types[::-1] in self._cmapTypes:
-                        params = self._cmapTypes[types[::-1]]
+                                _appendBulkTerm(bulkTerms, bonds['1'], (atoms[0], atoms[2]), (float(params[2]), k))
+                    elif angleType == '2':
+                        if angleType not in angles:
+                            angles[angleType] = mm.CustomAngleForce('0.5*k*(cos(theta)-cos(theta0))^2')
+                            angles[angleType].addPerAngleParameter('theta0')
+                            angles[angleType].addPerAngleParameter('k')
+                            angles[angleType].setName('GROMOSAngleForce')
+                            sys.addForce(angles[angleType])
+                        forceTerms.append((angles[angleType].addAngle, atoms, ((theta, float(params[1])),)))
                     else:
-                        raise ValueError('No parameters specified for cmap: '+fields[0]+', '+fields[1]+', '+fields[2]+', '+fields[3]+', '+fields[4])
-                    if cmap is None:
-                        cmap = mm.CMAPTorsionForce()
-                        sys.addForce(cmap)
-                    mapSize = int(params[6])
-                    if mapSize != int(params[7]):
-                        raise ValueError('Non-square CMAPs are not supported')
-                    map = []
-                    for i in range(mapSize):
-                        for j in range(mapSize):
-                            map.append(float(params[8+mapSize*((j+mapSize//2)%mapSize)+((i+mapSize//2)%mapSize)]))
-                    map = tuple(map)
-                    if map not in mapIndices:
-                        mapIndices[map] = cmap.addMap(mapSize, map)
-                    cmap.addTorsion(mapIndices[map], baseAtomIndex+atoms[0], baseAtomIndex+atoms[1], baseAtomIndex+atoms[2], baseAtomIndex+atoms[3],
-                                 baseAtomIndex+atoms[1], baseAtomIndex+atoms[2], baseAtomIndex+atoms[3], baseAtomIndex+atoms[4])
-
-                # Set nonbonded parameters for particles.
-
-                for fields in moleculeType.atoms:
-                    params = self._atomTypes[fields[1]]
-
-                    if len(fields) > 6:
-                        q = float(fields[6])
+                        raise ValueError('Internal error: angleType has unexpected value: '+angleType)
+
+            # Add torsions.
+
+            for fields in moleculeType.dihedrals:
+                atoms = [int(x)-1 for x in fields[:4]]
+                types = tuple(bondedTypes[i] for i in atoms)
+                dihedralType = fields[4]
+                reversedTypes = types[::-1]+(dihedralType,)
+                types = types+(dihedralType,)
+                if (dihedralType in ('1', '4', '5', '9') and len(fields) > 7) or (dihedralType == '3' and len(fields) > 10) or (dihedralType == '2' and len(fields) > 6):
+                    paramsList = [fields]
+                else:
+                    # Look for a matching dihedral type.
+                    paramsList = None
+                    if (types[1], types[2]) in dihedralTypeTable:
+                        dihedralTypes = dihedralTypeTable[(types[1], types[2])]
                     else:
-                        q = float(params[4])
-
-                    if has_nbfix_terms:
-                        nb.addParticle(q, 1.0, 0.0)
-                        atom_charges.append(q)
-                        ljnbfix.addParticle([0])
+                        dihedralTypes = wildcardDihedralTypes
+                    for key in dihedralTypes:
+                        if all(a == b or a == 'X' for a, b in zip(key, types)) or all(a == b or a == 'X' for a, b in zip(key, reversedTypes)):
+                            paramsList = self._dihedralTypes[key]
+                            if 'X' not in key:
+                                break
+                    if paramsList is None:
+                        raise ValueError('No parameters specified for dihedral: '+fields[0]+', '+fields[1]+', '+fields[2]+', '+fields[3])
+                for params in paramsList:
+                    if dihedralType in ('1', '4', '9'):
+                        # Periodic torsion
+                        k = float(params[6])
+                        if k != 0:
+                            if periodic is None:
+                                periodic = mm.PeriodicTorsionForce()
+                                sys.addForce(periodic)
+                            _appendBulkTerm(bulkTerms, periodic, atoms, (int(float(params[7])), float(params[5])*degToRad, k))
+                    elif dihedralType == '2':
+                        # Harmonic torsion
+                        k = float(params[6])
+                        phi0 = float(params[5])
+                        if k != 0:
+                            if harmonicTorsion is None:
+                                harmonicTorsion = mm.CustomTorsionForce('0.5*k*(thetap-theta0)^2; thetap = step(-(theta-theta0+pi))*2*pi+theta+step(theta-theta0-pi)*(-2*pi); pi = %.15g' % math.pi)
+                                harmonicTorsion.addPerTorsionParameter('theta0')
+                                harmonicTorsion.addPerTorsionParameter('k')
+                                harmonicTorsion.setName('HarmonicTorsionForce')
+                                sys.addForce(harmonicTorsion)
+                            # map phi0 into correct space
+                            phi0 = phi0 - 360 if phi0 > 180 else phi0
+                            forceTerms.append((harmonicTorsion.addTorsion, atoms, ((phi0*degToRad, k),)))
                     else:
-                        if self._defaults[1] == '1':
-                            nb.addParticle(q, 1.0, 0.0)
-                            # LJ interactions are handled via separate LJ force with custom potential
-                            lj.addParticle([math.sqrt(float(params[6])), math.sqrt(float(params[7]))])
-                        elif self._defaults[1] == '2':
-                            nb.addParticle(q, float(params[6]), float(params[7]))
-                        elif self._defaults[1] == '3':
-                            nb.addParticle(q, 1.0, 0.0)
-                            sigma = float(params[6])
-                            epsilon = float(params[7])
-                            # LJ interactions are handled via separate LJ force with custom potential
-                            lj.addParticle([math.sqrt(4*epsilon*sigma**6), math.sqrt(4*epsilon*sigma**12)])
+                        # RB Torsion
+                        c = [float(x) for x in params[5:11]]
+                        if any(x != 0 for x in c):
+                            if rb is None:
+                                rb = mm.RBTorsionForce()
+                                sys.addForce(rb)
+                            if dihedralType == '5':
+                                # Convert Fourier coefficients to RB coefficients.
+                                c = [c[1]+0.5*(c[0]+c[2]), 0.5*(-c[0]+3*c[2]), -c[1]+4*c[3], -2*c[2], -4*c[3], 0]
+                            forceTerms.append((rb.addTorsion, atoms, tuple(c)))
+
+            # Add CMAP terms.
+
+            for fields in moleculeType.cmaps:
+                atoms = [int(x)-1 for x in fields[:5]]
+                types = tuple(bondedTypes[i] for i in atoms)
+                if len(fields) >= 8 and len(fields) >= 8+int(fields[6])*int(fields[7]):
+                    params = fields
+                elif types in self._cmapTypes:
+                    params = self._cmapTypes[types]
+                elif types[::-1] in self._cmapTypes:
+                    params = self._cmapTypes[types[::-1]]
+                else:
+                    raise ValueError('No parameters specified for cmap: '+fields[0]+', '+fields[1]+', '+fields[2]+', '+fields[3]+', '+fields[4])
+                if cmap is None:
+                    cmap = mm.CMAPTorsionForce()
+                    sys.addForce(cmap)
+                mapSize = int(params[6])
+                if mapSize != int(params[7]):
+                    raise ValueError('Non-square CMAPs are not supported')
+                map = []
+                for i in range(mapSize):
+                    for j in range(mapSize):
+                        map.append(float(params[8+mapSize*((j+mapSize//2)%mapSize)+((i+mapSize//2)%mapSize)]))
+                map = tuple(map)
+                if map not in mapIndices:
+                    mapIndices[map] = cmap.addMap(mapSize, map)
+                forceTerms.append((partial(cmap.addTorsion, mapIndices[map]), atoms[:4]+atoms[1:], ()))
+
+            # Find nonbonded parameters for particles.
+
+            particleParams = []
+            ljParams = []
+            for fields in moleculeType.atoms:
+                params = self._atomTypes[fields[1]]
+
+                if len(fields) > 6:
+                    q = float(fields[6])
+                else:
+                    q = float(params[4])
 
-                for fields in moleculeType.bonds:
-                    atoms = [int(x)-1 for x in fields[:2]]
-                    bondIndices.append((baseAtomIndex+atoms[0], baseAtomIndex+atoms[1]))
-                for fields in moleculeType.constraints:
-                    if fields[2] == '1':
-                        atoms = [int(x)-1 for x in fields[:2]]
-                        bondIndices.append((baseAtomIndex+atoms[0], baseAtomIndex+atoms[1]))
                 if has_nbfix_terms:
-                    for fields in moleculeType.bonds:
-                        atoms = [int(x)-1 for x in fields[:2]]
-                        atom_partners[baseAtomIndex+atoms[0]]['bond'].add(baseAtomIndex+atoms[1])
-                        atom_partners[baseAtomIndex+atoms[1]]['bond'].add(baseAtomIndex+atoms[0])
-                    for fields in moleculeType.angles:
-                        atoms = [int(x)-1 for x in fields[:3]]
-                        angleIndices.append((baseAtomIndex+atoms[0], baseAtomIndex+atoms[1], baseAtomIndex+atoms[2]))
-                        for pair in combinations(atoms, 2):
-                            atom_partners[baseAtomIndex+pair[0]]['angle'].add(baseAtomIndex+pair[1])
-                            atom_partners[baseAtomIndex+pair[1]]['angle'].add(baseAtomIndex+pair[0])
-                    for fields in moleculeType.dihedrals:
-                        atoms = [int(x)-1 for x in fields[:4]]
-                        torsionIndices.append((baseAtomIndex+atoms[0], baseAtomIndex+atoms[1], baseAtomIndex+atoms[2], baseAtomIndex+atoms[3]))
-                        for pair in combinations(atoms, 2):
-                            atom_partners[baseAtomIndex+pair[0]]['torsion'].add(baseAtomIndex+pair[1])
-                            atom_partners[baseAtomIndex+pair[1]]['torsion'].add(baseAtomIndex+pair[0])
-
-                # Record nonbonded exceptions.
-                # typically these are 1-4 pairs
-                for fields in moleculeType.pairs:
+                    particleParams.append((q, 1.0, 0.0))
+                else:
+                    if self._defaults[1] == '1':
+                        particleParams.append((q, 1.0, 0.0))
+                        # LJ interactions are handled via separate LJ force with custom potential
+                        ljParams.append([math.sqrt(float(params[6])), math.sqrt(float(params[7]))])
+                    elif self._defaults[1] == '2':
+                        particleParams.append((q, float(params[6]), float(params[7])))
+                    elif self._defaults[1] == '3':
+                        particleParams.append((q, 1.0, 0.0))
+                        sigma = float(params[6])
+                        epsilon = float(params[7])
+                        # LJ interactions are handled via separate LJ force with custom potential
+                        ljParams.append([math.sqrt(4*epsilon*sigma**6), math.sqrt(4*epsilon*sigma**12)])
+
+            moleculeBondIndices = []
+            for fields in moleculeType.bonds:
+                moleculeBondIndices.append(tuple(int(x)-1 for x in fields[:2]))
+            for fields in moleculeType.constraints:
+                if fields[2] == '1':
+                    moleculeBondIndices.append(tuple(int(x)-1 for x in fields[:2]))
+            if has_nbfix_terms:
+                # Find which atoms are bonded to each atom or separated from it by an angle.  Atoms are
+                # recorded in the order they first appear in a bond or angle.
+                atom_partners = OrderedDict()
+                for fields in moleculeType.bonds:
                     atoms = [int(x)-1 for x in fields[:2]]
-                    types = tuple(atomTypes[i] for i in atoms)
-                    atom1params = nb.getParticleParameters(baseAtomIndex+atoms[0])
-                    atom2params = nb.getParticleParameters(baseAtomIndex+atoms[1])
-                    atom1params = [x.value_in_unit_system(unit.md_unit_system) for x in atom1params]
-                    atom2params = [x.value_in_unit_system(unit.md_unit_system) for x in atom2params]
-
-                    def convertParams(params):
-                        if self._defaults[1] == '3':
-                           # convert from sigma/epsilon given in topology file for combination rule 3 according to GROMACS convention
-                           sigma=params[0]
-                           epsilon=params[1]
-                           return [4*epsilon*sigma**6, 4*epsilon*sigma**12]
-                        return params
-                        
-                    if len(fields) >= 5:
-                        # extra parameters given for 1-4 interactions as part of the pair entry
-                        params = convertParams([float(x) for x in fields[3:5]])
-                    elif types in self._pairTypes:
-                        # parameters given under pairTypes
-                        params = convertParams([float(x) for x in self._pairTypes[types][3:5]])
-                    elif types[::-1] in self._pairTypes:
-                        # parameters given under pairTypes
-                        params = convertParams([float(x) for x in self._pairTypes[types[::-1]][3:5]])
-                    elif not self._genpairs:
-                        raise ValueError('No pair parameters defined for atom '
-                                         'types %s and gen-pairs is "no"' % types)
-                    elif has_nbfix_terms:
-                        continue
-                    else:
-                        # Generate the parameters based on the atom parameters.
+                    atom_partners.setdefault(atoms[0], (set(), set()))[0].add(atoms[1])
+                    atom_partners.setdefault(atoms[1], (set(), set()))[0].add(atoms[0])
+                for fields in moleculeType.angles:
+                    atoms = [int(x)-1 for x in fields[:3]]
+                    for pair in combinations(atoms, 2):
+                        atom_partners.setdefault(pair[0], (set(), set()))[1].add(pair[1])
+                        atom_partners.setdefault(pair[1], (set(), set()))[1].add(pair[0])
+                excluded_atom_pairs = set() # save these pairs so we don't zero them out
+                moleculeNbfix14Indices = []
+                moleculeNbfix14Params = []
+                for fields in moleculeType.dihedrals:
+                    tor = [int(x)-1 for x in fields[:4]]
+                    # First check to see if atoms 1 and 4 are already excluded because
+                    # they are 1-2 or 1-3 pairs (would happen in 6-member rings or
+                    # fewer). Then check that they're not already added as exclusions
+                    if tor[3] in atom_partners and any(tor[0] in partners for partners in atom_partners[tor[3]]): continue
+                    key = min((tor[0], tor[3]),
+                              (tor[3], tor[0]))
+                    if key in excluded_atom_pairs: continue # multiterm...
+
+                    q1 = particleParams[tor[0]][0]
+                    q4 = particleParams[tor[3]][0]
+                    charge_prod = fudgeQQ*q1*q4
+
+                    try:
+                        # use NBFix for 1-4 interactions if available to match GROMACS
+                        types = self._matchingNBFIX[tuple(sorted((atomTypes[tor[0]],atomTypes[tor[3]])))]
+                        params = (float(types[3]), float(types[4]))
+                        rmin14=params[0]
+                        epsilon=params[1]*fudgeLJ
+                    except KeyError:
+                        params1 = self._atomTypes[atomTypes[tor[0]]]
+                        params4 = self._atomTypes[atomTypes[tor[3]]]
+                        rmin1 = float(params1[6])
+                        eps1 = float(params1[7])
+                        rmin4 = float(params4[6])
+                        eps4 = float(params4[7])
+                        epsilon = math.sqrt(abs(eps1 * eps4))*fudgeLJ
                         if self._defaults[1] == '2':
-                            params = [0.5*(atom1params[1]+atom2params[1]), fudgeLJ*math.sqrt(atom1params[2]*atom2params[2])]
+                            rmin14 = (rmin1 + rmin4) / 2
                         else:
-                            atom1lj = lj.getParticleParameters(baseAtomIndex+atoms[0])
-                            atom2lj = lj.getParticleParameters(baseAtomIndex+atoms[1])
-                            params = [fudgeLJ*atom1lj[0]*atom2lj[0], fudgeLJ*atom1lj[1]*atom2lj[1]]
-                    pairs.append((baseAtomIndex+atoms[0], baseAtomIndex+atoms[1], atom1params[0]*atom2params[0]*fudgeQQ, params[0], params[1]))
-                for fields in moleculeType.exclusions:
-                    atoms = [int(x)-1 for x in fields]
-                    for atom in atoms[1:]:
-                        exclusions.append((baseAtomIndex+atoms[0], baseAtomIndex+atom))
-                for atoms in exclusionsFromBonds:
-                    exclusions.append((baseAtomIndex+atoms[0], baseAtomIndex+atoms[1]))
-
-                # Record virtual sites
-
-                for fields in moleculeType.vsites2:
-                    atoms = [int(x)-1 for x in fields[:3]]
-                    c1 = float(fields[4])
-                    vsite = mm.TwoParticleAverageSite(baseAtomIndex+atoms[1], baseAtomIndex+atoms[2], (1-c1), c1)
-                    sys.setVirtualSite(baseAtomIndex+atoms[0], vsite)
-                for fields in moleculeType.vsites3:
-                    atoms = [int(x)-1 for x in fields[:4]]
-                    vsiteType = fields[4]
-                    c1 = float(fields[5])
-                    c2 = float(fields[6])
-                    if vsiteType == '1':
-                        vsite = mm.ThreeParticleAverageSite(baseAtomIndex+atoms[1], baseAtomIndex+atoms[2], baseAtomIndex+atoms[3], 1-c1-c2, c1, c2)
-                    elif vsiteType == '4':
-                        c3 = float(fields[7])
-                        vsite = mm.OutOfPlaneSite(baseAtomIndex+atoms[1], baseAtomIndex+atoms[2], baseAtomIndex+atoms[3], c1, c2, c3)
-                    else:
-                        raise ValueError('Internal error: vsites3 has unexpected type: '+vsiteType)
-                    sys.setVirtualSite(baseAtomIndex+atoms[0], vsite)
+                            rmin14 = math.sqrt(rmin1 * rmin4)
 
-                # Add explicitly specified constraints.
+                    # Parameters are generated via standard combining rules.
+                    # If different 1-4 parameters are given via pairtypes they will be overwritten below.
+                    moleculeNbfix14Indices.append((tor[0], tor[3]))
+                    if self._defaults[1] == '3':
+                        moleculeNbfix14Params.append((charge_prod, 4*epsilon*rmin14**6, 4*epsilon*rmin14**12))
+                    else:
+                        moleculeNbfix14Params.append((charge_prod, rmin14, epsilon))
+                    excluded_atom_pairs.add(key)
 
-                for fields in moleculeType.constraints:
-                    atoms = [int(x)-1 for x in fields[:2]]
-                    length = float(fields[3])
-                    sys.addConstraint(baseAtomIndex+atoms[0], baseAtomIndex+atoms[1], length)
+                # Exclude all bonds and angles
+                moleculeNbfixExclusions = []
+                for atom_idx, (bonded, angled) in atom_partners.items():
+                    for atom2 in sorted(bonded):
+                        if atom2 > atom_idx:
+                            moleculeNbfixExclusions.append((atom_idx, atom2))
+                            excluded_atom_pairs.add((atom_idx, atom2))
+                    for atom2 in sorted(angled):
+                        if ((atom_idx, atom2) in excluded_atom_pairs):
+                            continue
+                        if atom2 > atom_idx:
+                            moleculeNbfixExclusions.append((atom_idx, atom2))
+                            excluded_atom_pairs.add((atom_idx, atom2))
+
+            # Record nonbonded exceptions.
+            # typically these are 1-4 pairs
+            moleculePairIndices = []
+            moleculePairParams = []
+            for fields in moleculeType.pairs:
+                atoms = [int(x)-1 for x in fields[:2]]
+                types = tuple(atomTypes[i] for i in atoms)
+                atom1params = particleParams[atoms[0]]
+                atom2params = particleParams[atoms[1]]
+
+                def convertParams(params):
+                    if self._defaults[1] == '3':
+                       # convert from sigma/epsilon given in topology file for combination rule 3 according to GROMACS convention
+                       sigma=params[0]
+                       epsilon=params[1]
+                       return [4*epsilon*sigma**6, 4*epsilon*sigma**12]
+                    return params
+                    
+                if len(fields) >= 5:
+                    # extra parameters given for 1-4 interactions as part of the pair entry
+                    params = convertParams([float(x) for x in fields[3:5]])
+                elif types in self._pairTypes:
+                    # parameters given under pairTypes
+                    params = convertParams([float(x) for x in self._pairTypes[types][3:5]])
+                elif types[::-1] in self._pairTypes:
+                    # parameters given under pairTypes
+                    params = convertParams([float(x) for x in self._pairTypes[types[::-1]][3:5]])
+                elif not self._genpairs:
+                    raise ValueError('No pair parameters defined for atom '
+                                     'types %s and gen-pairs is "no"' % types)
+                elif has_nbfix_terms:
+                    continue
+                else:
+                    # Generate the parameters based on the atom parameters.
+                    if self._defaults[1] == '2':
+                        params = [0.5*(atom1params[1]+atom2params[1]), fudgeLJ*math.sqrt(atom1params[2]*atom2params[2])]
+                    else:
+                        atom1lj = ljParams[atoms[0]]
+                        atom2lj = ljParams[atoms[1]]
+                        params = [fudgeLJ*atom1lj[0]*atom2lj[0], fudgeLJ*atom1lj[1]*atom2lj[1]]
+                moleculePairIndices.append((atoms[0], atoms[1]))
+                moleculePairParams.append((atom1params[0]*atom2params[0]*fudgeQQ, params[0], params[1]))
+            moleculeExclusions = []
+            for fields in moleculeType.exclusions:
+                atoms = [int(x)-1 for x in fields]
+                for atom in atoms[1:]:
+                    moleculeExclusions.append((atoms[0], atom))
+            for atoms in exclusionsFromBonds:
+                moleculeExclusions.append((atoms[0], atoms[1]))
+
+            # Record virtual sites
+
+            vsiteTerms = []
+            for fields in moleculeType.vsites2:
+                atoms = [int(x)-1 for x in fields[:3]]
+                c1 = float(fields[4])
+                vsiteTerms.append((atoms[0], mm.TwoParticleAverageSite, atoms[1:], ((1-c1), c1)))
+            for fields in moleculeType.vsites3:
+                atoms = [int(x)-1 for x in fields[:4]]
+                vsiteType = fields[4]
+                c1 = float(fields[5])
+                c2 = float(fields[6])
+                if vsiteType == '1':
+                    vsiteTerms.append((atoms[0], mm.ThreeParticleAverageSite, atoms[1:], (1-c1-c2, c1, c2)))
+                elif vsiteType == '4':
+                    c3 = float(fields[7])
+                    vsiteTerms.append((atoms[0], mm.OutOfPlaneSite, atoms[1:], (c1, c2, c3)))
+                else:
+                    raise ValueError('Internal error: vsites3 has unexpected type: '+vsiteType)
+
+            # Add explicitly specified constraints.
+
+            for fields in moleculeType.constraints:
+                atoms = [int(x)-1 for x in fields[:2]]
+                length = float(fields[3])
+                constraintTerms.append((atoms[0], atoms[1], length))
+
+            # Now create the specified number of molecules of this type.  The terms for all copies are added
+            # at once, except for Forces that only support adding terms one at a time.
+
+            offsets = np.arange(baseAtomIndex, baseAtomIndex+moleculeCount*numAtoms, numAtoms)
+            sys.addParticles(np.tile(masses, moleculeCount))
+            for force, (indices, params) in bulkTerms.items():
+                indices = _offsetIndices(indices, len(indices[0]), offsets)
+                if isinstance(force, mm.HarmonicBondForce):
+                    force.addBonds(indices, np.tile(params, (moleculeCount, 1)))
+                elif isinstance(force, mm.HarmonicAngleForce):
+                    force.addAngles(indices, np.tile(params, (moleculeCount, 1)))
+                else:
+                    periodicity = [p[0] for p in params]
+                    params = [p[1:] for p in params]
+                    force.addTorsions(indices, np.tile(periodicity, moleculeCount), np.tile(params, (moleculeCount, 1)))
+            nb.addParticles(np.tile(particleParams, (moleculeCount, 1)))
+            for base in offsets.tolist():
+                for function, atoms, args in forceTerms:
+                    function(*[base+i for i in atoms], *args)
+            if len(constraintTerms) > 0:
+                sys.addConstraints(_offsetIndices([c[:2] for c in constraintTerms], 2, offsets),
+                                   np.tile([c[2] for c in constraintTerms], moleculeCount))
+            if has_nbfix_terms:
+                ljnbfix.addParticles(np.zeros((moleculeCount*numAtoms, 1)))
+                nbfix14Indices.append(_offsetIndices(moleculeNbfix14Indices, 2, offsets))
+                nbfix14Params.append(np.tile(np.reshape(moleculeNbfix14Params, (-1, 3)), (moleculeCount, 1)))
+                nbfixExclusions.append(_offsetIndices(moleculeNbfixExclusions, 2, offsets))
+            elif lj is not None:
+                lj.addParticles(np.tile(ljParams, (moleculeCount, 1)))
+            bondIndices.append(_offsetIndices(moleculeBondIndices, 2, offsets))
+            pairIndices.append(_offsetIndices(moleculePairIndices, 2, offsets))
+            pairParams.append(np.tile(np.reshape(moleculePairParams, (-1, 3)), (moleculeCount, 1)))
+            exclusions.append(_offsetIndices(moleculeExclusions, 2, offsets))
+            for index, siteClass, atoms, args in vsiteTerms:
+                for particles in _offsetIndices([index]+atoms, 1+len(atoms), offsets).tolist():
+                    sys.setVirtualSite(particles[0], siteClass(*particles[1:], *args))
 
         # Create nonbonded exceptions.
 
         if not has_nbfix_terms:
-            nb.createExceptionsFromBonds(bondIndices, fudgeQQ, fudgeLJ)
+            nb.createExceptionsFromBonds([tuple(b) for b in np.concatenate(bondIndices).tolist()], fudgeQQ, fudgeLJ)
         else:
-            excluded_atom_pairs = set() # save these pairs so we don't zero them out
-            for tor in torsionIndices:
-                # First check to see if atoms 1 and 4 are already excluded because
-                # they are 1-2 or 1-3 pairs (would happen in 6-member rings or
-                # fewer). Then check that they're not already added as exclusions
-                if 'bond' in atom_partners[tor[3]] and tor[0] in atom_partners[tor[3]]['bond']: continue
-                if 'angle' in atom_partners[tor[3]] and tor[0] in atom_partners[tor[3]]['angle']: continue
-                key = min((tor[0], tor[3]),
-                          (tor[3], tor[0]))
-                if key in excluded_atom_pairs: continue # multiterm...
-
-                q1 = atom_charges[tor[0]]
-                q4 = atom_charges[tor[3]]
-                charge_prod = fudgeQQ*q1*q4
-
-                try:
-                    # use NBFix for 1-4 interactions if available to match GROMACS
-                    types = self._matchingNBFIX[tuple(sorted((atom_types[tor[0]],atom_types[tor[3]])))]
-                    params = (float(types[3]), float(types[4]))
-                    rmin14=params[0]
-                    epsilon=params[1]*fudgeLJ
-                except KeyError:
-                    params1 = self._atomTypes[atom_types[tor[0]]]
-                    params4 = self._atomTypes[atom_types[tor[3]]]
-                    rmin1 = float(params1[6])
-                    eps1 = float(params1[7])
-                    rmin4 = float(params4[6])
-                    eps4 = float(params4[7])
-                    epsilon = math.sqrt(abs(eps1 * eps4))*fudgeLJ
-                    if self._defaults[1] == '2':
-                        rmin14 = (rmin1 + rmin4) / 2
-                    else:
-                        rmin14 = math.sqrt(rmin1 * rmin4)
-
-                # Parameters are generated via standard combining rules.
-                # If different 1-4 parameters are given via pairtypes they will be overwritten below.
-                if self._defaults[1] == '3':
-                    nb.addException(tor[0], tor[3], charge_prod, 4*epsilon*rmin14**6, 4*epsilon*rmin14**12)
-                else:
-                    nb.addException(tor[0], tor[3], charge_prod, rmin14, epsilon)
-                excluded_atom_pairs.add(key)
-
-            # Add excluded atoms
-            for atom_idx, atom in atom_partners.items():
-                # Exclude all bonds and angles
-                for atom2 in atom['bond']:
-                    if atom2 > atom_idx:
-                        nb.addException(atom_idx, atom2, 0.0, 1.0, 0.0)
-                        excluded_atom_pairs.add((atom_idx, atom2))
-                for atom2 in atom['angle']:
-                    if ((atom_idx, atom2) in excluded_atom_pairs):
-                        continue
-                    if atom2 > atom_idx:
-                        nb.addException(atom_idx, atom2, 0.0, 1.0, 0.0)
-                        excluded_atom_pairs.add((atom_idx, atom2))
-                for atom2 in atom['dihedral']:
-                    if atom2 <= atom_idx: continue
-                    if ((atom_idx, atom2) in excluded_atom_pairs):
-                        continue
-                    nb.addException(atom_idx, atom2, 0.0, 1.0, 0.0)
+            nb.addExceptions(np.concatenate(nbfix14Indices), np.concatenate(nbfix14Params))
+            nbfixExclusions = np.concatenate(nbfixExclusions)
+            nb.addExceptions(nbfixExclusions, np.tile([0.0, 1.0, 0.0], (len(nbfixExclusions), 1)))
 
-        for exclusion in exclusions:
-            nb.addException(exclusion[0], exclusion[1], 0.0, 1.0, 0.0, True)
+        exclusions = np.concatenate(exclusions)
+        nb.addExceptions(exclusions, np.tile([0.0, 1.0, 0.0], (len(exclusions), 1)), True)
 
         # this will overwrite the pairs from the pairlist
         # if nbfix, this will only overwrite pairs if we have pairtype parameters 
-        for pair in pairs:
-            nb.addException(pair[0], pair[1], pair[2], pair[3], pair[4], True)
+        nb.addExceptions(np.concatenate(pairIndices), np.concatenate(pairParams), True)
 
         if self._defaults[1] in ('1', '3'):
            # We're using a CustomNonbondedForce for LJ interactions, so also create a CustomBondForce
@@ -1367,6 +1420,20 @@ class GromacsTopFile(object):
             sys.addForce(mm.CMMotionRemover())
         return sys
 
+def _appendBulkTerm(bulkTerms, force, atoms, params):
+    """Record a term to be added to a Force that supports adding many terms at once."""
+    if force not in bulkTerms:
+        bulkTerms[force] = ([], [])
+    bulkTerms[force][0].append(atoms)
+    bulkTerms[force][1].append(params)
+
+def _offsetIndices(indices, width, offsets):
+    """Given the atom indices of terms within one copy of a molecule, relative to its first atom, return an
+    array with the indices of the terms in every copy.  offsets contains the index of the first atom of each
+    copy.  The terms for the first copy come first, then those for the second copy, and so on."""
+    indices = np.array(indices, dtype=np.int64).reshape(-1, width)
+    return (indices[np.newaxis,:,:]+offsets[:,np.newaxis,np.newaxis]).reshape(-1, width)
+
 def _defaultGromacsIncludeDir():
     """Find the location where gromacs #include files are referenced from, by
     searching for (1) gromacs environment variables, (2) for the gromacs binary
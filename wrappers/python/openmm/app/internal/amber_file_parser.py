@@ -45,16 +45,13 @@ import re
 from math import ceil, cos, sin, asin, sqrt, pi
 import warnings
 
-try:
-    import numpy as np
-except:
-    np = None
+import numpy as np
 
 import openmm.unit as units
 import openmm
 from openmm.app import element as elem
 from openmm.app.internal.unitcell import computePeriodicBoxVectors
-from openmm.vec3 import Vec3
+from openmm.vec3 import arrayToVec3List
 from . import customgbforces as customgb
 
 #=============================================================================================
@@ -76,6 +73,9 @@ POINTER_LABELS  = """
 # Pointer labels (above) as a list, not string.
 POINTER_LABEL_LIST = POINTER_LABELS.replace(',', '').split()
 
+# The NumPy types used to store the contents of numeric sections, based on the %FORMAT item type.
+_SECTION_DTYPES = {'I': np.int64, 'E': np.float64, 'F': np.float64}
+
 VELSCALE = 20.455 # velocity conversion factor to angstroms/picosecond
 TINY = 1.0e-8
 
@@ -148,14 +148,11 @@ class PrmtopLoader(object):
                      and not self._raw_data['TITLE']:
                     self._raw_data['TITLE'] = line.rstrip()
                 else:
-                    flag=self._flags[-1]
-                    (format, numItems, itemType,
-                     iLength, itemPrecision) = self._getFormat(flag)
-                    line = line.rstrip()
-                    for index in range(0, len(line), iLength):
-                        item = line[index:index+iLength]
-                        if item:
-                            self._raw_data[flag].append(item.strip())
+                    self._raw_data[self._flags[-1]].append(line)
+        # Decode the lines of each section into values.
+        for flag, lines in self._raw_data.items():
+            if isinstance(lines, list) and flag in self._raw_format:
+                self._raw_data[flag] = self._decodeSection(flag, lines)
         # See if this is a CHAMBER-style topology file, which is not supported
         # for creating Systems
         self.chamber = 'CTITLE' in self._flags
@@ -165,6 +162,33 @@ class PrmtopLoader(object):
             flag=self._flags[-1]
         return self._raw_format[flag]
 
+    def _decodeSection(self, flag, lines):
+        """Decode the data lines of a section.  Numeric sections are converted directly
+        to a NumPy array, based on the field width given by the %FORMAT line.  Text
+        sections (and numeric ones that cannot be parsed) become a list of strings."""
+        (format, numItems, itemType,
+         iLength, itemPrecision) = self._getFormat(flag)
+        lines = [line.rstrip() for line in lines]
+        dtype = _SECTION_DTYPES.get(itemType.upper())
+        if dtype is not None:
+            # Pad every line to a whole number of fields, then split the fields with a fixed width string dtype.
+            data = ''.join([line.ljust(-(-len(line)//iLength)*iLength) for line in lines])
+            if not data:
+                return np.zeros(0, dtype)
+            try:
+                return np.frombuffer(data.encode('ascii'), 'S%d' % iLength).astype(dtype)
+            except ValueError:
+                pass
+        items = []
+        for line in lines:
+            for index in range(0, len(line), iLength):
+                items.append(line[index:index+iLength].strip())
+        return items
+
+    def _getArray(self, flag, dtype):
+        """Return the contents of a numeric section as a NumPy array."""
+        return np.asarray(self._raw_data[flag], dtype=dtype)
+
     def _getPointerValue(self, pointerLabel):
         """Return pointer value given pointer label
 
@@ -230,7 +254,7 @@ class PrmtopLoader(object):
         try:
             return self._massList
         except AttributeError:
-            self._massList = [float(x) for x in self._raw_data['MASS']]
+            self._massList = self._getArray('MASS', np.float64).tolist()
             return self._massList
 
     def getCharges(self):
@@ -238,7 +262,7 @@ class PrmtopLoader(object):
         try:
             return self._chargeList
         except AttributeError:
-            self._chargeList = [float(x)/18.2223 for x in self._raw_data['CHARGE']]
+            self._chargeList = (self._getArray('CHARGE', np.float64)/18.2223).tolist()
             return self._chargeList
 
     def getAtomName(self, iAtom):
@@ -251,10 +275,13 @@ class PrmtopLoader(object):
         return self._raw_data['ATOM_NAME']
 
     def _getAtomTypeIndexes(self):
+        return self._getAtomTypeIndexArray().tolist()
+
+    def _getAtomTypeIndexArray(self):
         try:
             return self._atomTypeIndexes
         except AttributeError:
-            self._atomTypeIndexes = [int(x) for x in self._raw_data['ATOM_TYPE_INDEX']]
+            self._atomTypeIndexes = self._getArray('ATOM_TYPE_INDEX', np.int64)
             return self._atomTypeIndexes
 
     def getAtomType(self, iAtom):
@@ -282,20 +309,18 @@ class PrmtopLoader(object):
             return self.getResidueLabel(iRes=self._getResiduePointer(iAtom))
 
     def _getResiduePointer(self, iAtom):
+        return self._getResiduePointers()[iAtom]
+
+    def _getResiduePointers(self):
+        """Return a list containing the index of the residue each atom belongs to"""
         try:
-            return self.residuePointerDict[iAtom]
-        except:
+            return self._residuePointers
+        except AttributeError:
             pass
-        self.residuePointerDict = {}
-        resPointers=self._raw_data['RESIDUE_POINTER']
-        firstAtom = [int(p)-1 for p in resPointers]
-        firstAtom.append(self.getNumAtoms())
-        res = 0
-        for i in range(self.getNumAtoms()):
-            while firstAtom[res+1] <= i:
-                res += 1
-            self.residuePointerDict[i] = res
-        return self.residuePointerDict[iAtom]
+        firstAtom = self._getArray('RESIDUE_POINTER', np.int64)-1
+        residues = np.searchsorted(firstAtom, np.arange(self.getNumAtoms()), side='right')-1
+        self._residuePointers = np.maximum(residues, 0).tolist()
+        return self._residuePointers
 
     def getNonbondTerms(self):
         """
@@ -303,6 +328,14 @@ class PrmtopLoader(object):
         elements of the Lennard-Jones A and B coefficient matrices are found,
         NbfixPresent exception is raised
         """
+        return list(map(tuple, self._getNonbondTermArray().tolist()))
+
+    def _getNonbondTermArray(self):
+        """
+        Return an array of shape (numAtoms, 2) containing rVdw and epsilon for each
+        atom. If off-diagonal elements of the Lennard-Jones A and B coefficient
+        matrices are found, NbfixPresent exception is raised
+        """
         if self._has_nbfix_terms:
             raise NbfixPresent('Off-diagonal Lennard-Jones elements found. '
                         'Cannot determine LJ parameters for individual atoms.')
@@ -311,42 +344,43 @@ class PrmtopLoader(object):
         except AttributeError:
             pass
         # Check if there are any non-zero HBOND terms
-        for x, y in zip(self._raw_data['HBOND_ACOEF'], self._raw_data['HBOND_BCOEF']):
-            if float(x) or float(y):
-                raise Exception('10-12 interactions are not supported')
-        self._nonbondTerms=[]
+        if np.any(self._getArray('HBOND_ACOEF', np.float64)) or np.any(self._getArray('HBOND_BCOEF', np.float64)):
+            raise Exception('10-12 interactions are not supported')
         lengthConversionFactor = units.angstrom.conversion_factor_to(units.nanometer)
         energyConversionFactor = units.kilocalorie_per_mole.conversion_factor_to(units.kilojoule_per_mole)
         numTypes = self.getNumTypes()
-        atomTypeIndexes=self._getAtomTypeIndexes()
+        atomTypes = self._getAtomTypeIndexArray()-1
+        nbidx = self._getArray('NONBONDED_PARM_INDEX', np.int64).tolist()
+        parm_acoef = self._getArray('LENNARD_JONES_ACOEF', np.float64).tolist()
+        parm_bcoef = self._getArray('LENNARD_JONES_BCOEF', np.float64).tolist()
+        # Compute the parameters once for each atom type that is used, then look them up for every atom.
         type_parameters = [(0, 0) for i in range(numTypes)]
-        for iAtom in range(self.getNumAtoms()):
-            index=(numTypes+1)*(atomTypeIndexes[iAtom]-1)
-            nbIndex=int(self._raw_data['NONBONDED_PARM_INDEX'][index])-1
+        typeTerms = np.zeros((numTypes, 2))
+        for iType in np.unique(atomTypes).tolist():
+            nbIndex=nbidx[(numTypes+1)*iType]-1
             if nbIndex<0:
                 raise Exception("10-12 interactions are not supported")
-            acoef = float(self._raw_data['LENNARD_JONES_ACOEF'][nbIndex])
-            bcoef = float(self._raw_data['LENNARD_JONES_BCOEF'][nbIndex])
+            acoef = parm_acoef[nbIndex]
+            bcoef = parm_bcoef[nbIndex]
             try:
                 rMin = (2*acoef/bcoef)**(1/6.0)
                 epsilon = 0.25*bcoef*bcoef/acoef
             except ZeroDivisionError:
                 rMin = 1.0
                 epsilon = 0.0
-            type_parameters[atomTypeIndexes[iAtom]-1] = (rMin/2.0, epsilon)
-            rVdw = rMin/2.0*lengthConversionFactor
-            epsilon = epsilon*energyConversionFactor
-            self._nonbondTerms.append( (rVdw, epsilon) )
+            type_parameters[iType] = (rMin/2.0, epsilon)
+            typeTerms[iType] = (rMin/2.0*lengthConversionFactor, epsilon*energyConversionFactor)
+        nonbondTerms = typeTerms[atomTypes]
         # Check if we have any off-diagonal modified LJ terms that would require
         # an NBFIX-like solution
         for i in range(numTypes):
             for j in range(numTypes):
-                index = int(self._raw_data['NONBONDED_PARM_INDEX'][numTypes*i+j]) - 1
+                index = nbidx[numTypes*i+j] - 1
                 if index < 0: continue
                 rij = type_parameters[i][0] + type_parameters[j][0]
                 wdij = sqrt(type_parameters[i][1] * type_parameters[j][1])
-                a = float(self._raw_data['LENNARD_JONES_ACOEF'][index])
-                b = float(self._raw_data['LENNARD_JONES_BCOEF'][index])
+                a = parm_acoef[index]
+                b = parm_bcoef[index]
                 if a == 0 or b == 0:
                     if a != 0 or b != 0 or (wdij != 0 and rij != 0):
                         self._has_nbfix_terms = True
@@ -359,26 +393,26 @@ class PrmtopLoader(object):
                     raise NbfixPresent('Off-diagonal Lennard-Jones elements '
                                        'found. Cannot determine LJ parameters '
                                        'for individual atoms.')
+        self._nonbondTerms = nonbondTerms
         return self._nonbondTerms
 
-    def _getBonds(self, bondPointers):
-        forceConstant=self._raw_data["BOND_FORCE_CONSTANT"]
-        bondEquil=self._raw_data["BOND_EQUIL_VALUE"]
-        returnList=[]
+    def _getBondArrays(self, flag):
+        """Return arrays containing the atom pairs, K, and Rmin for the bonds in a section"""
+        bondPointers = self._getArray(flag, np.int64).reshape(-1, 3)
+        negative = np.flatnonzero(np.any(bondPointers[:,:2] < 0, axis=1))
+        if len(negative) > 0:
+            raise Exception("Found negative bonded atom pointers %s"
+                            % (tuple(bondPointers[negative[0],:2].tolist()),))
         forceConstConversionFactor = (units.kilocalorie_per_mole/(units.angstrom*units.angstrom)).conversion_factor_to(units.kilojoule_per_mole/(units.nanometer*units.nanometer))
         lengthConversionFactor = units.angstrom.conversion_factor_to(units.nanometer)
-        for ii in range(0,len(bondPointers),3):
-             if int(bondPointers[ii])<0 or \
-                int(bondPointers[ii+1])<0:
-                 raise Exception("Found negative bonded atom pointers %s"
-                                 % ((bondPointers[ii],
-                                     bondPointers[ii+1]),))
-             iType=int(bondPointers[ii+2])-1
-             returnList.append((int(bondPointers[ii])//3,
-                                int(bondPointers[ii+1])//3,
-                                float(forceConstant[iType])*forceConstConversionFactor,
-                                float(bondEquil[iType])*lengthConversionFactor))
-        return returnList
+        iType = bondPointers[:,2]-1
+        forceConstant = self._getArray("BOND_FORCE_CONSTANT", np.float64)[iType]*forceConstConversionFactor
+        bondEquil = self._getArray("BOND_EQUIL_VALUE", np.float64)[iType]*lengthConversionFactor
+        return (bondPointers[:,:2]//3, forceConstant, bondEquil)
+
+    def _getBonds(self, flag):
+        atoms, forceConstant, bondEquil = self._getBondArrays(flag)
+        return list(zip(atoms[:,0].tolist(), atoms[:,1].tolist(), forceConstant.tolist(), bondEquil.tolist()))
 
     def getBondsWithH(self):
         """Return list of bonded atom pairs, K, and Rmin for each bond with a hydrogen"""
@@ -386,8 +420,7 @@ class PrmtopLoader(object):
             return self._bondListWithH
         except AttributeError:
             pass
-        bondPointers=self._raw_data["BONDS_INC_HYDROGEN"]
-        self._bondListWithH = self._getBonds(bondPointers)
+        self._bondListWithH = self._getBonds("BONDS_INC_HYDROGEN")
         return self._bondListWithH
 
 
@@ -397,36 +430,32 @@ class PrmtopLoader(object):
             return self._bondListNoH
         except AttributeError:
             pass
-        bondPointers=self._raw_data["BONDS_WITHOUT_HYDROGEN"]
-        self._bondListNoH = self._getBonds(bondPointers)
+        self._bondListNoH = self._getBonds("BONDS_WITHOUT_HYDROGEN")
         return self._bondListNoH
 
+    def _getAngleArrays(self):
+        """Return arrays containing the atom triplets, K, and ThetaMin for all bond angles"""
+        anglePointers = np.concatenate([self._getArray("ANGLES_INC_HYDROGEN", np.int64),
+                                        self._getArray("ANGLES_WITHOUT_HYDROGEN", np.int64)]).reshape(-1, 4)
+        negative = np.flatnonzero(np.any(anglePointers[:,:3] < 0, axis=1))
+        if len(negative) > 0:
+            raise Exception("Found negative angle atom pointers %s"
+                            % (tuple(anglePointers[negative[0],:3].tolist()),))
+        forceConstConversionFactor = (units.kilocalorie_per_mole/(units.radian*units.radian)).conversion_factor_to(units.kilojoule_per_mole/(units.radian*units.radian))
+        iType = anglePointers[:,3]-1
+        forceConstant = self._getArray("ANGLE_FORCE_CONSTANT", np.float64)[iType]*forceConstConversionFactor
+        angleEquil = self._getArray("ANGLE_EQUIL_VALUE", np.float64)[iType]
+        return (anglePointers[:,:3]//3, forceConstant, angleEquil)
+
     def getAngles(self):
         """Return list of atom triplets, K, and ThetaMin for each bond angle"""
         try:
             return self._angleList
         except AttributeError:
             pass
-        forceConstant=self._raw_data["ANGLE_FORCE_CONSTANT"]
-        angleEquil=self._raw_data["ANGLE_EQUIL_VALUE"]
-        anglePointers = self._raw_data["ANGLES_INC_HYDROGEN"] \
-                       +self._raw_data["ANGLES_WITHOUT_HYDROGEN"]
-        self._angleList=[]
-        forceConstConversionFactor = (units.kilocalorie_per_mole/(units.radian*units.radian)).conversion_factor_to(units.kilojoule_per_mole/(units.radian*units.radian))
-        for ii in range(0,len(anglePointers),4):
-             if int(anglePointers[ii])<0 or \
-                int(anglePointers[ii+1])<0 or \
-                int(anglePointers[ii+2])<0:
-                 raise Exception("Found negative angle atom pointers %s"
-                                 % ((anglePointers[ii],
-                                     anglePointers[ii+1],
-                                     anglePointers[ii+2]),))
-             iType=int(anglePointers[ii+3])-1
-             self._angleList.append((int(anglePointers[ii])//3,
-                                int(anglePointers[ii+1])//3,
-                                int(anglePointers[ii+2])//3,
-                                float(forceConstant[iType])*forceConstConversionFactor,
-                                float(angleEquil[iType])))
+        atoms, forceConstant, angleEquil = self._getAngleArrays()
+        self._angleList = list(zip(atoms[:,0].tolist(), atoms[:,1].tolist(), atoms[:,2].tolist(),
+                                   forceConstant.tolist(), angleEquil.tolist()))
         return self._angleList
 
     def getUreyBradleys(self):
@@ -453,34 +482,34 @@ class PrmtopLoader(object):
                                     float(equilValue[iType])*lengthConversionFactor))
         return self._ureyBradleyList
 
+    def _getDihedralPointers(self):
+        """Return an array containing the raw atom pointers and type of each dihedral"""
+        return np.concatenate([self._getArray("DIHEDRALS_INC_HYDROGEN", np.int64),
+                               self._getArray("DIHEDRALS_WITHOUT_HYDROGEN", np.int64)]).reshape(-1, 5)
+
+    def _getDihedralArrays(self):
+        """Return arrays containing the atom quads, K, phase and periodicity for all dihedral angles"""
+        dihedralPointers = self._getDihedralPointers()
+        negative = np.flatnonzero(np.any(dihedralPointers[:,:2] < 0, axis=1))
+        if len(negative) > 0:
+            raise Exception("Found negative dihedral atom pointers %s"
+                            % (tuple(dihedralPointers[negative[0],:4].tolist()),))
+        forceConstConversionFactor = (units.kilocalorie_per_mole).conversion_factor_to(units.kilojoule_per_mole)
+        iType = dihedralPointers[:,4]-1
+        forceConstant = self._getArray("DIHEDRAL_FORCE_CONSTANT", np.float64)[iType]*forceConstConversionFactor
+        phase = self._getArray("DIHEDRAL_PHASE", np.float64)[iType]
+        periodicity = (0.5+self._getArray("DIHEDRAL_PERIODICITY", np.float64)[iType]).astype(np.int64)
+        return (np.abs(dihedralPointers[:,:4])//3, forceConstant, phase, periodicity)
+
     def getDihedrals(self):
         """Return list of atom quads, K, phase and periodicity for each dihedral angle"""
         try:
             return self._dihedralList
         except AttributeError:
             pass
-        forceConstant=self._raw_data["DIHEDRAL_FORCE_CONSTANT"]
-        phase=self._raw_data["DIHEDRAL_PHASE"]
-        periodicity=self._raw_data["DIHEDRAL_PERIODICITY"]
-        dihedralPointers = self._raw_data["DIHEDRALS_INC_HYDROGEN"] \
-                          +self._raw_data["DIHEDRALS_WITHOUT_HYDROGEN"]
-        self._dihedralList=[]
-        forceConstConversionFactor = (units.kilocalorie_per_mole).conversion_factor_to(units.kilojoule_per_mole)
-        for ii in range(0,len(dihedralPointers),5):
-             if int(dihedralPointers[ii])<0 or int(dihedralPointers[ii+1])<0:
-                 raise Exception("Found negative dihedral atom pointers %s"
-                                 % ((dihedralPointers[ii],
-                                    dihedralPointers[ii+1],
-                                    dihedralPointers[ii+2],
-                                    dihedralPointers[ii+3]),))
-             iType=int(dihedralPointers[ii+4])-1
-             self._dihedralList.append((int(dihedralPointers[ii])//3,
-                                int(dihedralPointers[ii+1])//3,
-                                abs(int(dihedralPointers[ii+2]))//3,
-                                abs(int(dihedralPointers[ii+3]))//3,
-                                float(forceConstant[iType])*forceConstConversionFactor,
-                                float(phase[iType]),
-                                int(0.5+float(periodicity[iType]))))
+        atoms, forceConstant, phase, periodicity = self._getDihedralArrays()
+        self._dihedralList = list(zip(atoms[:,0].tolist(), atoms[:,1].tolist(), atoms[:,2].tolist(), atoms[:,3].tolist(),
+                                      forceConstant.tolist(), phase.tolist(), periodicity.tolist()))
         return self._dihedralList
 
     def getImpropers(self):
@@ -578,52 +607,67 @@ class PrmtopLoader(object):
                                int(cmapPointers[ii+4])-1))
         return self._cmapList
 
-    def get14Interactions(self):
-        """Return list of atom pairs, chargeProduct, rMin and epsilon for each 1-4 interaction"""
-        dihedralPointers = self._raw_data["DIHEDRALS_INC_HYDROGEN"] \
-                          +self._raw_data["DIHEDRALS_WITHOUT_HYDROGEN"]
-        returnList=[]
-        charges=self.getCharges()
+    def _get14Arrays(self):
+        """Return arrays containing the atom pairs, chargeProduct, rMin, epsilon, and scale factors for all 1-4 interactions"""
+        dihedralPointers = self._getDihedralPointers()
+        dihedralPointers = dihedralPointers[(dihedralPointers[:,2] > 0) & (dihedralPointers[:,3] > 0)]
+        charges = np.array(self.getCharges())
         length_conv = units.angstrom.conversion_factor_to(units.nanometers)
         ene_conv = units.kilocalories_per_mole.conversion_factor_to(
                             units.kilojoules_per_mole)
         if self.chamber:
-            parm_acoef = [float(x) for x in self._raw_data['LENNARD_JONES_14_ACOEF']]
-            parm_bcoef = [float(x) for x in self._raw_data['LENNARD_JONES_14_BCOEF']]
+            parm_acoef = self._getArray('LENNARD_JONES_14_ACOEF', np.float64).tolist()
+            parm_bcoef = self._getArray('LENNARD_JONES_14_BCOEF', np.float64).tolist()
         else:
-            parm_acoef = [float(x) for x in self._raw_data['LENNARD_JONES_ACOEF']]
-            parm_bcoef = [float(x) for x in self._raw_data['LENNARD_JONES_BCOEF']]
-        nbidx = [int(x) for x in self._raw_data['NONBONDED_PARM_INDEX']]
+            parm_acoef = self._getArray('LENNARD_JONES_ACOEF', np.float64).tolist()
+            parm_bcoef = self._getArray('LENNARD_JONES_BCOEF', np.float64).tolist()
+        # Compute rMin and epsilon once for each pair of types, then look them up for every interaction.
+        parm_rMin = []
+        parm_epsilon = []
+        for a, b in zip(parm_acoef, parm_bcoef):
+            try:
+                epsilon = b * b / (4 * a) * ene_conv
+                rMin = (2 * a / b) ** (1/6.0) * length_conv
+            except ZeroDivisionError:
+                rMin = 1.0
+                epsilon = 0.0
+            parm_rMin.append(rMin)
+            parm_epsilon.append(epsilon)
+        nbidx = self._getArray('NONBONDED_PARM_INDEX', np.int64)
         numTypes = self.getNumTypes()
-        atomTypeIndexes=self._getAtomTypeIndexes()
-        for ii in range(0, len(dihedralPointers), 5):
-            if int(dihedralPointers[ii+2])>0 and int(dihedralPointers[ii+3])>0:
-                iAtom = int(dihedralPointers[ii])//3
-                lAtom = int(dihedralPointers[ii+3])//3
-                iidx = int(dihedralPointers[ii+4]) - 1
-                chargeProd = charges[iAtom]*charges[lAtom]
-                typ1 = atomTypeIndexes[iAtom] - 1
-                typ2 = atomTypeIndexes[lAtom] - 1
-                idx = nbidx[numTypes*typ1+typ2] - 1
-                if idx < 0: continue
-                a = parm_acoef[idx]
-                b = parm_bcoef[idx]
-                try:
-                    epsilon = b * b / (4 * a) * ene_conv
-                    rMin = (2 * a / b) ** (1/6.0) * length_conv
-                except ZeroDivisionError:
-                    rMin = 1
-                    epsilon = 0
-                try:
-                    iScee = float(self._raw_data['SCEE_SCALE_FACTOR'][iidx])
-                except KeyError:
-                    iScee = 1.0 if self.chamber else 1.2
-                try:
-                    iScnb = float(self._raw_data['SCNB_SCALE_FACTOR'][iidx])
-                except KeyError:
-                    iScnb = 1.0 if self.chamber else 2.0
-                returnList.append((iAtom, lAtom, chargeProd, rMin, epsilon, iScee, iScnb))
-        return returnList
+        atomTypeIndexes = self._getAtomTypeIndexArray()
+        iAtom = dihedralPointers[:,0]//3
+        lAtom = dihedralPointers[:,3]//3
+        idx = nbidx[numTypes*(atomTypeIndexes[iAtom]-1) + atomTypeIndexes[lAtom]-1] - 1
+        keep = (idx >= 0)
+        iAtom, lAtom, idx = iAtom[keep], lAtom[keep], idx[keep]
+        iidx = dihedralPointers[keep,4] - 1
+        if 'SCEE_SCALE_FACTOR' in self._raw_data:
+            scee = self._getArray('SCEE_SCALE_FACTOR', np.float64)[iidx]
+        else:
+            scee = np.full(len(iidx), 1.0 if self.chamber else 1.2)
+        if 'SCNB_SCALE_FACTOR' in self._raw_data:
+            scnb = self._getArray('SCNB_SCALE_FACTOR', np.float64)[iidx]
+        else:
+            scnb = np.full(len(iidx), 1.0 if self.chamber else 2.0)
+        return (np.column_stack((iAtom, lAtom)), charges[iAtom]*charges[lAtom], np.array(parm_rMin)[idx],
+                np.array(parm_epsilon)[idx], scee, scnb)
+
+    def get14Interactions(self):
+        """Return list of atom pairs, chargeProduct, rMin and epsilon for each 1-4 interaction"""
+        atoms, chargeProd, rMin, epsilon, scee, scnb = self._get14Arrays()
+        return list(zip(atoms[:,0].tolist(), atoms[:,1].tolist(), chargeProd.tolist(), rMin.tolist(),
+                        epsilon.tolist(), scee.tolist(), scnb.tolist()))
+
+    def _getExcludedPairs(self):
+        """Return an array of shape (numPairs, 2) listing all pairs of atoms that should have no non-bond interactions"""
+        numAtoms = self.getNumAtoms()
+        numExcludedAtoms = self._getArray("NUMBER_EXCLUDED_ATOMS", np.int64)[:numAtoms]
+        excludedAtoms = self._getArray("EXCLUDED_ATOMS_LIST", np.int64)
+        atoms = np.repeat(np.arange(numAtoms), numExcludedAtoms)[:len(excludedAtoms)]
+        excludedAtoms = excludedAtoms[:len(atoms)]
+        keep = (excludedAtoms > 0)
+        return np.column_stack((atoms[keep], excludedAtoms[keep]-1))
 
     def getExcludedAtoms(self):
         """Return list of lists, giving all pairs of atoms that should have no non-bond interactions"""
@@ -631,21 +675,9 @@ class PrmtopLoader(object):
             return self._excludedAtoms
         except AttributeError:
             pass
-        self._excludedAtoms=[]
-        numExcludedAtomsList=self._raw_data["NUMBER_EXCLUDED_ATOMS"]
-        excludedAtomsList=self._raw_data["EXCLUDED_ATOMS_LIST"]
-        total=0
-        for iAtom in range(self.getNumAtoms()):
-            index0=total
-            n=int(numExcludedAtomsList[iAtom])
-            total+=n
-            index1=total
-            atomList=[]
-            for jAtom in excludedAtomsList[index0:index1]:
-                j=int(jAtom)
-                if j>0:
-                    atomList.append(j-1)
-            self._excludedAtoms.append(atomList)
+        pairs = self._getExcludedPairs()
+        splits = np.cumsum(np.bincount(pairs[:,0], minlength=self.getNumAtoms()))[:-1]
+        self._excludedAtoms = [atoms.tolist() for atoms in np.split(pairs[:,1], splits)]
         return self._excludedAtoms
 
     def getBoxBetaAndDimensions(self):
@@ -751,7 +783,7 @@ def readAmberSystem(topology, prmtop_filename=None, prmtop_loader=None, shake=No
 
     has_1264 = 'LENNARD_JONES_CCOEF' in prmtop._raw_data.keys()
     if has_1264:
-        parm_ccoef = [float(x) for x in prmtop._raw_data['LENNARD_JONES_CCOEF']]
+        parm_ccoef = prmtop._getArray('LENNARD_JONES_CCOEF', np.float64).tolist()
 
     # Use pyopenmm implementation of OpenMM by default.
     if mm is None:
@@ -767,31 +799,35 @@ def readAmberSystem(topology, prmtop_filename=None, prmtop_loader=None, shake=No
         system.addParticle(mass)
 
     # Add constraints.
-    isWater = [prmtop.getResidueLabel(i) in ('WAT', 'HOH', 'TP4', 'TP5', 'T4E') for i in range(prmtop.getNumAtoms())]
-    isEP = [a.element is None for a in topology.atoms()]
+    isWaterResidue = np.array([label in ('WAT', 'HOH', 'TP4', 'TP5', 'T4E') for label in prmtop._raw_data['RESIDUE_LABEL']])
+    isWater = isWaterResidue[prmtop._getResiduePointers()]
+    isEP = np.array([a.element is None for a in topology.atoms()], dtype=bool)
+    bondAtomsWithH, bondKWithH, bondRMinWithH = prmtop._getBondArrays("BONDS_INC_HYDROGEN")
+    bondAtomsNoH, bondKNoH, bondRMinNoH = prmtop._getBondArrays("BONDS_WITHOUT_HYDROGEN")
+    hasEPWithH = isEP[bondAtomsWithH[:,0]] | isEP[bondAtomsWithH[:,1]]
+    isWaterWithH = isWater[bondAtomsWithH[:,0]] & isWater[bondAtomsWithH[:,1]]
+    constrained = []
     if shake in ('h-bonds', 'all-bonds', 'h-angles'):
-        for (iAtom, jAtom, k, rMin) in prmtop.getBondsWithH():
-            if not (isEP[iAtom] or isEP[jAtom]):
-                system.addConstraint(iAtom, jAtom, rMin)
+        constrained.append((bondAtomsWithH, bondRMinWithH, ~hasEPWithH))
     if shake in ('all-bonds', 'h-angles'):
-        for (iAtom, jAtom, k, rMin) in prmtop.getBondsNoH():
-            if not (isEP[iAtom] or isEP[jAtom]):
-                system.addConstraint(iAtom, jAtom, rMin)
+        constrained.append((bondAtomsNoH, bondRMinNoH, ~(isEP[bondAtomsNoH[:,0]] | isEP[bondAtomsNoH[:,1]])))
     if rigidWater and shake is None:
-        for (iAtom, jAtom, k, rMin) in prmtop.getBondsWithH():
-            if isWater[iAtom] and isWater[jAtom] and not (isEP[iAtom] or isEP[jAtom]):
-                system.addConstraint(iAtom, jAtom, rMin)
+        constrained.append((bondAtomsWithH, bondRMinWithH, isWaterWithH & ~hasEPWithH))
+    for (atoms, rMin, select) in constrained:
+        for (iAtom, jAtom, length) in zip(atoms[select,0].tolist(), atoms[select,1].tolist(), rMin[select].tolist()):
+            system.addConstraint(iAtom, jAtom, length)
 
     # Add harmonic bonds.
     if verbose: print("Adding bonds...")
     force = mm.HarmonicBondForce()
     if flexibleConstraints or (shake not in ('h-bonds', 'all-bonds', 'h-angles')):
-        for (iAtom, jAtom, k, rMin) in prmtop.getBondsWithH():
-            if flexibleConstraints or not (rigidWater and isWater[iAtom] and isWater[jAtom]):
-                force.addBond(iAtom, jAtom, rMin, 2*k)
+        if flexibleConstraints or not rigidWater:
+            select = np.ones(len(bondAtomsWithH), dtype=bool)
+        else:
+            select = ~isWaterWithH
+        force.addBonds(bondAtomsWithH[select], np.column_stack((bondRMinWithH[select], 2*bondKWithH[select])))
     if flexibleConstraints or (shake not in ('all-bonds', 'h-angles')):
-        for (iAtom, jAtom, k, rMin) in prmtop.getBondsNoH():
-            force.addBond(iAtom, jAtom, rMin, 2*k)
+        force.addBonds(bondAtomsNoH, np.column_stack((bondRMinNoH, 2*bondKNoH)))
     system.addForce(force)
 
     # Add Urey-Bradley terms.
@@ -814,38 +850,39 @@ def readAmberSystem(topology, prmtop_filename=None, prmtop_loader=None, shake=No
             distance = c[2].value_in_unit(units.nanometer)
             atomConstraints[c[0]].append((c[1], distance))
             atomConstraints[c[1]].append((c[0], distance))
-    topatoms = list(topology.atoms())
-    for (iAtom, jAtom, kAtom, k, aMin) in prmtop.getAngles():
-        if shake == 'h-angles':
+    angleAtoms, angleK, angleMin = prmtop._getAngleArrays()
+    select = np.ones(len(angleAtoms), dtype=bool)
+    if shake == 'h-angles':
+        topatoms = list(topology.atoms())
+        for index, (iAtom, jAtom, kAtom) in enumerate(angleAtoms.tolist()):
             atomI = topatoms[iAtom]
             atomJ = topatoms[jAtom]
             atomK = topatoms[kAtom]
             numH = ((atomI.element.atomic_number == 1) + (atomK.element.atomic_number == 1))
             constrained = (numH == 2 or (numH == 1 and atomJ.element is elem.oxygen))
-        else:
-            constrained = False
-        if constrained:
-            # Find the two bonds that make this angle.
-            l1 = None
-            l2 = None
-            for bond in atomConstraints[jAtom]:
-                if bond[0] == iAtom:
-                    l1 = bond[1]
-                elif bond[0] == kAtom:
-                    l2 = bond[1]
-
-            # Compute the distance between atoms and add a constraint
-            length = sqrt(l1*l1 + l2*l2 - 2*l1*l2*cos(aMin))
-            system.addConstraint(iAtom, kAtom, length)
-        if flexibleConstraints or not constrained:
-            force.addAngle(iAtom, jAtom, kAtom, aMin, 2*k)
+            if constrained:
+                # Find the two bonds that make this angle.
+                l1 = None
+                l2 = None
+                for bond in atomConstraints[jAtom]:
+                    if bond[0] == iAtom:
+                        l1 = bond[1]
+                    elif bond[0] == kAtom:
+                        l2 = bond[1]
+
+                # Compute the distance between atoms and add a constraint
+                aMin = float(angleMin[index])
+                length = sqrt(l1*l1 + l2*l2 - 2*l1*l2*cos(aMin))
+                system.addConstraint(iAtom, kAtom, length)
+                select[index] = flexibleConstraints
+    force.addAngles(angleAtoms[select], np.column_stack((angleMin[select], 2*angleK[select])))
     system.addForce(force)
 
     # Add torsions.
     if verbose: print("Adding torsions...")
     force = mm.PeriodicTorsionForce()
-    for (iAtom, jAtom, kAtom, lAtom, forceConstant, phase, periodicity) in prmtop.getDihedrals():
-        force.addTorsion(iAtom, jAtom, kAtom, lAtom, periodicity, phase, forceConstant)
+    torsionAtoms, torsionK, torsionPhase, torsionPeriodicity = prmtop._getDihedralArrays()
+    force.addTorsions(torsionAtoms, torsionPeriodicity, np.column_stack((torsionPhase, torsionK)))
     system.addForce(force)
 
     # Add impropers.
@@ -943,15 +980,15 @@ def readAmberSystem(topology, prmtop_filename=None, prmtop_loader=None, shake=No
     sigmaScale = 2**(-1./6.) * 2.0
     nbfix = False
     try:
-        nonbondTerms = prmtop.getNonbondTerms()
+        nonbondTerms = prmtop._getNonbondTermArray()
     except NbfixPresent:
         nbfix = True
-        for charge in prmtop.getCharges():
-            force.addParticle(charge, 1.0, 0.0)
+        charges = np.array(prmtop.getCharges())
+        force.addParticles(np.column_stack((charges, np.ones(len(charges)), np.zeros(len(charges)))))
         numTypes = prmtop.getNumTypes()
-        parm_acoef = [float(x) for x in prmtop._raw_data['LENNARD_JONES_ACOEF']]
-        parm_bcoef = [float(x) for x in prmtop._raw_data['LENNARD_JONES_BCOEF']]
-        nbidx = [int(x) for x in prmtop._raw_data['NONBONDED_PARM_INDEX']]
+        parm_acoef = prmtop._getArray('LENNARD_JONES_ACOEF', np.float64).tolist()
+        parm_bcoef = prmtop._getArray('LENNARD_JONES_BCOEF', np.float64).tolist()
+        nbidx = prmtop._getArray('NONBONDED_PARM_INDEX', np.int64).tolist()
         acoef = [0 for i in range(numTypes*numTypes)]
         bcoef = acoef[:] # copy
         ene_conv = units.kilocalories_per_mole.conversion_factor_to(units.kilojoules_per_mole)
@@ -988,15 +1025,13 @@ def readAmberSystem(topology, prmtop_filename=None, prmtop_loader=None, shake=No
             cforce.addTabulatedFunction('ccoef',
                         mm.Discrete2DFunction(numTypes, numTypes, ccoef))
         cforce.addPerParticleParameter('type')
-        for atom in prmtop._getAtomTypeIndexes():
-            cforce.addParticle((atom-1,))
+        for atomType in (prmtop._getAtomTypeIndexArray()-1).tolist():
+            cforce.addParticle((atomType,))
     else:
-        for (charge, (rVdw, epsilon)) in zip(prmtop.getCharges(), nonbondTerms):
-            sigma = rVdw * sigmaScale
-            force.addParticle(charge, sigma, epsilon)
+        force.addParticles(np.column_stack((prmtop.getCharges(), nonbondTerms[:,0]*sigmaScale, nonbondTerms[:,1])))
         if has_1264:
             numTypes = prmtop.getNumTypes()
-            nbidx = [int(x) for x in prmtop._raw_data['NONBONDED_PARM_INDEX']]
+            nbidx = prmtop._getArray('NONBONDED_PARM_INDEX', np.int64).tolist()
             ccoef = [0 for i in range(numTypes*numTypes)]
             ene_conv = units.kilocalories_per_mole.conversion_factor_to(units.kilojoules_per_mole)
             length_conv = units.angstroms.conversion_factor_to(units.nanometers)
@@ -1010,39 +1045,36 @@ def readAmberSystem(topology, prmtop_filename=None, prmtop_loader=None, shake=No
             cforce.addTabulatedFunction('ccoef',
                         mm.Discrete2DFunction(numTypes, numTypes, ccoef))
             cforce.addPerParticleParameter('type')
-            for atom in prmtop._getAtomTypeIndexes():
-                cforce.addParticle((atom-1,))
+            for atomType in (prmtop._getAtomTypeIndexArray()-1).tolist():
+                cforce.addParticle((atomType,))
 
 
     # Add 1-4 Interactions
-    excludedAtomPairs = set()
     sigmaScale = 2**(-1./6.)
-    _scee, _scnb = scee, scnb
-    for (iAtom, lAtom, chargeProd, rMin, epsilon, iScee, iScnb) in prmtop.get14Interactions():
-        if scee is None: _scee = iScee
-        if scnb is None: _scnb = iScnb
-        chargeProd /= _scee
-        epsilon /= _scnb
-        sigma = rMin * sigmaScale
-        force.addException(iAtom, lAtom, chargeProd, sigma, epsilon)
-        excludedAtomPairs.add(min((iAtom, lAtom), (lAtom, iAtom)))
-
-    # Add Excluded Atoms
-    excludedAtoms=prmtop.getExcludedAtoms()
+    atoms14, chargeProd, rMin, epsilon, iScee, iScnb = prmtop._get14Arrays()
+    chargeProd = chargeProd / (iScee if scee is None else scee)
+    epsilon = epsilon / (iScnb if scnb is None else scnb)
+    sigma = rMin * sigmaScale
+    for (iAtom, lAtom, q, sig, eps) in zip(atoms14[:,0].tolist(), atoms14[:,1].tolist(), chargeProd.tolist(), sigma.tolist(), epsilon.tolist()):
+        force.addException(iAtom, lAtom, q, sig, eps)
+
+    # Add Excluded Atoms, skipping the pairs that already have a 1-4 interaction.
+    numAtoms = prmtop.getNumAtoms()
+    sortedPairs = np.sort(atoms14, axis=1)
+    keys14 = sortedPairs[:,0]*numAtoms + sortedPairs[:,1]
+    excludedPairs = prmtop._getExcludedPairs()
+    sortedPairs = np.sort(excludedPairs, axis=1)
+    excludedPairs = excludedPairs[~np.isin(sortedPairs[:,0]*numAtoms + sortedPairs[:,1], keys14)]
     excludeParams = (0.0, 0.1, 0.0)
-    for iAtom in range(prmtop.getNumAtoms()):
-        for jAtom in excludedAtoms[iAtom]:
-            if min((iAtom, jAtom), (jAtom, iAtom)) in excludedAtomPairs: continue
-            force.addException(iAtom, jAtom, excludeParams[0], excludeParams[1], excludeParams[2])
+    for (iAtom, jAtom) in excludedPairs.tolist():
+        force.addException(iAtom, jAtom, excludeParams[0], excludeParams[1], excludeParams[2])
 
     # Copy the exceptions as exclusions to the CustomNonbondedForce if we have
     # NBFIX terms
     if nbfix and nonbondedMethod == 'LJPME':
         raise ValueError('LJPME is not supported with modified off-diagonal Lennard-Jones coefficients')
     if nbfix or has_1264:
-        for i in range(force.getNumExceptions()):
-            ii, jj, chg, sig, eps = force.getExceptionParameters(i)
-            cforce.addExclusion(ii, jj)
+        cforce.addExclusions(np.concatenate((atoms14, excludedPairs)))
         # Now set the various properties based on the NonbondedForce object
         if nonbondedMethod in ('PME', 'LJPME', 'Ewald', 'CutoffPeriodic'):
             cforce.setNonbondedMethod(cforce.CutoffPeriodic)
@@ -1061,7 +1093,7 @@ def readAmberSystem(topology, prmtop_filename=None, prmtop_loader=None, shake=No
 
     # Add virtual sites for water.
     epNames = ['EP', 'LP']
-    ep = [i for i in range(prmtop.getNumAtoms()) if isWater[i] and prmtop.getAtomName(i)[:2] in epNames]
+    ep = [i for i in np.flatnonzero(isWater).tolist() if prmtop.getAtomName(i)[:2] in epNames]
     if len(ep) > 0:
         epRes = set((prmtop.getResidueNumber(i) for i in ep))
         numRes = max(epRes)+1
@@ -1159,10 +1191,10 @@ def readAmberSystem(topology, prmtop_filename=None, prmtop_loader=None, shake=No
         # prmtop contents for HCT, OBC1, and OBC2. GBn and GBn2 both override
         # the prmtop screen factors from LEaP in sander and pmemd
         if gbmodel in ('HCT', 'OBC1', 'OBC2'):
-            screen = [float(s) for s in prmtop._raw_data['SCREEN']]
+            screen = prmtop._getArray('SCREEN', np.float64).tolist()
         else:
             screen = [gb_parm[1] for gb_parm in gb_parms]
-        radii = [float(r)/10 for r in prmtop._raw_data['RADII']]
+        radii = (prmtop._getArray('RADII', np.float64)/10).tolist()
         warned = False
         for i, (r, s) in enumerate(zip(radii, screen)):
             if abs(r - gb_parms[i][0]) > 1e-4 or abs(s - gb_parms[i][1]) > 1e-4:
@@ -1246,7 +1278,6 @@ class AmberAsciiRestart(object):
         `ValueError' if not all fields are numbers (for example, if a field is
                      filled with ****'s)
         `IndexError' if the file is empty
-        `ImportError' if numpy is requested but could not be imported
     Example
     -------
     >>> f = AmberAsciiRestart('alanine-dipeptide.inpcrd')
@@ -1254,9 +1285,6 @@ class AmberAsciiRestart(object):
     """
 
     def __init__(self, filename, asNumpy=False):
-        # Make sure numpy is available if requested
-        if asNumpy and np is None:
-            raise ImportError('asNumpy=True: numpy is not available')
         self._asNumpy = asNumpy
         self.filename = filename
         with open(filename, 'r') as f:
@@ -1269,6 +1297,14 @@ class AmberAsciiRestart(object):
     def __str__(self):
         return self.filename
 
+    def _parseVectors(self, lines):
+        """ Parses a block of lines with two vectors per line into an array """
+        # Every line holds up to six 12-character fields.  Pad them to full
+        # width and convert all the fields at once.
+        data = ''.join([line.rstrip('\r\n')[:72].ljust(72) for line in lines])
+        fields = np.frombuffer(data.encode('ascii'), 'S12')[:3*self.natom]
+        return fields.astype(np.float64).reshape((self.natom, 3))
+
     def _parse(self, lines):
         """ Parses through the inpcrd file """
         global VELSCALE
@@ -1338,51 +1374,20 @@ class AmberAsciiRestart(object):
             raise TypeError('Badly formatted restart file. Has %d lines '
                             'for %d atoms.' % (len(lines), self.natom))
 
-        if self._asNumpy:
-            coordinates = np.zeros((self.natom, 3), np.float32)
-            if hasvels:
-                velocities = np.zeros((self.natom, 3), np.float32)
-        else:
-            coordinates = [Vec3(0.0, 0.0, 0.0) for i in range(self.natom)]
-            if hasvels:
-                velocities = [Vec3(0.0, 0.0, 0.0) for i in range(self.natom)]
-
         # Now it's time to parse.  Coordinates first
         startline = 2
         endline = startline + int(ceil(self.natom / 2.0))
-        idx = 0
-        for i in range(startline, endline):
-            line = lines[i]
-            x = float(line[ 0:12])
-            y = float(line[12:24])
-            z = float(line[24:36])
-            coordinates[idx] = Vec3(x, y, z)
-            idx += 1
-            if idx < self.natom:
-                x = float(line[36:48])
-                y = float(line[48:60])
-                z = float(line[60:72])
-                coordinates[idx] = Vec3(x, y, z)
-                idx += 1
+        coordinates = self._parseVectors(lines[startline:endline])
+        if not self._asNumpy:
+            coordinates = arrayToVec3List(coordinates)
         self.coordinates = units.Quantity(coordinates, units.angstroms)
         startline = endline
         # Now it's time to parse velocities if we have them
         if hasvels:
             endline = startline + int(ceil(self.natom / 2.0))
-            idx = 0
-            for i in range(startline, endline):
-                line = lines[i]
-                x = float(line[ 0:12]) * VELSCALE
-                y = float(line[12:24]) * VELSCALE
-                z = float(line[24:36]) * VELSCALE
-                velocities[idx] = Vec3(x, y, z)
-                idx += 1
-                if idx < self.natom:
-                    x = float(line[36:48]) * VELSCALE
-                    y = float(line[48:60]) * VELSCALE
-                    z = float(line[60:72]) * VELSCALE
-                    velocities[idx] = Vec3(x, y, z)
-                    idx += 1
+            velocities = self._parseVectors(lines[startline:endline]) * VELSCALE
+            if not self._asNumpy:
+                velocities = arrayToVec3List(velocities)
             startline = endline
             self.velocities = units.Quantity(velocities,
                                              units.angstroms/units.picoseconds)
@@ -1482,9 +1487,9 @@ class AmberNetcdfRestart(object):
 
         # They are already numpy -- convert to list if we don't want numpy
         if not asNumpy:
-            self.coordinates = [Vec3(*x) for x in self.coordinates]
+            self.coordinates = arrayToVec3List(self.coordinates)
             if self.velocities is not None:
-                self.velocities = [Vec3(*x) for x in self.velocities]
+                self.velocities = arrayToVec3List(self.velocities)
         else:
             if self.boxVectors is not None:
                 self.boxVectors = np.asarray(self.boxVectors.value_in_unit(units.nanometers))
@@ -1531,11 +1536,11 @@ def readAmberCoordinates(filename, asNumpy=False):
     """
 
     try:
-        crdfile = AmberNetcdfRestart(filename)
+        crdfile = AmberNetcdfRestart(filename, asNumpy)
     except ImportError:
         # See if it's an ASCII file.  If so, no need to complain
         try:
-            crdfile = AmberAsciiRestart(filename)
+            crdfile = AmberAsciiRestart(filename, asNumpy)
         except TypeError:
             raise TypeError('Problem parsing %s as an ASCII Amber restart file '
                             'and scipy could not be imported to try reading as '
@@ -1543,12 +1548,10 @@ def readAmberCoordinates(filename, asNumpy=False):
         except (IndexError, ValueError):
             raise TypeError('Could not parse Amber ASCII restart file %s' %
                             filename)
-        except ImportError:
-            raise ImportError('Could not find numpy; cannot use asNumpy=True')
     except TypeError:
         # We had scipy, but this is not a NetCDF v3 file. Try as ASCII now
         try:
-            crdfile = AmberAsciiRestart(filename)
+            crdfile = AmberAsciiRestart(filename, asNumpy)
         except TypeError:
             raise
             raise TypeError('Problem parsing %s as an ASCII Amber restart file'
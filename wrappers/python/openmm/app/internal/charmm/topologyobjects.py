@@ -232,6 +232,9 @@ class WildCard(AtomType):
 
     __hash__ = None
 
+    # Unpickling should give back the singleton
+    def __reduce__(self): return 'WildCard'
+
 WildCard = WildCard() # Turn it into a singleton
 
 # ++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
@@ -1033,6 +1036,12 @@ class UreyBradleyType(BondType):
     implemented as a (unaltered) Bond subclass. See BondType documentation.
     """
 
+    def __reduce_ex__(self, protocol):
+        # Unpickling NoUreyBradley should give back the singleton
+        if self is NoUreyBradley:
+            return 'NoUreyBradley'
+        return super(UreyBradleyType, self).__reduce_ex__(protocol)
+
 # Not all angles have Urey-Bradley terms attached to them. This is a singleton
 # that indicates that there is NO U-B term for this particular type
 NoUreyBradley = UreyBradleyType(None, None)
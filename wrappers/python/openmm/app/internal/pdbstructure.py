@@ -164,13 +164,7 @@ class PdbStructure(object):
             if command == "ATOM  " or command == "HETATM":
                 self._add_atom(Atom(pdb_line, self, self.extraParticleIdentifier))
             elif command == "CONECT":
-                atoms = [_parse_atom_index(pdb_line[6:11])]
-                for pos in (11,16,21,26):
-                    try:
-                        atoms.append(_parse_atom_index(pdb_line[pos:pos+5]))
-                    except:
-                        pass
-                self._current_model.connects.append(atoms)
+                self._current_model.connects.append(_parse_connect_record(pdb_line))
             # Notice MODEL punctuation, for the next level of detail
             # in the structure->model->chain->residue->atom->position hierarchy
             elif pdb_line[:5] == "MODEL":
@@ -190,14 +184,9 @@ class PdbStructure(object):
                 self._current_model._current_chain._add_ter_record()
                 self._reset_residue_numbers()
             elif command == "CRYST1":
-                a_length = float(pdb_line[6:15])*0.1
-                b_length = float(pdb_line[15:24])*0.1
-                c_length = float(pdb_line[24:33])*0.1
-                alpha = float(pdb_line[33:40])*math.pi/180.0
-                beta = float(pdb_line[40:47])*math.pi/180.0
-                gamma = float(pdb_line[47:54])*math.pi/180.0
-                if 0 not in (a_length, b_length, c_length):
-                    self._periodic_box_vectors = computePeriodicBoxVectors(a_length, b_length, c_length, alpha, beta, gamma)
+                box_vectors = _parse_cryst1_record(pdb_line)
+                if box_vectors is not None:
+                    self._periodic_box_vectors = box_vectors
             elif command == "SEQRES":
                 chain_id = pdb_line[11]
                 if len(self.sequences) == 0 or chain_id != self.sequences[-1].chain_id:
@@ -987,6 +976,28 @@ def _parse_atom_index(index):
     except:
         return int(index, 16) - 0xA0000 + 100000
 
+def _parse_connect_record(pdb_line):
+    """Parse a CONECT record, returning the list of atom indices it contains."""
+    atoms = [_parse_atom_index(pdb_line[6:11])]
+    for pos in (11,16,21,26):
+        try:
+            atoms.append(_parse_atom_index(pdb_line[pos:pos+5]))
+        except:
+            pass
+    return atoms
+
+def _parse_cryst1_record(pdb_line):
+    """Parse a CRYST1 record, returning the periodic box vectors, or None if any box length is 0."""
+    a_length = float(pdb_line[6:15])*0.1
+    b_length = float(pdb_line[15:24])*0.1
+    c_length = float(pdb_line[24:33])*0.1
+    alpha = float(pdb_line[33:40])*math.pi/180.0
+    beta = float(pdb_line[40:47])*math.pi/180.0
+    gamma = float(pdb_line[47:54])*math.pi/180.0
+    if 0 in (a_length, b_length, c_length):
+        return None
+    return computePeriodicBoxVectors(a_length, b_length, c_length, alpha, beta, gamma)
+
 # run module directly for testing
 if __name__=='__main__':
     # Test the examples in the docstrings
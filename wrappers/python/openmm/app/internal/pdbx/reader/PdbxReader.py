@@ -61,14 +61,19 @@ class PdbxReader(object):
                           "save":   "ST_DEFINITION",
                           "stop":   "ST_STOP"}
         
-    def read(self, containerList):
+    def read(self, containerList, selectList=None):
         """
         Appends to the input list of definition and data containers.
+
+        selectList - if not None, only the categories whose names appear in this list are
+                     stored in the containers.  All other categories are skipped.
         
         """
         self.__curLineNumber = 0
+        self.__selectList = (None if selectList is None else set(selectList))
+        self.__tokenizerObj = _Tokenizer(self.__ifh)
         try:
-            self.__parser(self.__tokenizer(self.__ifh), containerList)
+            self.__parser(self.__tokenizerObj, containerList)
         except StopIteration:
             pass
         except RuntimeError as err:
@@ -78,7 +83,10 @@ class PdbxReader(object):
             raise PdbxError()
 
     def __syntaxError(self, errText):
-        raise SyntaxError(self.__curLineNumber, errText)
+        raise SyntaxError(self.__tokenizerObj.lineNumber, errText)
+
+    def __isSelected(self, catName):
+        return self.__selectList is None or catName in self.__selectList
 
     def __getContainerName(self,inWord):
         """ Returns the name of the data_ or save_ container
@@ -163,7 +171,10 @@ class PdbxReader(object):
                     curCategory = categoryIndex[curCatName] = DataCategory(curCatName)
 
                     try:
-                        curContainer.append(curCategory)
+                        if self.__isSelected(curCatName):
+                            curContainer.append(curCategory)
+                        elif curContainer is None:
+                            raise AttributeError()
                     except AttributeError:
                         self.__syntaxError("Category cannot be added to  data_ block")
                         return
@@ -232,7 +243,10 @@ class PdbxReader(object):
                 curCategory = DataCategory(curCatName)
 
                 try:
-                    curContainer.append(curCategory)
+                    if self.__isSelected(curCatName):
+                        curContainer.append(curCategory)
+                    elif curContainer is None:
+                        raise AttributeError()
                 except AttributeError:
                     self.__syntaxError("loop_ declaration outside of data_ block or save_ frame")
                     return
@@ -263,7 +277,20 @@ class PdbxReader(object):
                             self.__syntaxError("Unexpected reserved word after loop declaration: %s" % (reservedWord))
                     
                 # Read the table of data for this loop_ - 
+                numAttributes = len(curCategory.getAttributeList())
+                rowList = (curCategory.getRowList() if self.__isSelected(curCategory.getName()) else None)
                 while True:
+                    if curWord is not None and tokenizer.isPlainWord():
+                        # Rows made up of unquoted words can be read in bulk, which is much faster.
+                        tokenizer.readRows(numAttributes, rowList)
+                        curCatName,curAttName,curQuotedString,curWord = next(tokenizer)
+                        if curCatName is not None:
+                            break
+                        if curWord is not None:
+                            reservedWord, state = self.__getState(curWord)
+                            if reservedWord is not None:
+                                break
+
                     curRow = []                    
                     curCategory.append(curRow)
 
@@ -327,53 +354,124 @@ class PdbxReader(object):
                 return
                 
 
-    def __tokenizer(self, ifh):
-        """ Tokenizer method for the mmCIF syntax file - 
+class _Tokenizer(object):
+    """ Tokenizer for the mmCIF syntax.
 
-            Each return/yield from this method returns information about
-            the next token in the form of a tuple with the following structure.
+        Each call to next() returns information about the next token in the form of a tuple
+        with the following structure.
 
-            (category name, attribute name, quoted strings, words w/o quotes or white space)
+        (category name, attribute name, quoted strings, words w/o quotes or white space)
 
-            Differentiated the reqular expression to the better handle embedded quotes.
+        Lines that contain only unquoted words are split directly, without using the regular
+        expression, and rows of a loop_ table made up of them can be read in bulk with readRows().
+    """
+    #
+    # Regex definition for mmCIF syntax - semi-colon delimited strings are handled
+    #                                     outside of this regex.
+    mmcifRe = re.compile(
+        r"(?:"
 
-        """
-        #
-        # Regex definition for mmCIF syntax - semi-colon delimited strings are handled
-        #                                     outside of this regex.
-        mmcifRe = re.compile(
-            r"(?:"
+        r"(?:_(.+?)[.](\S+))"               "|"  # _category.attribute
+
+        r"(?:['](.*?)(?:[']\s|[']$))"       "|"  # single quoted strings
+        r"(?:[\"](.*?)(?:[\"]\s|[\"]$))"    "|"  # double quoted strings
+
+        r"(?:\s*#.*$)"                      "|"  # comments (dumped)
+
+        r"(\S+)"                                 # unquoted words
+
+        r")")
+
+    reservedWords = ("data", "loop", "global", "save", "stop")
 
-            r"(?:_(.+?)[.](\S+))"               "|"  # _category.attribute
+    def __init__(self, ifh):
+        self.lineNumber = 0
+        self.__fileIter = iter(ifh)
+        # The tokens on the current line.  If __plain is True, these are unquoted words.
+        # Otherwise they are token tuples.
+        self.__tokens = []
+        self.__plain = False
+        self.__index = 0
 
-            r"(?:['](.*?)(?:[']\s|[']$))"       "|"  # single quoted strings
-            r"(?:[\"](.*?)(?:[\"]\s|[\"]$))"    "|"  # double quoted strings             
+    def __iter__(self):
+        return self
 
-            r"(?:\s*#.*$)"                      "|"  # comments (dumped)
+    def __next__(self):
+        while self.__index >= len(self.__tokens):
+            self.__readLine()
+        token = self.__tokens[self.__index]
+        self.__index += 1
+        if self.__plain:
+            return (None, None, None, token)
+        return token
 
-            r"(\S+)"                                 # unquoted words
+    def isPlainWord(self):
+        """ Returns True if the token most recently returned by next() is an unquoted word
+            on a line that contains only unquoted words.
+        """
+        return self.__plain and self.__index > 0
+
+    def readRows(self, numAttributes, rowList):
+        """ Reads rows of a loop_ table in bulk.
 
-            r")")
+            This must be called right after next() has returned the first value of a row, and
+            isPlainWord() is True.  That value is returned to the input, then complete rows are
+            read for as long as the lines contain only unquoted words, and no row begins with a
+            reserved word.  Processing then continues from the first token that was not consumed.
 
-        fileIter = iter(ifh)
+            The rows are appended to rowList, or discarded if it is None.
+        """
+        self.__index -= 1
+        partialRow = []
+        words = self.__tokens[self.__index:]
+        try:
+            while True:
+                if len(partialRow) > 0:
+                    words = partialRow+words
+                for i in range(0, len(words), numAttributes):
+                    word = words[i]
+                    if "_" in word and word[:word.find("_")].lower() in self.reservedWords:
+                        # A reserved word ends the table.  Everything before it forms complete rows.
+                        if rowList is not None:
+                            rowList += [words[j:j+numAttributes] for j in range(0, i, numAttributes)]
+                        self.__index = len(self.__tokens)-len(words)+i
+                        return
+                numComplete = len(words)-len(words)%numAttributes
+                if rowList is not None:
+                    rowList += [words[j:j+numAttributes] for j in range(0, numComplete, numAttributes)]
+                partialRow = words[numComplete:]
+                self.__readLine()
+                if not self.__plain:
+                    # Return the values of an incomplete row to the input so they will be processed normally.
+                    if len(partialRow) > 0:
+                        self.__tokens = [(None, None, None, word) for word in partialRow]+self.__tokens
+                    return
+                words = self.__tokens
+        except StopIteration:
+            if rowList is not None and len(partialRow) > 0:
+                rowList.append(partialRow)
+            raise
 
-        ## Tokenizer loop begins here ---
+    def __readLine(self):
+        """ Reads the next line of the input that contains tokens.
+        """
         while True:
-            line = next(fileIter)
-            self.__curLineNumber += 1
+            line = next(self.__fileIter)
+            self.lineNumber += 1
 
             # Dump comments
             if line.startswith("#"):
                 continue
-            
+
             # Gobble up the entire semi-colon/multi-line delimited string and
             #    and stuff this into the string slot in the return tuple
             #
+            tokens = []
             if line.startswith(";"):
                 mlString = [line[1:]]
                 while True:
-                    line = next(fileIter)
-                    self.__curLineNumber += 1
+                    line = next(self.__fileIter)
+                    self.lineNumber += 1
                     if line.startswith(";"):
                         break
                     mlString.append(line)
@@ -381,15 +479,24 @@ class PdbxReader(object):
                 # remove trailing new-line that is part of the \n; delimiter
                 mlString[-1] = mlString[-1].rstrip()
                 #
-                yield (None, None, "".join(mlString), None)
+                tokens.append((None, None, "".join(mlString), None))
                 #
                 # Need to process the remainder of the current line -
                 line = line[1:]
-                #continue
+            else:
+                words = line.split()
+                if "'" not in line and '"' not in line and "_" not in line and "#" not in line or all(word[0] not in "_'\"#" for word in words):
+                    # The line contains only unquoted words.
+                    if len(words) > 0:
+                        self.__tokens = words
+                        self.__plain = True
+                        self.__index = 0
+                        return
+                    continue
 
             # Apply regex to the current line consolidate the single/double
             # quoted within the quoted string category
-            for it in mmcifRe.finditer(line):
+            for it in self.mmcifRe.finditer(line):
                 tgroups = it.groups()
                 if tgroups != (None, None, None, None, None):
                     if tgroups[2] is not None:
@@ -398,68 +505,9 @@ class PdbxReader(object):
                         qs = tgroups[3]
                     else:
                         qs = None
-                    groups = (tgroups[0],tgroups[1],qs,tgroups[4])
-                    yield groups
-
-    def __tokenizerOrg(self, ifh):
-        """ Tokenizer method for the mmCIF syntax file - 
-
-            Each return/yield from this method returns information about
-            the next token in the form of a tuple with the following structure.
-
-            (category name, attribute name, quoted strings, words w/o quotes or white space)
-
-        """
-        #
-        # Regex definition for mmCIF syntax - semi-colon delimited strings are handled
-        #                                     outside of this regex.
-        mmcifRe = re.compile(
-            r"(?:"
-
-            r"(?:_(.+?)[.](\S+))"               "|"  # _category.attribute
-
-            r"(?:['\"](.*?)(?:['\"]\s|['\"]$))" "|"  # quoted strings
-
-            r"(?:\s*#.*$)"                      "|"  # comments (dumped)
-
-            r"(\S+)"                                 # unquoted words
-
-            r")")
-
-        fileIter = iter(ifh)
-
-        ## Tokenizer loop begins here ---
-        while True:
-            line = next(fileIter)
-            self.__curLineNumber += 1
-
-            # Dump comments
-            if line.startswith("#"):
-                continue
-            
-            # Gobble up the entire semi-colon/multi-line delimited string and
-            #    and stuff this into the string slot in the return tuple
-            #
-            if line.startswith(";"):
-                mlString = [line[1:]]
-                while True:
-                    line = next(fileIter)
-                    self.__curLineNumber += 1
-                    if line.startswith(";"):
-                        break
-                    mlString.append(line)
-
-                # remove trailing new-line that is part of the \n; delimiter
-                mlString[-1] = mlString[-1].rstrip()
-                #
-                yield (None, None, "".join(mlString), None)
-                #
-                # Need to process the remainder of the current line -
-                line = line[1:]
-                #continue
-
-            ## Apply regex to the current line 
-            for it in mmcifRe.finditer(line):
-                groups = it.groups()
-                if groups != (None, None, None, None):
-                    yield groups
+                    tokens.append((tgroups[0],tgroups[1],qs,tgroups[4]))
+            if len(tokens) > 0:
+                self.__tokens = tokens
+                self.__plain = False
+                self.__index = 0
+                return
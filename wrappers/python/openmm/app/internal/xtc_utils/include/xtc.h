@@ -27,6 +27,8 @@ Contributors: Stefan Doerr, Raul P. Pelaez
 #define XTC
 #include "xdrfile.h"
 #include<string>
+#include<vector>
+#include<cstdint>
 // Get the number of frames in a trajectory file
 int xtc_nframes(std::string filename);
 
@@ -43,4 +45,15 @@ void xtc_write(std::string filename, int natoms, int nframes, int* step, float*
 // Rewrites a trajectory file with a new timestep and starting step number.
 // Useful when the step number is larger than 2^32.
 void xtc_rewrite_with_new_timestep(std::string filename_in, std::string filename_out, int first_step, int interval, float dt);
+
+// Finds the byte offset of every complete frame in a trajectory file, starting from the frame
+// at the given offset.  The returned vector has one extra element at the end, which is the offset
+// just past the last complete frame.
+std::vector<int64_t> xtc_frame_offsets(std::string filename, int64_t start);
+
+// Reads the frames that begin at the given offsets, storing only the atoms whose indices are
+// listed in atoms (or all atoms if atoms is NULL).  coords_arr has shape (nframes, nselected, 3)
+// and box_arr has shape (nframes, 3, 3).
+void xtc_read_frames(std::string filename, const int64_t* offsets, int nframes, const int* atoms, int nselected, int natoms,
+                     float* coords_arr, float* box_arr, float* time_arr, int* step_arr);
 #endif
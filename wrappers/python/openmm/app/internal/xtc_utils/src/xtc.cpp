@@ -28,6 +28,8 @@ Contributors: Stefan Doerr, Raul P. Pelaez
 #include <vector>
 #include <string>
 #include <stdexcept>
+#include <cstdio>
+#include <cstdint>
 
 // Helper functions to convert between atom/frame and x/y/z indices
 static size_t Xf(size_t atom, size_t frame, size_t nframes) {
@@ -192,3 +194,96 @@ void xtc_rewrite_with_new_timestep(std::string filename_in, std::string filename
         i++;
     }
 }
+
+// Helper functions for 64 bit file positioning
+static int seek64(FILE* fp, int64_t offset) {
+#ifdef _WIN32
+    return _fseeki64(fp, offset, SEEK_SET);
+#else
+    return fseeko(fp, (off_t) offset, SEEK_SET);
+#endif
+}
+
+static int64_t file_size64(FILE* fp) {
+#ifdef _WIN32
+    _fseeki64(fp, 0, SEEK_END);
+    return _ftelli64(fp);
+#else
+    fseeko(fp, 0, SEEK_END);
+    return ftello(fp);
+#endif
+}
+
+// Read a big endian 32 bit integer.  Returns false if the end of the file was reached.
+static bool read_xdr_int(FILE* fp, int32_t& value) {
+    unsigned char bytes[4];
+    if (fread(bytes, 1, 4, fp) != 4)
+        return false;
+    value = (int32_t) (((uint32_t) bytes[0] << 24) | ((uint32_t) bytes[1] << 16) | ((uint32_t) bytes[2] << 8) | (uint32_t) bytes[3]);
+    return true;
+}
+
+std::vector<int64_t> xtc_frame_offsets(std::string filename, int64_t start) {
+    FILE* fp = fopen(filename.c_str(), "rb");
+    if (!fp) {
+        throw std::runtime_error("xtc file: Could not open file");
+    }
+    int64_t fileSize = file_size64(fp);
+    std::vector<int64_t> offsets;
+    int64_t offset = start;
+    // Each frame begins with a fixed size header: magic number, number of atoms, step, time, box,
+    // and the number of atoms again.  Compressed frames continue with the precision, the integer
+    // bounds, the small index, and the number of bytes of compressed data, padded to 4 bytes.
+    while (true) {
+        int32_t magic, natoms, size;
+        if (seek64(fp, offset) != 0 || !read_xdr_int(fp, magic) || !read_xdr_int(fp, natoms))
+            break;
+        if (magic != 1995) {
+            fclose(fp);
+            throw std::runtime_error("xtc_frame_offsets(): XTC file is corrupt\n");
+        }
+        int64_t end;
+        if (natoms <= 9)
+            end = offset + 56 + 12 * (int64_t) natoms;
+        else {
+            if (seek64(fp, offset + 88) != 0 || !read_xdr_int(fp, size))
+                break;
+            end = offset + 92 + (((int64_t) size + 3) / 4) * 4;
+        }
+        if (end > fileSize)
+            break; // The last frame is incomplete.
+        offsets.push_back(offset);
+        offset = end;
+    }
+    offsets.push_back(offset);
+    fclose(fp);
+    return offsets;
+}
+
+void xtc_read_frames(std::string filename, const int64_t* offsets, int nframes, const int* atoms, int nselected, int natoms,
+                     float* coords_arr, float* box_arr, float* time_arr, int* step_arr) {
+    if (natoms == 0) {
+        throw std::runtime_error("xtc_read(): natoms is 0\n");
+    }
+    XDRFILE_RAII xd(filename, "r");
+    XTCFrame frame(natoms);
+    for (size_t f = 0; f < nframes; f++) {
+        if (seek64(((XDRFILE*) xd)->fp, offsets[f]) != 0 || frame.readNextFrame(xd) != exdrOK) {
+            throw std::runtime_error("xtc_read(): could not read frame\n");
+        }
+        time_arr[f] = frame.time;
+        step_arr[f] = frame.step;
+        for (int i = 0; i < 3; i++) {
+            for (int j = 0; j < 3; j++) {
+                box_arr[9 * f + 3 * i + j] = frame.box[i][j];
+            }
+        }
+        float* dest = coords_arr + 3 * nselected * f;
+        for (size_t i = 0; i < nselected; i++) {
+            size_t aidx = (atoms == NULL ? i : atoms[i]);
+            dest[3 * i + 0] = frame.positions[3 * aidx + 0];
+            dest[3 * i + 1] = frame.positions[3 * aidx + 1];
+            dest[3 * i + 2] = frame.positions[3 * aidx + 2];
+        }
+    }
+}
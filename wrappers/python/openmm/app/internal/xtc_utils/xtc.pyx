@@ -26,6 +26,8 @@ import numpy as np
 cimport numpy as np
 cimport xtclib
 from libcpp.string cimport string
+from libcpp.vector cimport vector
+from libc.stdint cimport int64_t
 ctypedef np.float32_t FLOAT32_t
 
 def get_xtc_nframes(string filename):
@@ -94,6 +96,87 @@ def read_xtc(string filename):
     )
     return np.asarray(coords), np.asarray(box), np.asarray(time), np.asarray(step)
 
+def get_xtc_frame_offsets(string filename, int64_t start=0):
+    """
+    Find the byte offset at which each frame in a xtc file begins.  This only reads the frame headers,
+    so it is much faster than decoding the frames.
+    Parameters
+    ----------
+    filename: string
+        The filename of the xtc file. You need to pass the string with filename.encode("UTF-8") to this function
+    start: int
+        The offset of the first frame to consider.  This allows an existing list of offsets to be extended
+        after more frames are appended to the file.
+    Returns
+    -------
+    offsets: np.ndarray
+        The offsets of the complete frames, followed by the offset just past the end of the last one.
+        Shape: (n_frames+1,)
+    """
+    cdef vector[int64_t] offsets = xtclib.xtc_frame_offsets(filename, start)
+    return np.array(offsets, dtype=np.int64)
+
+def read_xtc_frames(string filename, offsets, int natoms, atoms=None):
+    """
+    Read selected frames from a xtc file.
+    Parameters
+    ----------
+    filename: string
+        The filename of the xtc file. You need to pass the string with filename.encode("UTF-8") to this function
+    offsets: np.ndarray
+        The byte offsets of the frames to read, as returned by get_xtc_frame_offsets()
+    natoms: int
+        The number of atoms in the xtc file
+    atoms: np.ndarray
+        The indices of the atoms to return.  If None, all atoms are returned.
+    Returns
+    -------
+    coords: np.ndarray
+        The coordinates of the selected atoms. Shape: (n_frames, n_selected, 3)
+    box: np.ndarray
+        The box vectors of each frame. Shape: (n_frames, 3, 3)
+    time: np.ndarray
+        The time of each frame. Shape: (n_frames,)
+    step: np.ndarray
+        The step of each frame. Shape: (n_frames,)
+    """
+    cdef int64_t[::1] offsets_arr = np.ascontiguousarray(offsets, dtype=np.int64)
+    cdef int nframes = offsets_arr.shape[0]
+    cdef int[::1] atoms_arr
+    cdef const int* atoms_ptr = NULL
+    cdef int nselected = natoms
+    if atoms is not None:
+        atoms_arr = np.ascontiguousarray(atoms, dtype=np.int32)
+        nselected = atoms_arr.shape[0]
+        if nselected > 0 and (np.min(atoms_arr) < 0 or np.max(atoms_arr) >= natoms):
+            raise IndexError("Atom index out of range")
+        if nselected > 0:
+            atoms_ptr = &atoms_arr[0]
+    coords = np.zeros((nframes, nselected, 3), dtype=np.float32)
+    box = np.zeros((nframes, 3, 3), dtype=np.float32)
+    time = np.zeros(nframes, dtype=np.float32)
+    step = np.zeros(nframes, dtype=np.int32)
+    if nframes == 0:
+        return coords, box, time, step
+    cdef FLOAT32_t[:, :, ::1] coords_view = coords
+    cdef FLOAT32_t[:, :, ::1] box_view = box
+    cdef FLOAT32_t[::1] time_view = time
+    cdef int[::1] step_view = step
+    cdef float* coords_ptr = &coords_view[0, 0, 0] if nselected > 0 else NULL
+    xtclib.xtc_read_frames(
+        filename,
+        &offsets_arr[0],
+        nframes,
+        atoms_ptr,
+        nselected,
+        natoms,
+        coords_ptr,
+        &box_view[0, 0, 0],
+        &time_view[0],
+        &step_view[0],
+    )
+    return coords, box, time, step
+
 def xtc_write_frame(string filename, float[:, :] coords, float[:, :] box, float time, int step):
     """
     Appends a single frame to a xtc file (if the file does not exist it is created by this function).
@@ -22,6 +22,8 @@
 
 # Contributors: Stefan Doerr, Raul P. Pelaez
 from libcpp.string cimport string
+from libcpp.vector cimport vector
+from libc.stdint cimport int64_t
 cdef extern from "include/xtc.h":
     cdef int xtc_nframes(string filename) except +
     cdef int xtc_natoms(string filename) except +
@@ -29,3 +31,6 @@ cdef extern from "include/xtc.h":
     cdef void xtc_write(string filename, int natoms, int nframes, int *step, float *timex, float *pos, float *box) except +
     cdef void xtc_rewrite_with_new_timestep(string filename_in, string filename_out,
 				  int first_step, int interval, float dt) except +
+    cdef vector[int64_t] xtc_frame_offsets(string filename, int64_t start) except +
+    cdef void xtc_read_frames(string filename, const int64_t *offsets, int nframes, const int *atoms, int nselected, int natoms,
+                              float *coords_arr, float *box_arr, float *time_arr, int *step_arr) except +
@@ -35,14 +35,15 @@ __author__ = "Peter Eastman"
 __version__ = "1.0"
 
 from openmm.app import Topology, PDBFile, ForceField
-from openmm.app.forcefield import AllBonds, CutoffNonPeriodic, CutoffPeriodic, DrudeGenerator, _getDataDirectories
+from openmm.app.forcefield import AllBonds, CutoffNonPeriodic, CutoffPeriodic, AmoebaMultipoleGenerator, DrudeGenerator, NonbondedGenerator, _getDataDirectories
 from openmm.app.internal import compiled
-from openmm.vec3 import Vec3
+from openmm.vec3 import Vec3, arrayToVec3List
 from openmm import System, Context, NonbondedForce, AmoebaVdwForce, AmoebaMultipoleForce, CustomNonbondedForce, HarmonicBondForce, HarmonicAngleForce, VerletIntegrator, LangevinIntegrator, LocalEnergyMinimizer
 from openmm.unit import nanometer, molar, elementary_charge, degree, acos, is_quantity, dot, norm, kilojoules_per_mole
 import openmm.unit as unit
 from . import element as elem
 import gc
+import numpy as np
 import os
 import random
 import sys
@@ -62,6 +63,7 @@ class Modeller(object):
 
     _residueHydrogens = {}
     _hasLoadedStandardHydrogens = False
+    _maxSolventCandidatesPerBatch = 1000000
 
     def __init__(self, topology, positions):
         """Create a new Modeller object
@@ -295,8 +297,6 @@ class Modeller(object):
         negIonElements = {'Cl-': elem.chlorine, 'Br-': elem.bromine,
                           'F-': elem.fluorine, 'I-': elem.iodine}
 
-        ionPositions = []
-
         numReplaceableMols = len(replaceableMols)
 
         # Fetch ion elements from user input
@@ -307,29 +307,11 @@ class Modeller(object):
         positiveElement = posIonElements[positiveIon]
         negativeElement = negIonElements[negativeIon]
 
-        # Determine the total charge of the system
-        system = forcefield.createSystem(self.topology, residueTemplates=residueTemplates)
-        for i in range(system.getNumForces()):
-            if isinstance(system.getForce(i), (NonbondedForce, AmoebaMultipoleForce)):
-                nonbonded = system.getForce(i)
-                break
-        else:
-            raise ValueError('The ForceField does not specify a NonbondedForce')
-
-        totalCharge = 0.0
-        if isinstance(nonbonded, AmoebaMultipoleForce):
-            for i in range(nonbonded.getNumMultipoles()):
-                totalCharge += nonbonded.getMultipoleParameters(i)[0].value_in_unit(elementary_charge)
-        else:
-            for i in range(nonbonded.getNumParticles()):
-                totalCharge += nonbonded.getParticleParameters(i)[0].value_in_unit(elementary_charge)
-
-        # Round to nearest integer
-        totalCharge = int(floor(0.5 + totalCharge))
-
         # Figure out how many ions to add based on requested params/concentration
         numPositive, numNegative = 0, 0
         if neutralize:
+            # Determine the total charge of the system, rounded to the nearest integer
+            totalCharge = int(floor(0.5 + self._computeTotalCharge(forcefield, residueTemplates)))
             if abs(totalCharge) > numReplaceableMols:
                 raise Exception('Cannot neutralize the system because the charge is greater than the number of available positions for ions')
             if totalCharge > 0:
@@ -350,27 +332,36 @@ class Modeller(object):
             modeller = Modeller(self.topology, self.positions)
 
             replaceableList = list(replaceableMols.keys())
-            numAddedIons = 0
-            numTrials = 10  # Attempts to add ions N times before quitting
-            toReplace = []  # list of molecules to be replaced
-            while numAddedIons < totalIons:
-                pickedMol = random.choice(replaceableList)
-                replaceableList.remove(pickedMol)
-                # Check distance to other ions
-                for pos in ionPositions:
-                    distance = norm(pos - replaceableMols[pickedMol])
-                    if distance <= ionCutoff:
-                        numTrials -= 1
-                        break
-                else:
-                    toReplace.append(pickedMol)
-                    ionPositions.append(replaceableMols[pickedMol])
-                    numAddedIons += 1
-
-                    n_trials = 10
-
-                if n_trials == 0:
-                    raise ValueError('Could not add more than {} ions to the system'.format(numAddedIons))
+            replaceablePos = np.array([replaceableMols[mol].value_in_unit(nanometer) for mol in replaceableList]).reshape((-1, 3))
+            order = np.array(random.sample(range(len(replaceableList)), len(replaceableList)), dtype=np.int64)
+            cutoff = np.nextafter(ionCutoff.value_in_unit(nanometer), np.inf)
+            picked = np.zeros(0, dtype=np.int64)
+            numTried = 0
+            while len(picked) < totalIons:
+                if numTried == len(order):
+                    raise ValueError('Could not add more than {} ions to the system'.format(len(picked)))
+
+                # Take as many candidates as are still needed, and reject any that are too close to an ion that
+                # has already been placed.
+
+                candidates = order[numTried:numTried+totalIons-len(picked)]
+                numTried += len(candidates)
+                accept = np.ones(len(candidates), dtype=bool)
+                if len(picked) > 0:
+                    cells = _CellList(replaceablePos[picked], cutoff, None, False)
+                    accept[cells.query(replaceablePos[candidates])[0]] = False
+
+                # Candidates that are close to each other are resolved in order, so a candidate is only rejected
+                # if an earlier one was accepted.
+
+                cells = _CellList(replaceablePos[candidates], cutoff, None, False)
+                pointIndices, atomIndices, distances = cells.query(replaceablePos[candidates])
+                earlier = atomIndices < pointIndices
+                for i, j in sorted(zip(pointIndices[earlier].tolist(), atomIndices[earlier].tolist())):
+                    if accept[j]:
+                        accept[i] = False
+                picked = np.concatenate([picked, candidates[accept]])
+            toReplace = [replaceableList[i] for i in picked]
 
             # Replace waters/ions in the topology
             modeller.delete(toReplace)
@@ -385,6 +376,36 @@ class Modeller(object):
             self.topology = modeller.topology
             self.positions = modeller.positions
 
+    def _computeTotalCharge(self, forcefield, residueTemplates):
+        """Compute the total charge of the system as assigned by a ForceField.
+
+        When the charges come from a standard NonbondedForce, they are looked up from the templates matched to
+        each residue without building a System.  Otherwise a System is created and the charges are summed.
+        """
+        nonbonded = [force for force in forcefield._forces if isinstance(force, NonbondedGenerator)]
+        if len(nonbonded) > 0 and len(forcefield._scripts) == 0 and not any(isinstance(force, AmoebaMultipoleGenerator) for force in forcefield._forces):
+            data = ForceField._SystemData(self.topology)
+            forcefield._matchAllResiduesToTemplates(data, self.topology, residueTemplates, False)
+            for atom in data.atoms:
+                if atom not in data.atomType:
+                    raise Exception("Could not identify atom type for atom '%s'." % str(atom))
+            return sum(nonbonded[0].params.getAtomParameters(atom, data)[0] for atom in data.atoms)
+        system = forcefield.createSystem(self.topology, residueTemplates=residueTemplates)
+        for i in range(system.getNumForces()):
+            if isinstance(system.getForce(i), (NonbondedForce, AmoebaMultipoleForce)):
+                nonbonded = system.getForce(i)
+                break
+        else:
+            raise ValueError('The ForceField does not specify a NonbondedForce')
+        totalCharge = 0.0
+        if isinstance(nonbonded, AmoebaMultipoleForce):
+            for i in range(nonbonded.getNumMultipoles()):
+                totalCharge += nonbonded.getMultipoleParameters(i)[0].value_in_unit(elementary_charge)
+        else:
+            for i in range(nonbonded.getNumParticles()):
+                totalCharge += nonbonded.getParticleParameters(i)[0].value_in_unit(elementary_charge)
+        return totalCharge
+
     def addSolvent(self, forcefield, model='tip3p', boxSize=None, boxVectors=None, padding=None, numAdded=None, boxShape='cube', positiveIon='Na+', negativeIon='Cl-', ionicStrength=0*molar, neutralize=True, residueTemplates=dict()):
         """Add solvent (both water and ions) to the model to fill a periodic box.
 
@@ -569,10 +590,6 @@ class Modeller(object):
             positions = deepcopy(self.positions.value_in_unit(nanometer))
         cells = _CellList(positions, maxCutoff, vectors, True)
 
-        # Create a function to compute the distance between two points, taking periodic boundary conditions into account.
-
-        periodicDistance = compiled.periodicDistance(vectors)
-
         # Find the list of water molecules to add.
 
         newChain = newTopology.addChain()
@@ -581,83 +598,101 @@ class Modeller(object):
         else:
             center = [(max((pos[i] for pos in positions))+min((pos[i] for pos in positions)))/2 for i in range(3)]
             center = Vec3(center[0], center[1], center[2])
-        numBoxes = [int(ceil(box[i]/pdbBoxSize[i])) for i in range(3)]
-        addedWaters = []
-        for boxx in range(numBoxes[0]):
-            for boxy in range(numBoxes[1]):
-                for boxz in range(numBoxes[2]):
-                    offset = Vec3(boxx*pdbBoxSize[0], boxy*pdbBoxSize[1], boxz*pdbBoxSize[2])
-                    for residue in pdbResidues:
-                        oxygen = [atom for atom in residue.atoms() if atom.element == elem.oxygen][0]
-                        atomPos = pdbPositions[oxygen.index]+offset
-                        if not any((atomPos[i] > box[i] for i in range(3))):
-                            # This molecule is inside the box, so see how close to it is to the solute.
-
-                            atomPos += center-box/2
-                            for i in cells.neighbors(atomPos):
-                                if periodicDistance(atomPos, positions[i]) < cutoff[i]:
-                                    break
-                            else:
-                                # Record this water molecule as one to add.
 
-                                addedWaters.append((residue.index, atomPos))
+        # Record the oxygen position of every molecule in the water box.  Atoms of a residue are contiguous, so each
+        # one is described by a range of atoms.
+
+        pdbPositions = np.array(pdbPositions)
+        oxygenIndex = np.array([[atom.index for atom in residue.atoms() if atom.element == elem.oxygen][0] for residue in pdbResidues])
+        residueStart = np.array([residue._atoms[0].index for residue in pdbResidues])
+        residueSize = np.array([len(residue) for residue in pdbResidues])
+        oxygenPos = pdbPositions[oxygenIndex]
+
+        # Tile the water box over the periodic box.  Tiles are processed in batches to bound the memory used, and within
+        # a batch every molecule that lies inside the box is checked against the solute at once.
+
+        numBoxes = [int(ceil(box[i]/pdbBoxSize[i])) for i in range(3)]
+        tiles = np.stack(np.meshgrid(*[np.arange(n) for n in numBoxes], indexing='ij'), axis=-1).reshape((-1, 3))*np.array(pdbBoxSize)
+        shift = np.array(center-box/2)
+        tilesPerBatch = max(1, self._maxSolventCandidatesPerBatch//len(pdbResidues))
+        waterIndex = []
+        waterPositions = []
+        for start in range(0, len(tiles), tilesPerBatch):
+            candidates = (tiles[start:start+tilesPerBatch, np.newaxis, :]+oxygenPos).reshape((-1, 3))
+            candidateIndex = np.tile(np.arange(len(pdbResidues)), len(candidates)//len(pdbResidues))
+            inside = np.all(candidates <= np.array(box), axis=1)
+            candidates = candidates[inside]+shift
+            candidateIndex = candidateIndex[inside]
+
+            # Discard the ones that are too close to the solute.
+
+            keep = np.ones(len(candidates), dtype=bool)
+            keep[cells.query(candidates, cutoff)[0]] = False
+            waterIndex.append(candidateIndex[keep])
+            waterPositions.append(candidates[keep])
+        waterIndex = np.concatenate(waterIndex)
+        waterPositions = np.concatenate(waterPositions)
 
         if numAdded is not None:
             # We added many more waters than we actually want.  Sort them based on distance to the nearest box edge and
             # only keep the ones in the middle.
 
-            lowerBound = center-box/2
-            upperBound = center+box/2
-            distToEdge = (min(min(pos-lowerBound), min(upperBound-pos)) for index, pos in addedWaters)
-            sortedIndex = [i[0] for i in sorted(enumerate(distToEdge), key=lambda x: -x[1])]
-            addedWaters = [addedWaters[i] for i in sortedIndex[:numAdded]]
+            lowerBound = np.array(center-box/2)
+            upperBound = np.array(center+box/2)
+            distToEdge = np.minimum(np.min(waterPositions-lowerBound, axis=1), np.min(upperBound-waterPositions, axis=1))
+            sortedIndex = np.argsort(-distToEdge, kind='stable')[:numAdded]
+            waterIndex = waterIndex[sortedIndex]
+            waterPositions = waterPositions[sortedIndex]
 
             # Compute a new periodic box size.
 
-            maxSize = max(max((pos[i] for index, pos in addedWaters))-min((pos[i] for index, pos in addedWaters)) for i in range(3))
+            maxSize = max(np.max(waterPositions, axis=0)-np.min(waterPositions, axis=0))
             maxSize += 0.1  # Add padding to reduce clashes at the edge.
             newTopology.setPeriodicBoxVectors(self._computeBoxVectors(maxSize, boxShape))
         else:
             # There could be clashes between water molecules at the box edges.  Find ones to remove.
 
-            upperCutoff = center+box/2-Vec3(waterCutoff, waterCutoff, waterCutoff)
-            lowerCutoff = center-box/2+Vec3(waterCutoff, waterCutoff, waterCutoff)
-            lowerSkinPositions = [pos for index, pos in addedWaters if pos[0] < lowerCutoff[0] or pos[1] < lowerCutoff[1] or pos[2] < lowerCutoff[2]]
-            filteredWaters = []
-            cells.cells = {}
-            for i in range(len(lowerSkinPositions)):
-                cell = cells.cellForPosition(lowerSkinPositions[i])
-                if cell in cells.cells:
-                    cells.cells[cell].append(i)
-                else:
-                    cells.cells[cell] = [i]
-            for entry in addedWaters:
-                pos = entry[1]
-                if pos[0] < upperCutoff[0] and pos[1] < upperCutoff[1] and pos[2] < upperCutoff[2]:
-                    filteredWaters.append(entry)
-                else:
-                    if not any((periodicDistance(lowerSkinPositions[i], pos) < waterCutoff and norm(lowerSkinPositions[i]-pos) > waterCutoff for i in cells.neighbors(pos))):
-                        filteredWaters.append(entry)
-            addedWaters = filteredWaters
+            upperCutoff = np.array(center+box/2-Vec3(waterCutoff, waterCutoff, waterCutoff))
+            lowerCutoff = np.array(center-box/2+Vec3(waterCutoff, waterCutoff, waterCutoff))
+            lowerSkinPositions = waterPositions[np.any(waterPositions < lowerCutoff, axis=1)]
+            upperSkin = np.where(~np.all(waterPositions < upperCutoff, axis=1))[0]
+            skinCells = _CellList(lowerSkinPositions, waterCutoff, vectors, True)
+            upperSkinPositions = waterPositions[upperSkin]
+            pointIndices, atomIndices, distances = skinCells.query(upperSkinPositions)
+
+            # A water clashes with one on the other side of the box if they are close together only
+            # when periodic boundary conditions are applied.
+
+            directDistances = np.linalg.norm(upperSkinPositions[pointIndices]-skinCells.positions[atomIndices], axis=1)
+            keep = np.ones(len(waterPositions), dtype=bool)
+            keep[upperSkin[pointIndices[directDistances > waterCutoff]]] = False
+            waterIndex = waterIndex[keep]
+            waterPositions = waterPositions[keep]
+
+        # Compute the positions of all atoms in the added molecules at once.
+
+        atomCounts = residueSize[waterIndex]
+        firstAtom = np.cumsum(atomCounts)-atomCounts
+        atomIndex = np.repeat(residueStart[waterIndex]-firstAtom, atomCounts)+np.arange(np.sum(atomCounts))
+        atomPositions = np.repeat(waterPositions, atomCounts, axis=0)+pdbPositions[atomIndex]-np.repeat(oxygenPos[waterIndex], atomCounts, axis=0)
+        atomPositions = arrayToVec3List(atomPositions)
+        newPositions.extend(atomPositions*nanometer)
 
         # Add the water molecules.
+
+        residueBonds = []
+        for residue in pdbResidues:
+            atoms = list(residue.atoms())
+            residueBonds.append([(i, j) for i, atom1 in enumerate(atoms) if atom1.element == elem.oxygen
+                                        for j, atom2 in enumerate(atoms) if atom2.element == elem.hydrogen])
         waterPos = {}
-        for index, pos in addedWaters:
-            newResidue = newTopology.addResidue(residue.name, newChain)
+        for index, first in zip(waterIndex.tolist(), firstAtom.tolist()):
             residue = pdbResidues[index]
-            oxygen = [atom for atom in residue.atoms() if atom.element == elem.oxygen][0]
-            oPos = pdbPositions[oxygen.index]
-            molAtoms = []
-            for atom in residue.atoms():
-                molAtoms.append(newTopology.addAtom(atom.name, atom.element, newResidue))
-                newPositions.append((pos+pdbPositions[atom.index]-oPos)*nanometer)
-                if atom.element == elem.oxygen:
-                    waterPos[newResidue] = newPositions[-1]
-            for atom1 in molAtoms:
-                if atom1.element == elem.oxygen:
-                    for atom2 in molAtoms:
-                        if atom2.element == elem.hydrogen:
-                            newTopology.addBond(atom1, atom2)
+            newResidue = newTopology.addResidue(residue.name, newChain)
+            molAtoms = [newTopology.addAtom(atom.name, atom.element, newResidue) for atom in residue.atoms()]
+            for i, j in residueBonds[index]:
+                newTopology.addBond(molAtoms[i], molAtoms[j])
+            waterPos[newResidue] = atomPositions[first+oxygenIndex[index]-residueStart[index]]*nanometer
 
         self.topology = newTopology
         self.positions = newPositions
@@ -937,7 +972,7 @@ class Modeller(object):
 
                                 nd1IsBonded = False
                                 ne2IsBonded = False
-                                for acceptorIndex in cells.neighbors(nd1Pos.value_in_unit(nanometer)):
+                                for acceptorIndex in cells.neighbors(nd1Pos.value_in_unit(nanometer), 0.35):
                                     acceptor = acceptors[acceptorIndex]
                                     if acceptor.residue != residue:
                                         acceptorPos = self.positions[acceptor.index]
@@ -945,7 +980,7 @@ class Modeller(object):
                                             nd1IsBonded = True
                                             break
                                 if not nd1IsBonded:
-                                    for acceptorIndex in cells.neighbors(ne2Pos.value_in_unit(nanometer)):
+                                    for acceptorIndex in cells.neighbors(ne2Pos.value_in_unit(nanometer), 0.35):
                                         acceptor = acceptors[acceptorIndex]
                                         if acceptor.residue != residue:
                                             acceptorPos = self.positions[acceptor.index]
@@ -1452,45 +1487,35 @@ class Modeller(object):
         vectors = membraneTopology.getPeriodicBoxVectors().value_in_unit(nanometer)
         proteinCells = _CellList(proteinPos, overlapCutoff, vectors, False)
         scaledProteinCells = _CellList(scaledProteinPos, overlapCutoff, vectors, False)
+        patchResidues = list(patch.topology.residues())
+        patchPosArray = np.array(patchPos)
+        atomResidue = np.array([atom.residue.index for atom in patch.topology.atoms()], dtype=np.int64)
+        isWater = np.array([res.name == 'HOH' for res in patchResidues])
         for x in range(nx):
             for y in range(ny):
                 offset = proteinCenterPos - patchCenterPos + Vec3((x-0.5*(nx-1))*patchSize[0], (y-0.5*(ny-1))*patchSize[1], 0)
-                for res in patch.topology.residues():
-                    resPos = [patchPos[atom.index]+offset for atom in res.atoms()]
+                tilePos = patchPosArray + offset
+
+                # Remove waters that are too close to either the original OR scaled protein positions, and
+                # lipids that are too close to the scaled protein positions.
+
+                overlap = np.zeros(len(patchResidues), dtype=bool)
+                overlap[atomResidue[scaledProteinCells.query(tilePos)[0]]] = True
+                waterOverlap = np.zeros(len(patchResidues), dtype=bool)
+                waterOverlap[atomResidue[proteinCells.query(tilePos)[0]]] = True
+                overlap |= waterOverlap & isWater
+                tilePosList = tilePos.tolist()
+                for res in patchResidues:
+                    resPos = [Vec3(*tilePosList[atom.index]) for atom in res.atoms()]
                     if res.name == 'HOH':
-                        # Remove waters that are too close to either the original OR scaled protein positions.
-                        referencePosLists = [proteinPos, scaledProteinPos]
-                        cellLists = [proteinCells, scaledProteinCells]
-                    else:
-                        # Remove lipids that are too close to the scaled protein positions.
-                        referencePosLists = [scaledProteinPos]
-                        cellLists = [scaledProteinCells]
-                    overlap = False
-                    nearest = nx*patchSize[0]
-                    for cells, referencePos in zip(cellLists, referencePosLists):
-                        if overlap:
-                            break
-                        for index, atom in enumerate(res.atoms()):
-                            pos = resPos[index]
-                            for atom in cells.neighbors(pos):
-                                distance = norm(pos-referencePos[atom])
-                                if distance < overlapCutoff:
-                                    overlap = True
-                                    break
-                                nearest = min(nearest, distance)
-                            if overlap:
-                                break
-                    if res.name == 'HOH':
-                        if not overlap:
+                        if not overlap[res.index]:
                             addedWater.append((res, resPos))
                     else:
-                        if overlap:
+                        if overlap[res.index]:
                             removedFromLeaf[lipidLeaf[res]] += 1
                         else:
-                            addedLipids.append((nearest, res, resPos))
+                            addedLipids.append((res, resPos))
         skipFromLeaf = [max(removedFromLeaf)-removedFromLeaf[i] for i in (0,1)]
-        del cellLists
-        del cells
         del proteinCells
 
         # Add the lipids.
@@ -1498,7 +1523,7 @@ class Modeller(object):
         newAtoms = {}
         lipidChain = membraneTopology.addChain()
         lipidResNum = 1  # renumber lipid residues to handle large patches
-        for (nearest, residue, pos) in addedLipids:
+        for (residue, pos) in addedLipids:
             if skipFromLeaf[lipidLeaf[residue]] > 0:
                 # Remove the same number of residues from each leaf.
                 skipFromLeaf[lipidLeaf[residue]] -= 1
@@ -1540,21 +1565,26 @@ class Modeller(object):
         numProteinParticles = proteinSystem.getNumParticles()
         for i in range(numProteinParticles):
             system.addParticle(0.0)
+        # Atoms of the scaled protein can be much closer together than in the real protein.  Exclude interactions
+        # between nearby pairs so they do not produce huge forces.
+
         nonbonded = None
+        exclusionCells = _CellList(scaledProteinPos, 2*overlapCutoff, None, False)
+        scaledPairs = exclusionCells.query(scaledProteinPos)
+        scaledPairs = [(i, j) for i, j in zip(scaledPairs[0], scaledPairs[1]) if j < i]
+        del exclusionCells
         for f1, f2 in zip(system.getForces(), proteinSystem.getForces()):
             if isinstance(f1, NonbondedForce):
                 nonbonded = f2
                 for i in range(numProteinParticles):
                     f1.addParticle(*f2.getParticleParameters(i))
-                    for j in scaledProteinCells.neighbors(scaledProteinPos[i]):
-                        if j < i:
-                            f1.addException(i+numMembraneParticles, j+numMembraneParticles, 0.0, 1.0, 0.0)
+                for i, j in scaledPairs:
+                    f1.addException(int(i)+numMembraneParticles, int(j)+numMembraneParticles, 0.0, 1.0, 0.0)
             elif isinstance(f1, CustomNonbondedForce):
                 for i in range(numProteinParticles):
                     f1.addParticle(f2.getParticleParameters(i))
-                    for j in scaledProteinCells.neighbors(scaledProteinPos[i]):
-                        if j < i:
-                            f1.addExclusion(i + numMembraneParticles, j + numMembraneParticles)
+                for i, j in scaledPairs:
+                    f1.addExclusion(int(i) + numMembraneParticles, int(j) + numMembraneParticles)
         if nonbonded is None:
             raise ValueError('The ForceField does not specify a NonbondedForce')
         mergedPositions = membranePos+scaledProteinPos
@@ -1574,22 +1604,13 @@ class Modeller(object):
             context = Context(system, integrator, platform)
         context.setPositions(mergedPositions)
         LocalEnergyMinimizer.minimize(context, 10.0, 30)
-        try:
-            import numpy as np
-            hasNumpy = True
-            proteinPosArray = np.array(proteinPos)
-            scaledProteinPosArray = np.array(scaledProteinPos)
-        except:
-            hasNumpy = False
+        proteinPosArray = np.array(proteinPos)
+        scaledProteinPosArray = np.array(scaledProteinPos)
         for i in range(steps):
             weight1 = i/(steps-1)
             weight2 = 1.0-weight1
-            mergedPositions = context.getState(positions=True).getPositions(asNumpy=hasNumpy).value_in_unit(nanometer)
-            if hasNumpy:
-                mergedPositions[numMembraneParticles:] = weight1*proteinPosArray + weight2*scaledProteinPosArray
-            else:
-                for j in range(len(proteinPos)):
-                    mergedPositions[j+numMembraneParticles] = (weight1*proteinPos[j] + weight2*scaledProteinPos[j])
+            mergedPositions = context.getState(positions=True).getPositions(asNumpy=True).value_in_unit(nanometer)
+            mergedPositions[numMembraneParticles:] = weight1*proteinPosArray + weight2*scaledProteinPosArray
             context.setPositions(mergedPositions)
             integrator.step(20)
 
@@ -1685,53 +1706,125 @@ class Modeller(object):
 
 
 class _CellList(object):
-    """This class organizes atom positions into cells, so the neighbors of a point can be quickly retrieved"""
+    """This class organizes atom positions into cells, so the neighbors of many points can be quickly found.
+
+    Positions are stored in a NumPy array, and queries for arrays of points are processed together.  If periodic
+    is True, distances are computed with periodic boundary conditions, and the cells are defined in fractional
+    coordinates so arbitrary triclinic boxes are supported.  Otherwise the cells cover the bounding box of the
+    positions and vectors is ignored.
+    """
 
     def __init__(self, positions, maxCutoff, vectors, periodic):
-        if vectors is None:
-            if len(positions) == 0:
-                vectors = (Vec3(maxCutoff, 0, 0), Vec3(0, maxCutoff, 0), Vec3(0, 0, maxCutoff))
-            else:
-                minPos = [min((pos[i] for pos in positions)) for i in range(3)]
-                maxPos = [max((pos[i] for pos in positions)) for i in range(3)]
-                width = [max(maxPos[i]-minPos[i], maxCutoff) for i in range(3)]
-                vectors = (Vec3(width[0], 0, 0), Vec3(0, width[1], 0), Vec3(0, 0, width[2]))
-        self.positions = deepcopy(positions)
-        self.cells = {}
-        self.numCells = tuple((max(1, int(floor(vectors[i][i]/maxCutoff))) for i in range(3)))
-        self.cellSize = tuple((vectors[i][i]/self.numCells[i] for i in range(3)))
-        self.vectors = vectors
+        self.positions = np.array(positions, dtype=np.float64).reshape((-1, 3))
+        self.maxCutoff = maxCutoff
         self.periodic = periodic
-        invBox = Vec3(1.0/vectors[0][0], 1.0/vectors[1][1], 1.0/vectors[2][2])
-        for i in range(len(self.positions)):
-            pos = self.positions[i]
-            if periodic:
-                pos = pos - floor(pos[2]*invBox[2])*vectors[2]
-                pos -= floor(pos[1]*invBox[1])*vectors[1]
-                pos -= floor(pos[0]*invBox[0])*vectors[0]
-                self.positions[i] = pos
-            cell = self.cellForPosition(pos)
-            if cell in self.cells:
-                self.cells[cell].append(i)
+        if periodic:
+            self.vectors = np.array(vectors, dtype=np.float64).reshape((3, 3))
+            self.invVectors = np.linalg.inv(self.vectors)
+
+            # Each cell must be at least maxCutoff wide, measured perpendicular to its faces.
+
+            volume = abs(np.linalg.det(self.vectors))
+            a, b, c = self.vectors
+            widths = volume/np.linalg.norm([np.cross(b, c), np.cross(c, a), np.cross(a, b)], axis=1)
+            self.numCells = np.maximum(1, np.floor(widths/(maxCutoff*(1+1e-6)))).astype(np.int64)
+        else:
+            if len(self.positions) == 0:
+                self.origin = np.zeros(3)
+                width = np.zeros(3)
+            else:
+                self.origin = self.positions.min(axis=0)
+                width = self.positions.max(axis=0)-self.origin
+            self.numCells = np.maximum(1, np.floor(width/maxCutoff)).astype(np.int64)
+            self.cellSize = np.maximum(width/self.numCells, maxCutoff)
+        coords = self._cellCoords(self.positions)
+        if not periodic:
+            # Atoms at the upper edge of the bounding box belong to the last cell.
+            coords = np.minimum(coords, self.numCells-1)
+        cellIds = self._cellIds(coords)
+        self.sortedAtoms = np.argsort(cellIds, kind='stable')
+        self.sortedCellIds = cellIds[self.sortedAtoms]
+
+        # Build the list of offsets to neighboring cells.  When there are fewer than three cells along an axis, use
+        # every cell along it exactly once.
+
+        axisOffsets = []
+        for n in self.numCells:
+            if periodic and n < 3:
+                axisOffsets.append(np.arange(n))
             else:
-                self.cells[cell] = [i]
+                axisOffsets.append(np.array([-1, 0, 1]))
+        self.cellOffsets = np.array(np.meshgrid(*axisOffsets, indexing='ij')).reshape((3, -1)).T
+
+    def _cellCoords(self, points):
+        if self.periodic:
+            return np.floor(np.dot(points, self.invVectors)*self.numCells).astype(np.int64) % self.numCells
+        return np.floor((points-self.origin)/self.cellSize).astype(np.int64)
 
-    def cellForPosition(self, pos):
+    def _cellIds(self, coords):
+        return (coords[:,0]*self.numCells[1] + coords[:,1])*self.numCells[2] + coords[:,2]
+
+    def _displacements(self, points, atoms):
+        delta = points-self.positions[atoms]
         if self.periodic:
-            invBox = Vec3(1.0/self.vectors[0][0], 1.0/self.vectors[1][1], 1.0/self.vectors[2][2])
-            pos = pos-floor(pos[2]*invBox[2])*self.vectors[2]
-            pos -= floor(pos[1]*invBox[1])*self.vectors[1]
-            pos -= floor(pos[0]*invBox[0])*self.vectors[0]
-        return tuple((int(floor(pos[j]/self.cellSize[j]))%self.numCells[j] for j in range(3)))
-
-    def neighbors(self, pos):
-        processedCells = set()
-        offsets = (-1, 0, 1)
-        for i in offsets:
-            for j in offsets:
-                for k in offsets:
-                    cell = self.cellForPosition(Vec3(pos[0]+i*self.cellSize[0], pos[1]+j*self.cellSize[1], pos[2]+k*self.cellSize[2]))
-                    if cell in self.cells and cell not in processedCells:
-                        processedCells.add(cell)
-                        for atom in self.cells[cell]:
-                            yield atom
+            vectors = self.vectors
+            for i in (2, 1, 0):
+                delta -= np.round(delta[:,i]/vectors[i][i])[:,np.newaxis]*vectors[i]
+        return delta
+
+    def query(self, points, cutoff=None):
+        """Find all pairs of points and stored atoms that are closer than a cutoff distance.
+
+        Parameters
+        ----------
+        points : array
+            an (N,3) array of positions in nanometers
+        cutoff : float or array=None
+            the cutoff distance.  This may be a single value, or an array with one element for each stored atom.
+            No value may exceed the maxCutoff specified in the constructor.  If None, maxCutoff is used.
+
+        Returns
+        -------
+        (pointIndices, atomIndices, distances), three arrays listing every pair within the cutoff
+        """
+        points = np.array(points, dtype=np.float64).reshape((-1, 3))
+        if cutoff is None:
+            cutoff = self.maxCutoff
+        cutoff = np.asarray(cutoff, dtype=np.float64)
+        results = ([], [], [])
+        blockSize = 16384
+        for blockStart in range(0, len(points), blockSize):
+            block = points[blockStart:blockStart+blockSize]
+            coords = self._cellCoords(block)
+
+            # Find the range of sorted atoms in each neighboring cell of each point.
+
+            neighborCoords = coords[:,np.newaxis,:] + self.cellOffsets[np.newaxis,:,:]
+            if self.periodic:
+                neighborCoords %= self.numCells
+                valid = np.ones(neighborCoords.shape[:2], dtype=bool)
+            else:
+                valid = np.all((neighborCoords >= 0) & (neighborCoords < self.numCells), axis=2)
+            pointIndex = np.nonzero(valid)[0]
+            ids = self._cellIds(neighborCoords[valid])
+            start = np.searchsorted(self.sortedCellIds, ids, 'left')
+            counts = np.searchsorted(self.sortedCellIds, ids, 'right')-start
+
+            # Expand them into candidate pairs and check the distances.
+
+            pairPoint = np.repeat(pointIndex, counts)
+            firstPair = np.cumsum(counts)-counts
+            pairAtom = self.sortedAtoms[np.arange(len(pairPoint)) - np.repeat(firstPair-start, counts)]
+            distance = np.linalg.norm(self._displacements(block[pairPoint], pairAtom), axis=1)
+            pairCutoff = cutoff[pairAtom] if cutoff.ndim > 0 else cutoff
+            within = distance < pairCutoff
+            results[0].append(pairPoint[within]+blockStart)
+            results[1].append(pairAtom[within])
+            results[2].append(distance[within])
+        if len(points) == 0:
+            return (np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0))
+        return tuple(np.concatenate(r) for r in results)
+
+    def neighbors(self, pos, cutoff=None):
+        """Get the indices of all stored atoms that are closer than a cutoff distance to a single point."""
+        return self.query([pos], cutoff)[1]
@@ -39,7 +39,8 @@ import xml.etree.ElementTree as etree
 from copy import copy
 from datetime import date
 from openmm import Vec3, Platform
-from openmm.app.internal.pdbstructure import PdbStructure
+from openmm.vec3 import arrayToVec3List, vec3ListToArray
+from openmm.app.internal.pdbstructure import PdbStructure, _parse_atom_index, _parse_connect_record, _parse_cryst1_record
 from openmm.app.internal.unitcell import computeLengthsAndAngles
 from openmm.app import Topology
 from openmm.unit import nanometers, angstroms, is_quantity, norm, Quantity
@@ -92,13 +93,61 @@ class PDBFile(object):
             if isinstance(file, str):
                 inputfile = open(file)
                 own_handle = True
-            pdb = PdbStructure(inputfile, load_all_models=True, extraParticleIdentifier=extraParticleIdentifier)
+            lines = [line if isinstance(line, str) else line.decode('utf-8') for line in inputfile]
             if own_handle:
                 inputfile.close()
+            pdb = None
         PDBFile._loadNameReplacementTables()
 
-        # Build the topology
+        # Build the topology.  Most files can be read directly from the fixed columns of the ATOM and
+        # HETATM records.  Anything more complicated is handled by PdbStructure.
 
+        loaded = None
+        if pdb is None:
+            loaded = self._loadFixedColumns(lines, extraParticleIdentifier)
+            if loaded is None:
+                pdb = PdbStructure(lines, load_all_models=True, extraParticleIdentifier=extraParticleIdentifier)
+        if loaded is None:
+            loaded = self._loadPdbStructure(pdb)
+        atomByNumber, connects, boxVectors = loaded
+
+        ## The atom positions read from the PDB file.  If the file contains multiple frames, these are the positions in the first frame.
+        self.positions = self._positions[0]
+        self.topology.setPeriodicBoxVectors(boxVectors)
+        self.topology.createStandardBonds()
+        self.topology.createDisulfideBonds(self.positions)
+        self._numpyPositions = None
+
+        # Add bonds based on CONECT records. Bonds between metals of elements specified in metalElements and residues in standardResidues are not added.
+
+        connectBonds = []
+        for connect in connects:
+            i = connect[0]
+            for j in connect[1:]:
+                if i in atomByNumber and j in atomByNumber:    
+                    if atomByNumber[i].element is not None and atomByNumber[j].element is not None:
+                        if atomByNumber[i].element.symbol not in metalElements and atomByNumber[j].element.symbol not in metalElements:
+                            connectBonds.append((atomByNumber[i], atomByNumber[j])) 
+                        elif atomByNumber[i].element.symbol in metalElements and atomByNumber[j].residue.name not in PDBFile._standardResidues:
+                            connectBonds.append((atomByNumber[i], atomByNumber[j])) 
+                        elif atomByNumber[j].element.symbol in metalElements and atomByNumber[i].residue.name not in PDBFile._standardResidues:
+                            connectBonds.append((atomByNumber[i], atomByNumber[j]))     
+                    else:
+                        connectBonds.append((atomByNumber[i], atomByNumber[j]))         
+        if len(connectBonds) > 0:
+            # Only add bonds that don't already exist.
+            existingBonds = set(top.bonds())
+            for bond in connectBonds:
+                if bond not in existingBonds and (bond[1], bond[0]) not in existingBonds:
+                    top.addBond(bond[0], bond[1])
+                    existingBonds.add(bond)
+
+    def _loadPdbStructure(self, pdb):
+        """Build the Topology and positions from a PdbStructure.
+
+        Returns a tuple (atomByNumber, connects, boxVectors).
+        """
+        top = self.topology
         atomByNumber = {}
         for chain in pdb.iter_chains():
             c = top.addChain(chain.chain_id)
@@ -124,34 +173,7 @@ class PDBFile(object):
                     if element == 'EP':
                         element = None
                     elif element is None:
-                        # Try to guess the element.
-
-                        upper = atomName.upper()
-                        while len(upper) > 1 and upper[0].isdigit():
-                            upper = upper[1:]
-                        if upper.startswith('CL'):
-                            element = elem.chlorine
-                        elif upper.startswith('NA'):
-                            element = elem.sodium
-                        elif upper.startswith('MG'):
-                            element = elem.magnesium
-                        elif upper.startswith('BE'):
-                            element = elem.beryllium
-                        elif upper.startswith('LI'):
-                            element = elem.lithium
-                        elif upper.startswith('K'):
-                            element = elem.potassium
-                        elif upper.startswith('ZN'):
-                            element = elem.zinc
-                        elif len(residue) == 1 and upper.startswith('CA'):
-                            element = elem.calcium
-                        elif upper.startswith('D') and any(a.name == atomName[1:] for a in residue.iter_atoms()):
-                            pass # A Drude particle
-                        else:
-                            try:
-                                element = elem.get_by_symbol(upper[0])
-                            except KeyError:
-                                pass
+                        element = PDBFile._guessElement(atomName, len(residue), (a.name for a in residue.iter_atoms()))
                     newAtom = top.addAtom(atomName, element, r, str(atom.serial_number), formalCharge=atom.formal_charge)
                     atomByNumber[atom.serial_number] = newAtom
         self._positions = []
@@ -167,36 +189,177 @@ class PDBFile(object):
                         pos = atom.get_position().value_in_unit(nanometers)
                         coords.append(Vec3(pos[0], pos[1], pos[2]))
             self._positions.append(coords*nanometers)
-        ## The atom positions read from the PDB file.  If the file contains multiple frames, these are the positions in the first frame.
-        self.positions = self._positions[0]
-        self.topology.setPeriodicBoxVectors(pdb.get_periodic_box_vectors())
-        self.topology.createStandardBonds()
-        self.topology.createDisulfideBonds(self.positions)
-        self._numpyPositions = None
+        self._positionArray = None
+        return atomByNumber, pdb.models[-1].connects, pdb.get_periodic_box_vectors()
 
-        # Add bonds based on CONECT records. Bonds between metals of elements specified in metalElements and residues in standardResidues are not added.
+    def _loadFixedColumns(self, lines, extraParticleIdentifier):
+        """Build the Topology and positions by reading the fixed columns of the ATOM and HETATM records directly.
 
-        connectBonds = []
-        for connect in pdb.models[-1].connects:
-            i = connect[0]
-            for j in connect[1:]:
-                if i in atomByNumber and j in atomByNumber:    
-                    if atomByNumber[i].element is not None and atomByNumber[j].element is not None:
-                        if atomByNumber[i].element.symbol not in metalElements and atomByNumber[j].element.symbol not in metalElements:
-                            connectBonds.append((atomByNumber[i], atomByNumber[j])) 
-                        elif atomByNumber[i].element.symbol in metalElements and atomByNumber[j].residue.name not in PDBFile._standardResidues:
-                            connectBonds.append((atomByNumber[i], atomByNumber[j])) 
-                        elif atomByNumber[j].element.symbol in metalElements and atomByNumber[i].residue.name not in PDBFile._standardResidues:
-                            connectBonds.append((atomByNumber[i], atomByNumber[j]))     
+        This is much faster than building a PdbStructure, but it only handles files without alternate locations,
+        duplicate atoms, or other irregularities, in which every model contains the same atoms.  If the file does
+        not satisfy these conditions, this returns None without modifying the Topology.  Otherwise it returns a
+        tuple (atomByNumber, connects, boxVectors).
+        """
+        # Split the file into models.  For each one, record the ATOM and HETATM records, the positions of
+        # TER records, and the contents of CONECT records.
+
+        models = []
+        model = None
+        boxVectors = None
+        for line in lines:
+            record = line[:6]
+            if record == 'ATOM  ' or record == 'HETATM':
+                if model is None:
+                    model = ([], [], [])
+                    models.append(model)
+                model[0].append(line)
+            elif record == 'CONECT':
+                if model is None:
+                    return None
+                model[2].append(_parse_connect_record(line))
+            elif line[:5] == 'MODEL':
+                model = ([], [], [])
+                models.append(model)
+            elif line[:3] == 'END':
+                if model is None:
+                    return None
+            elif line[:3] == 'TER' and line.split()[0] == 'TER':
+                if model is None or len(model[0]) == 0:
+                    return None
+                model[1].append(len(model[0]))
+            elif record == 'CRYST1':
+                vectors = _parse_cryst1_record(line)
+                if vectors is not None:
+                    boxVectors = vectors
+        if len(models) == 0:
+            return None
+        atomLines, terIndices, _ = models[0]
+        numAtoms = len(atomLines)
+        identifiers = [line[12:27] for line in atomLines]
+        for atoms, ters, _ in models[1:]:
+            if len(atoms) != numAtoms or ters != terIndices or [line[12:27] for line in atoms] != identifiers:
+                return None
+
+        # Read the positions for all models at once by parsing the coordinate columns as 8 character fields.
+
+        columns = ''.join([line[30:54] for atoms, _, _ in models for line in atoms]).encode('utf-8')
+        if len(columns) != 24*numAtoms*len(models):
+            return None
+        try:
+            positions = numpy.frombuffer(columns, dtype='S8').astype(numpy.float64).reshape((len(models), numAtoms, 3))*0.1
+        except ValueError:
+            return None
+
+        # Identify the chains and residues in the first model.
+
+        residues = []
+        chainStart = set(terIndices)
+        chainStart.add(0)
+        residueNumbers = {}
+        lastIdentifier = None
+        for i, line in enumerate(atomLines):
+            if len(line) < 54 or line[16] != ' ':
+                return None
+            identifier = line[17:27]
+            if identifier == lastIdentifier and i not in chainStart:
+                continue
+            lastIdentifier = identifier
+            resName = line[17:20]
+            if line[20] != ' ':
+                if len(resName.strip()) != 3:
+                    return None
+                resName += line[20]
+            number = line[22:26]
+            if number in residueNumbers:
+                number = residueNumbers[number]
+            else:
+                try:
+                    residueNumbers[number] = int(number)
+                except ValueError:
+                    try:
+                        residueNumbers[number] = int(number, 16) - 0xA000 + 10000
+                    except ValueError:
+                        return None
+                number = residueNumbers[number]
+            chainId = line[21]
+            insertionCode = line[26]
+            if i in chainStart or chainId != residues[-1][1]:
+                residues.append((i, chainId, resName, number, insertionCode, True))
+            elif number != residues[-1][3] or insertionCode != residues[-1][4]:
+                residues.append((i, chainId, resName, number, insertionCode, False))
+            elif resName != residues[-1][2]:
+                return None
+        atomNames = [line[12:16].strip() for line in atomLines]
+        residueEnds = [r[0] for r in residues[1:]] + [numAtoms]
+        for residue, end in zip(residues, residueEnds):
+            if len(set(atomNames[residue[0]:end])) != end-residue[0]:
+                return None
+
+        # Build the Topology.
+
+        top = self.topology
+        atomByNumber = {}
+        elements = {}
+        formalCharges = {}
+        nextSerialNumber = 1
+        for (start, chainId, resName, number, insertionCode, newChain), end in zip(residues, residueEnds):
+            if newChain:
+                c = top.addChain(chainId)
+            resName = resName.strip()
+            if resName in PDBFile._residueNameReplacements:
+                resName = PDBFile._residueNameReplacements[resName]
+            r = top.addResidue(resName, c, str(number), insertionCode)
+            if resName in PDBFile._atomNameReplacements:
+                atomReplacements = PDBFile._atomNameReplacements[resName]
+            else:
+                atomReplacements = {}
+            residueAtomNames = atomNames[start:end]
+            for i in range(start, end):
+                line = atomLines[i]
+                atomName = atomNames[i]
+                if atomName in atomReplacements:
+                    atomName = atomReplacements[atomName].strip()
+                symbol = line[76:78]
+                if symbol not in elements:
+                    if symbol.strip() == extraParticleIdentifier:
+                        elements[symbol] = 'EP'
                     else:
-                        connectBonds.append((atomByNumber[i], atomByNumber[j]))         
-        if len(connectBonds) > 0:
-            # Only add bonds that don't already exist.
-            existingBonds = set(top.bonds())
-            for bond in connectBonds:
-                if bond not in existingBonds and (bond[1], bond[0]) not in existingBonds:
-                    top.addBond(bond[0], bond[1])
-                    existingBonds.add(bond)
+                        try:
+                            elements[symbol] = elem.get_by_symbol(symbol.strip())
+                        except KeyError:
+                            elements[symbol] = None
+                element = elements[symbol]
+                if element == 'EP':
+                    element = None
+                elif element is None:
+                    element = PDBFile._guessElement(atomName, len(residueAtomNames), residueAtomNames)
+                charge = line[78:80]
+                if charge not in formalCharges:
+                    formalCharge = charge
+                    if formalCharge.endswith('+') or formalCharge.endswith('-'):
+                        formalCharge = formalCharge[::-1]
+                    try:
+                        formalCharges[charge] = int(formalCharge)
+                    except ValueError:
+                        formalCharges[charge] = None
+                serialNumber = line[6:11].strip()
+                try:
+                    if serialNumber.isdigit():
+                        serialNumber = int(serialNumber)
+                    elif serialNumber.isalnum():
+                        serialNumber = int(serialNumber, 16) - 0xA0000 + 100000
+                    else:
+                        serialNumber = _parse_atom_index(serialNumber)
+                except ValueError:
+                    serialNumber = nextSerialNumber
+                nextSerialNumber = serialNumber+1
+                newAtom = top.addAtom(atomName, element, r, str(serialNumber), formalCharge=formalCharges[charge])
+                atomByNumber[serialNumber] = newAtom
+
+        self._positionArray = positions
+        self._positions = [None]*len(models)
+        self._positions[0] = arrayToVec3List(self._positionArray[0])*nanometers
+        return atomByNumber, models[-1][2], boxVectors
 
     def getTopology(self):
         """Get the Topology of the model."""
@@ -221,10 +384,44 @@ class PDBFile(object):
             if self._numpyPositions is None:
                 self._numpyPositions = [None]*len(self._positions)
             if self._numpyPositions[frame] is None:
-                self._numpyPositions[frame] = Quantity(numpy.array(self._positions[frame].value_in_unit(nanometers)), nanometers)
+                if self._positionArray is not None:
+                    self._numpyPositions[frame] = Quantity(self._positionArray[frame].copy(), nanometers)
+                else:
+                    self._numpyPositions[frame] = Quantity(numpy.array(self._positions[frame].value_in_unit(nanometers)), nanometers)
             return self._numpyPositions[frame]
+        if self._positions[frame] is None:
+            self._positions[frame] = arrayToVec3List(self._positionArray[frame])*nanometers
         return self._positions[frame]
 
+    @staticmethod
+    def _guessElement(atomName, residueSize, residueAtomNames):
+        """Try to guess the element of an atom whose element is not specified in the file."""
+        upper = atomName.upper()
+        while len(upper) > 1 and upper[0].isdigit():
+            upper = upper[1:]
+        if upper.startswith('CL'):
+            return elem.chlorine
+        elif upper.startswith('NA'):
+            return elem.sodium
+        elif upper.startswith('MG'):
+            return elem.magnesium
+        elif upper.startswith('BE'):
+            return elem.beryllium
+        elif upper.startswith('LI'):
+            return elem.lithium
+        elif upper.startswith('K'):
+            return elem.potassium
+        elif upper.startswith('ZN'):
+            return elem.zinc
+        elif residueSize == 1 and upper.startswith('CA'):
+            return elem.calcium
+        elif upper.startswith('D') and any(name == atomName[1:] for name in residueAtomNames):
+            return None # A Drude particle
+        try:
+            return elem.get_by_symbol(upper[0])
+        except KeyError:
+            return None
+
     @staticmethod
     def _loadNameReplacementTables():
         """Load the list of atom and residue name replacements."""
@@ -339,22 +536,22 @@ class PDBFile(object):
             String to write in the element column of the ATOM records for atoms whose element is None (extra particles)
         """
 
-        if len(list(topology.atoms())) != len(positions):
-            raise ValueError('The number of positions must match the number of atoms')
-        if is_quantity(positions):
-            positions = positions.value_in_unit(angstroms)
-        import numpy as np
-        positions = np.asarray(positions)
-        if np.isnan(positions).any():
-            raise ValueError('Particle position is NaN.  For more information, see https://github.com/openmm/openmm/wiki/Frequently-Asked-Questions#nan')
-        if np.isinf(positions).any():
-            raise ValueError('Particle position is infinite.  For more information, see https://github.com/openmm/openmm/wiki/Frequently-Asked-Questions#nan')
+        template = PDBFile._createModelTemplate(topology, keepIds, extraParticleIdentifier)
+        PDBFile._writeModelWithTemplate(template, positions, file, modelIndex)
+
+    @staticmethod
+    def _createModelTemplate(topology, keepIds=False, extraParticleIdentifier='EP'):
+        """Create a template for writing models with _writeModelWithTemplate().
+
+        The template holds the text of every ATOM, HETATM, and TER record with the coordinates left out, so
+        writing a model only requires formatting the coordinates.  A template can be reused for any number
+        of models, but it must be recreated if the Topology is modified.
+        """
         nonHeterogens = PDBFile._standardResidues[:]
         nonHeterogens.remove('HOH')
         atomIndex = 1
-        posIndex = 0
-        if modelIndex is not None:
-            print("MODEL     %4d" % modelIndex, file=file)
+        parts = []
+        text = ''
         for (chainIndex, chain) in enumerate(topology.chains()):
             if keepIds and len(chain.id) == 1:
                 chainName = chain.id
@@ -389,24 +586,50 @@ class PDBFile(object):
                         atomName = atom.name[:4]
                     else:
                         atomName = atom.name
-                    coords = positions[posIndex]
                     if atom.formalCharge is not None:
                         formalCharge = ("%+2d" % atom.formalCharge)[::-1]
                     else:
                         formalCharge = '  '
-                    line = "%s%5s %-4s %3s %s%4s%1s   %s%s%s  1.00  0.00          %2s%2s" % (
-                        recordName, _formatIndex(atomIndex, 5), atomName, resName, chainName, resId, resIC, _format_83(coords[0]),
-                        _format_83(coords[1]), _format_83(coords[2]), symbol, formalCharge)
-                    if len(line) != 80:
+                    prefix = "%s%5s %-4s %3s %s%4s%1s   " % (recordName, _formatIndex(atomIndex, 5), atomName, resName, chainName, resId, resIC)
+                    suffix = "  1.00  0.00          %2s%2s" % (symbol, formalCharge)
+                    if len(prefix)+len(suffix) != 56:
                         raise ValueError('Fixed width overflow detected')
-                    print(line, file=file)
-                    posIndex += 1
+                    parts.append(text+prefix)
+                    text = suffix+'\n'
                     atomIndex += 1
                 if resIndex == len(residues)-1:
-                    print("TER   %5s      %3s %s%4s" % (_formatIndex(atomIndex, 5), resName, chainName, resId), file=file)
+                    text += "TER   %5s      %3s %s%4s\n" % (_formatIndex(atomIndex, 5), resName, chainName, resId)
                     atomIndex += 1
+        parts.append(text)
+        parts = [part.replace('%', '%%') for part in parts]
+        return (len(parts)-1, parts, '%8.3f%8.3f%8.3f'.join(parts))
+
+    @staticmethod
+    def _writeModelWithTemplate(template, positions, file=sys.stdout, modelIndex=None):
+        """Write out a model to a PDB file, using a template created by _createModelTemplate()."""
+        numAtoms, parts, format = template
+        coords = PDBFile._getModelPositions(positions, numAtoms).ravel()
+        if numpy.all((coords > -999.999) & (coords < 9999.999)):
+            text = format % tuple(coords.tolist())
+        else:
+            text = '%s%s%s'.join(parts) % tuple(_format_83(f) for f in coords.tolist())
         if modelIndex is not None:
-            print("ENDMDL", file=file)
+            text = "MODEL     %4d\n%sENDMDL\n" % (modelIndex, text)
+        file.write(text)
+
+    @staticmethod
+    def _getModelPositions(positions, numAtoms):
+        """Convert the positions of a model to an array in Angstroms, checking that they are valid."""
+        if len(positions) != numAtoms:
+            raise ValueError('The number of positions must match the number of atoms')
+        if is_quantity(positions):
+            positions = positions.value_in_unit(angstroms)
+        positions = vec3ListToArray(positions)
+        if numpy.isnan(positions).any():
+            raise ValueError('Particle position is NaN.  For more information, see https://github.com/openmm/openmm/wiki/Frequently-Asked-Questions#nan')
+        if numpy.isinf(positions).any():
+            raise ValueError('Particle position is infinite.  For more information, see https://github.com/openmm/openmm/wiki/Frequently-Asked-Questions#nan')
+        return positions
 
     @staticmethod
     def writeFooter(topology, file=sys.stdout):
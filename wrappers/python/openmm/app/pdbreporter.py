@@ -65,6 +65,7 @@ class PDBReporter(object):
         self._nextModel = 0
         self._atomSubset = atomSubset
         self._subsetTopology = None
+        self._modelTemplate = None
 
 
     def describeNextReport(self, simulation):
@@ -81,7 +82,7 @@ class PDBReporter(object):
             A dictionary describing the required information for the next report
         """
         steps = self._reportInterval - simulation.currentStep%self._reportInterval
-        return {'steps':steps, 'periodic':self._enforcePeriodicBox, 'include':['positions']}
+        return {'steps':steps, 'periodic':self._enforcePeriodicBox, 'include':['positions'], 'asynchronous':True}
 
     def report(self, simulation, state):
         """Generate a report.
@@ -100,8 +101,7 @@ class PDBReporter(object):
             topology = self._subsetTopology
 
             #PDBFile will convert to angstroms so do it here first instead
-            positions = state.getPositions(asNumpy=True).value_in_unit(angstroms)
-            positions = [positions[i] for i in self._atomSubset]
+            positions = state.getPositions(asNumpy=True).value_in_unit(angstroms)[self._atomSubset]
 
         else:
             topology = simulation.topology
@@ -111,7 +111,9 @@ class PDBReporter(object):
             PDBFile.writeHeader(topology, self._out)
             self._topology = topology
             self._nextModel += 1
-        PDBFile.writeModel(topology, positions, self._out, self._nextModel)
+        if self._modelTemplate is None:
+            self._modelTemplate = PDBFile._createModelTemplate(topology)
+        PDBFile._writeModelWithTemplate(self._modelTemplate, positions, self._out, self._nextModel)
         self._nextModel += 1
         if hasattr(self._out, 'flush') and callable(self._out.flush):
             self._out.flush()
@@ -198,8 +200,7 @@ class PDBxReporter(PDBReporter):
             topology = self._subsetTopology
 
             #PDBFile will convert to angstroms so do it here first instead
-            positions = state.getPositions(asNumpy=True).value_in_unit(angstroms)
-            positions = [positions[i] for i in self._atomSubset]
+            positions = state.getPositions(asNumpy=True).value_in_unit(angstroms)[self._atomSubset]
 
         else:
             topology = simulation.topology
@@ -208,7 +209,9 @@ class PDBxReporter(PDBReporter):
         if self._nextModel == 0:
             PDBxFile.writeHeader(topology, self._out)
             self._nextModel += 1
-        PDBxFile.writeModel(topology, positions, self._out, self._nextModel)
+        if self._modelTemplate is None:
+            self._modelTemplate = PDBxFile._createModelTemplate(topology)
+        PDBxFile._writeModelWithTemplate(self._modelTemplate, positions, self._out, self._nextModel)
         self._nextModel += 1
         if hasattr(self._out, 'flush') and callable(self._out.flush):
             self._out.flush()
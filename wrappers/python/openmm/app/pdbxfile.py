@@ -33,11 +33,12 @@ from __future__ import division, absolute_import, print_function
 __author__ = "Peter Eastman"
 __version__ = "2.0"
 
-from openmm import Vec3, Platform
+from openmm import Platform
+from openmm.vec3 import arrayToVec3List
 from openmm.app.internal.pdbx.reader.PdbxReader import PdbxReader
 from openmm.app.internal.unitcell import computePeriodicBoxVectors, computeLengthsAndAngles
 from openmm.app import topology, Topology, PDBFile
-from openmm.unit import nanometers, angstroms, is_quantity, Quantity
+from openmm.unit import nanometers, Quantity
 from . import element as elem
 import sys
 import math
@@ -66,7 +67,6 @@ class PDBxFile(object):
         top = Topology()
         ## The Topology read from the PDBx/mmCIF file
         self.topology = top
-        self._positions = []
         PDBFile._loadNameReplacementTables()
 
         # Load the file.
@@ -78,7 +78,7 @@ class PDBxFile(object):
             ownHandle = True
         reader = PdbxReader(inputFile)
         data = []
-        reader.read(data)
+        reader.read(data, selectList=['atom_site', 'cell', 'struct_conn', 'chem_comp_bond'])
         if ownHandle:
             inputFile.close()
         block = data[0]
@@ -124,14 +124,15 @@ class PDBxFile(object):
         atomTable = {}
         atomsInResidue = set()
         models = []
+        modelRows = []
         for row in atomData.getRowList():
             atomKey = ((row[resIdCol], row[chainIdCol], row[atomNameCol]))
             model = ('1' if modelCol == -1 else row[modelCol])
             if model not in models:
                 models.append(model)
-                self._positions.append([])
+                modelRows.append([])
             modelIndex = models.index(model)
-            if row[altIdCol] != '.' and atomKey in atomTable and len(self._positions[modelIndex]) > atomTable[atomKey].index:
+            if row[altIdCol] != '.' and atomKey in atomTable and len(modelRows[modelIndex]) > atomTable[atomKey].index:
                 # This row is an alternate position for an existing atom, so ignore it.
 
                 continue
@@ -184,11 +185,18 @@ class PDBxFile(object):
                     atom = atomTable[atomKey]
                 except KeyError:
                     raise ValueError('Unknown atom %s in residue %s %s for model %s' % (row[atomNameCol], row[resNameCol], row[resNumCol], model))
-                if atom.index != len(self._positions[modelIndex]):
+                if atom.index != len(modelRows[modelIndex]):
                     raise ValueError('Atom %s for model %s does not match the order of atoms for model %s' % (row[atomIdCol], model, models[0]))
-            self._positions[modelIndex].append(Vec3(float(row[xCol]), float(row[yCol]), float(row[zCol]))*0.1)
-        for i in range(len(self._positions)):
-            self._positions[i] = self._positions[i]*nanometers
+            modelRows[modelIndex].append(row)
+
+        # Convert the coordinates of all models at once.  The lists of Vec3s are only built when requested.
+
+        self._positionArray = []
+        for rows in modelRows:
+            coords = [row[col] for row in rows for col in (xCol, yCol, zCol)]
+            self._positionArray.append(numpy.array(coords, dtype=numpy.float64).reshape((-1, 3))*0.1)
+        self._positions = [None]*len(modelRows)
+        self._positions[0] = arrayToVec3List(self._positionArray[0])*nanometers
         ## The atom positions read from the PDBx/mmCIF file.  If the file contains multiple frames, these are the positions in the first frame.
         self.positions = self._positions[0]
         self._numpyPositions = None
@@ -291,8 +299,10 @@ class PDBxFile(object):
             if self._numpyPositions is None:
                 self._numpyPositions = [None]*len(self._positions)
             if self._numpyPositions[frame] is None:
-                self._numpyPositions[frame] = Quantity(numpy.array(self._positions[frame].value_in_unit(nanometers)), nanometers)
+                self._numpyPositions[frame] = Quantity(self._positionArray[frame].copy(), nanometers)
             return self._numpyPositions[frame]
+        if self._positions[frame] is None:
+            self._positions[frame] = arrayToVec3List(self._positionArray[frame])*nanometers
         return self._positions[frame]
 
     @staticmethod
@@ -454,20 +464,21 @@ class PDBxFile(object):
             make sure these are valid IDs that satisfy the requirements of the
             PDBx/mmCIF format.  Otherwise, the output file will be invalid.
         """
-        if len(list(topology.atoms())) != len(positions):
-            raise ValueError('The number of positions must match the number of atoms')
-        if is_quantity(positions):
-            positions = positions.value_in_unit(angstroms)
-        import numpy as np
-        positions = np.asarray(positions)
-        if np.isnan(positions).any():
-            raise ValueError('Particle position is NaN.  For more information, see https://github.com/openmm/openmm/wiki/Frequently-Asked-Questions#nan')
-        if np.isinf(positions).any():
-            raise ValueError('Particle position is infinite.  For more information, see https://github.com/openmm/openmm/wiki/Frequently-Asked-Questions#nan')
+        template = PDBxFile._createModelTemplate(topology, keepIds)
+        PDBxFile._writeModelWithTemplate(template, positions, file, modelIndex)
+
+    @staticmethod
+    def _createModelTemplate(topology, keepIds=False):
+        """Create a template for writing models with _writeModelWithTemplate().
+
+        The template holds the text of every atom_site row with the coordinates and model number left out, so
+        writing a model only requires formatting those values.  A template can be reused for any number of
+        models, but it must be recreated if the Topology is modified.
+        """
         nonHeterogens = PDBFile._standardResidues[:]
         nonHeterogens.remove('HOH')
         atomIndex = 1
-        posIndex = 0
+        lines = []
         for (chainIndex, chain) in enumerate(topology.chains()):
             if keepIds:
                 chainName = chain.id
@@ -486,13 +497,21 @@ class PDBxFile(object):
                 else:
                     recordName = "HETATM"
                 for atom in res.atoms():
-                    coords = positions[posIndex]
                     if atom.element is not None:
                         symbol = atom.element.symbol
                     else:
                         symbol = '?'
-                    line = "%s  %5d %-3s %-4s . %-4s %s ? %5s %s %10.4f %10.4f %10.4f  0.0  0.0  ?  ?  ?  ?  ?  .  %5s %4s %s %4s %5d"
-                    print(line % (recordName, atomIndex, symbol, atom.name, res.name, chainName, resId, resIC, coords[0], coords[1], coords[2],
-                                  resId, res.name, chainName, atom.name, modelIndex), file=file)
-                    posIndex += 1
+                    prefix = "%s  %5d %-3s %-4s . %-4s %s ? %5s %s " % (recordName, atomIndex, symbol, atom.name, res.name, chainName, resId, resIC)
+                    suffix = "  0.0  0.0  ?  ?  ?  ?  ?  .  %5s %4s %s %4s " % (resId, res.name, chainName, atom.name)
+                    lines.append(prefix.replace('%', '%%')+'%10.4f %10.4f %10.4f'+suffix.replace('%', '%%')+'%5d\n')
                     atomIndex += 1
+        return (len(lines), ''.join(lines))
+
+    @staticmethod
+    def _writeModelWithTemplate(template, positions, file=sys.stdout, modelIndex=1):
+        """Write out a model to a PDBx/mmCIF file, using a template created by _createModelTemplate()."""
+        numAtoms, format = template
+        values = numpy.empty((numAtoms, 4))
+        values[:,:3] = PDBFile._getModelPositions(positions, numAtoms)
+        values[:,3] = modelIndex
+        file.write(format % tuple(values.ravel().tolist()))
@@ -35,7 +35,11 @@ __version__ = "1.0"
 import openmm as mm
 import openmm.unit as unit
 from openmm.app.internal import safesave
+import queue
 import sys
+import threading
+import time
+import weakref
 from datetime import datetime, timedelta
 try:
     string_types = (unicode, str)
@@ -55,9 +59,18 @@ class Simulation(object):
     it every 1000 time steps:
 
     simulation.reporters.append(PDBReporter('output.pdb', 1000))
+
+    Reporters normally run on the same thread as the simulation, so the simulation is paused while they
+    write their output.  If asyncReporting is enabled, reporters that support it (by including
+    'asynchronous':True in the dict returned by describeNextReport()) are instead run on a background
+    thread while the simulation continues.  All pending reports are completed before step() or
+    runForClockTime() returns, and before a checkpoint or state is saved.
+
+    Reporters that buffer their output may define a flush() method.  It is called before a checkpoint
+    or state is saved, so the output files are consistent with it.
     """
 
-    def __init__(self, topology, system, integrator, platform=None, platformProperties=None, state=None):
+    def __init__(self, topology, system, integrator, platform=None, platformProperties=None, state=None, asyncReporting=False, reportQueueSize=4):
         """Create a Simulation.
 
         Parameters
@@ -80,6 +93,13 @@ class Simulation(object):
             The name of an XML file containing a serialized State. If not None,
             the information stored in state will be transferred to the generated
             Simulation object.
+        asyncReporting : bool=False
+            If true, reporters that support it are run on a background thread
+            so they do not delay the simulation.
+        reportQueueSize : int=4
+            The maximum number of reports that may be waiting to be processed by
+            the background thread when asyncReporting is enabled.  Once the limit
+            is reached, the simulation waits for the reporters to catch up.
         """
         self.topology = topology
         ## The System being simulated
@@ -96,6 +116,10 @@ class Simulation(object):
             self.integrator = integrator
         ## A list of reporters to invoke during the simulation
         self.reporters = []
+        self._asyncReporting = asyncReporting
+        self._reportQueue = queue.Queue(reportQueueSize)
+        self._reportThread = None
+        self._reportError = None
         if platform is None:
             if platformProperties is not None:
                 raise ValueError('Cannot specify platform-specific properties, because the Platform is not specified')
@@ -197,6 +221,17 @@ class Simulation(object):
                 self.saveState(stateFile)
 
     def _simulate(self, endStep=None, endTime=None):
+        try:
+            self._runSteps(endStep, endTime)
+        except BaseException as e:
+            # Wait for the queued reports, but do not let an error in a reporter replace the original exception.
+            reportError = self._waitForReports()
+            if reportError is not None and e.__context__ is None:
+                e.__context__ = reportError
+            raise
+        self._flushReports()
+
+    def _runSteps(self, endStep, endTime):
         if endStep is None:
             endStep = sys.maxsize
         nextReport = [None]*len(self.reporters)
@@ -280,7 +315,48 @@ class Simulation(object):
 
         state = self.context.getState(groups=self.context.getIntegrator().getIntegrationForceGroups(), enforcePeriodicBox=periodic, parameters=True, **includeArgs)
         for reporter, nextReport in reports:
-            reporter.report(self, state)
+            if self._asyncReporting and nextReport.get('asynchronous', False):
+                self._queueReport(reporter, state)
+            else:
+                reporter.report(self, state)
+
+    def _queueReport(self, reporter, state):
+        """Add a report to the queue processed by the background thread, waiting if the queue is full."""
+        self._checkReportError()
+        if self._reportThread is None:
+            # The thread is kept running until the Simulation is deleted, so it only needs to be started once.
+            self._reportThread = threading.Thread(target=_processQueuedReports, args=(self._reportQueue, weakref.ref(self)), daemon=True)
+            self._reportThread.start()
+            weakref.finalize(self, self._reportQueue.put, None)
+        self._reportQueue.put((reporter, _SimulationSnapshot(self, self.currentStep), state))
+
+    def _waitForReports(self):
+        """Wait until all queued reports have been generated.  This returns the exception thrown by a reporter
+        running on the background thread, or None if there was no error."""
+        self._reportQueue.join()
+        error = self._reportError
+        self._reportError = None
+        return error
+
+    def _flushReports(self):
+        """Wait until all queued reports have been generated, and raise any exception thrown by a reporter."""
+        error = self._waitForReports()
+        if error is not None:
+            raise error
+
+    def _flushReporterOutput(self):
+        """Call flush() on every reporter that defines it, so any output they have buffered is written."""
+        for reporter in self.reporters:
+            flush = getattr(reporter, 'flush', None)
+            if flush is not None:
+                flush()
+
+    def _checkReportError(self):
+        """If a reporter running on the background thread threw an exception, raise it on this thread."""
+        if self._reportError is not None:
+            error = self._reportError
+            self._reportError = None
+            raise error
 
     def saveCheckpoint(self, file):
         """Save a checkpoint of the simulation to a file.
@@ -300,6 +376,8 @@ class Simulation(object):
             a File-like object to write the checkpoint to, or alternatively a
             filename
         """
+        self._flushReports()
+        self._flushReporterOutput()
         if isinstance(file, str):
             safesave.save(self.context.createCheckpoint(), file)
         else:
@@ -338,6 +416,8 @@ class Simulation(object):
             a File-like object to write the state to, or alternatively a
             filename
         """
+        self._flushReports()
+        self._flushReporterOutput()
         state = self.context.getState(positions=True, velocities=True, parameters=True, integratorParameters=True)
         xml = mm.XmlSerializer.serialize(state)
         if isinstance(file, str):
@@ -360,3 +440,39 @@ class Simulation(object):
         else:
             xml = file.read()
         self.context.setState(mm.XmlSerializer.deserialize(xml))
+
+
+def _processQueuedReports(reportQueue, simulationRef):
+    """This is run on the background thread to generate queued reports, until it receives None from the queue.
+    It holds only a weak reference to the Simulation, so it does not keep the Simulation alive.  None is added
+    to the queue when the Simulation is deleted."""
+    while True:
+        item = reportQueue.get()
+        if item is None:
+            reportQueue.task_done()
+            return
+        reporter, snapshot, state = item
+        del item
+        simulation = simulationRef()
+        if simulation is not None and simulation._reportError is None:
+            try:
+                reporter.report(snapshot, state)
+            except BaseException as e:
+                # Keep the thread running, so waiting for the queue cannot hang.  The error is raised on the main thread.
+                simulation._reportError = e
+        del reporter, snapshot, state, simulation
+        reportQueue.task_done()
+
+
+class _SimulationSnapshot(object):
+    """This is passed to reporters that run on the background thread in place of the Simulation.  It behaves
+    like the Simulation, except that currentStep is the step at which the report's State was created.  It also
+    records the clock time at which that happened, so reporters can measure the speed of the simulation."""
+
+    def __init__(self, simulation, currentStep):
+        self._simulation = simulation
+        self.currentStep = currentStep
+        self._clockTime = time.time()
+
+    def __getattr__(self, name):
+        return getattr(self._simulation, name)
@@ -174,7 +174,9 @@ class StateDataReporter(object):
             A dictionary describing the required information for the next report
         """
         steps = self._reportInterval - simulation.currentStep%self._reportInterval
-        return {'steps':steps, 'periodic':None, 'include':self._includes}
+        # Computing the temperature may require querying the Context, so it cannot be done asynchronously.
+        asynchronous = not (self._temperature and hasattr(simulation.context.getIntegrator(), 'computeSystemTemperature'))
+        return {'steps':steps, 'periodic':None, 'include':self._includes, 'asynchronous':asynchronous}
 
     def report(self, simulation, state):
         """Generate a report.
@@ -195,7 +197,7 @@ class StateDataReporter(object):
                 self._out.flush()
             except AttributeError:
                 pass
-            self._initialClockTime = time.time()
+            self._initialClockTime = self._getClockTime(simulation)
             self._initialSimulationTime = state.getTime()
             self._initialSteps = simulation.currentStep
             self._hasInitialized = True
@@ -232,7 +234,7 @@ class StateDataReporter(object):
         values = []
         box = state.getPeriodicBoxVectors()
         volume = box[0][0]*box[1][1]*box[2][2]
-        clockTime = time.time()
+        clockTime = self._getClockTime(simulation)
         if self._progress:
             values.append('%.1f%%' % (100.0*simulation.currentStep/self._totalSteps))
         if self._step:
@@ -263,7 +265,7 @@ class StateDataReporter(object):
             else:
                 values.append('--')
         if self._elapsedTime:
-            values.append(time.time() - self._initialClockTime)
+            values.append(clockTime - self._initialClockTime)
         if self._remainingTime:
             elapsedSeconds = clockTime-self._initialClockTime
             elapsedSteps = simulation.currentStep-self._initialSteps
@@ -289,6 +291,14 @@ class StateDataReporter(object):
             values.append(value)
         return values
 
+    def _getClockTime(self, simulation):
+        """Get the clock time at which the State being reported was created.  When the report is generated on a
+        background thread, this is recorded by the Simulation when it queues the report."""
+        clockTime = getattr(simulation, '_clockTime', None)
+        if clockTime is None:
+            clockTime = time.time()
+        return clockTime
+
     def _initializeConstants(self, simulation):
         """Initialize a set of constants required for the reports
 
@@ -33,6 +33,7 @@ __author__ = "Peter Eastman"
 __version__ = "1.0"
 
 from collections import namedtuple
+import numpy as np
 import os
 import xml.etree.ElementTree as etree
 from openmm.vec3 import Vec3
@@ -87,6 +88,7 @@ class Topology(object):
         self._numResidues = 0
         self._numAtoms = 0
         self._bonds = []
+        self._bondArray = None
         self._periodicBoxVectors = None
 
     def __repr__(self):
@@ -212,6 +214,7 @@ class Topology(object):
             The bond order, or None if it is not specified
         """
         self._bonds.append(Bond(atom1, atom2, type, order))
+        self._bondArray = None
 
     def chains(self):
         """Iterate over all Chains in the Topology."""
@@ -236,6 +239,45 @@ class Topology(object):
         """
         return iter(self._bonds)
 
+    def atomArrays(self):
+        """Get arrays describing all the atoms in the Topology.
+
+        This is much faster than iterating over atoms() when working with large systems.  The arrays are a snapshot
+        of the current state of the Topology, and are not updated if it is modified later.
+
+        Returns
+        -------
+        AtomArrays
+            a named tuple with the fields element (the atomic number of each atom, or 0 if it has no element),
+            residueIndex (the index of the Residue containing each atom), chainIndex (the index of the Chain
+            containing each atom), nameIndex (the position of each atom's name in names), and names (a list of
+            the distinct atom names)
+        """
+        residues = list(self.residues())
+        atoms = [atom for residue in residues for atom in residue._atoms]
+        residueSize = [len(residue._atoms) for residue in residues]
+        chainSize = [sum(len(residue._atoms) for residue in chain._residues) for chain in self._chains]
+        nameIds = {}
+        nameIndex = np.array([nameIds.setdefault(atom.name, len(nameIds)) for atom in atoms], dtype=np.int32)
+        element = np.array([0 if atom.element is None else atom.element.atomic_number for atom in atoms], dtype=np.int32)
+        residueIndex = np.repeat(np.array([residue.index for residue in residues], dtype=np.int32), residueSize)
+        chainIndex = np.repeat(np.array([chain.index for chain in self._chains], dtype=np.int32), chainSize)
+        return AtomArrays(element, residueIndex, chainIndex, nameIndex, list(nameIds))
+
+    def bondArray(self):
+        """Get an array containing the indices of the atoms connected by every bond in the Topology.
+
+        Returns
+        -------
+        numpy.ndarray
+            an array of shape (number of bonds, 2).  Element [i, j] is the index of atom j of bond i.  The array
+            is shared between calls, so it should not be modified.
+        """
+        if getattr(self, '_bondArray', None) is None:
+            self._bondArray = np.array([(bond[0].index, bond[1].index) for bond in self._bonds], dtype=np.int64).reshape((-1, 2))
+            self._bondArray.flags.writeable = False
+        return self._bondArray
+
     def getPeriodicBoxVectors(self):
         """Get the vectors defining the periodic box.
 
@@ -444,15 +486,28 @@ class Residue(object):
 
     def bonds(self):
         """Iterate over all Bonds involving any atom in this residue."""
-        return ( bond for bond in self.chain.topology.bonds() if ((bond[0] in self._atoms) or (bond[1] in self._atoms)) )
+        inResidue = self._bondsInResidue()
+        return self._selectBonds(inResidue[:,0] | inResidue[:,1])
 
     def internal_bonds(self):
         """Iterate over all internal Bonds."""
-        return ( bond for bond in self.chain.topology.bonds() if ((bond[0] in self._atoms) and (bond[1] in self._atoms)) )
+        inResidue = self._bondsInResidue()
+        return self._selectBonds(inResidue[:,0] & inResidue[:,1])
 
     def external_bonds(self):
         """Iterate over all Bonds to external atoms."""
-        return ( bond for bond in self.chain.topology.bonds() if ((bond[0] in self._atoms) != (bond[1] in self._atoms)) )
+        inResidue = self._bondsInResidue()
+        return self._selectBonds(inResidue[:,0] != inResidue[:,1])
+
+    def _bondsInResidue(self):
+        """Find which atoms of each bond in the Topology belong to this residue.  Atoms may be added to residues
+        in any order, so this tests membership in the set of the residue's atom indices."""
+        bonds = self.chain.topology.bondArray()
+        return np.isin(bonds, [atom.index for atom in self._atoms])
+
+    def _selectBonds(self, mask):
+        topologyBonds = self.chain.topology._bonds
+        return (topologyBonds[i] for i in np.flatnonzero(mask))
 
     def __len__(self):
         return len(self._atoms)
@@ -481,6 +536,10 @@ class Atom(object):
     def __repr__(self):
         return "<Atom %d (%s) of chain %d residue %d (%s)>" % (self.index, self.name, self.residue.chain.index, self.residue.index, self.residue.name)
 
+class AtomArrays(namedtuple('AtomArrays', ['element', 'residueIndex', 'chainIndex', 'nameIndex', 'names'])):
+    """An AtomArrays object holds arrays describing the atoms in a Topology.  It is returned by Topology.atomArrays()."""
+    __slots__ = ()
+
 class Bond(namedtuple('Bond', ['atom1', 'atom2'])):
     """A Bond object represents a bond between two Atoms within a Topology.
 
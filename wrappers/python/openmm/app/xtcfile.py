@@ -8,8 +8,11 @@ from openmm.app.internal.xtc_utils import (
     xtc_write_frame,
     get_xtc_nframes,
     get_xtc_natoms,
+    get_xtc_frame_offsets,
+    read_xtc_frames,
 )
 import os
+import struct
 from openmm import Vec3
 from openmm.unit import nanometers, picoseconds, is_quantity, norm
 import tempfile
@@ -20,8 +23,33 @@ class XTCFile(object):
 
     """XTCFile provides methods for creating XTC files.
     To use this class, create a XTCFile object, then call writeModel() once for each model in the file.
+    The byte offset of each frame is recorded in a small index file next to the trajectory (with the
+    extension .offsets added), so that appending to or reading an existing file does not require
+    scanning all of it.
+    To read an existing file, call XTCFile.read().  This returns a XTCTrajectory, which can read
+    individual frames or chunks of frames without loading the whole file into memory.
     """
 
+    @staticmethod
+    def read(fileName, saveIndex=True):
+        """Open an existing XTC file for reading.
+
+        Parameters
+        ----------
+        fileName : str
+            The name of the file to read
+        saveIndex : bool=True
+            If True, the index of frame offsets is saved to a file next to the
+            trajectory so it does not need to be rebuilt the next time the file
+            is opened.
+
+        Returns
+        -------
+        XTCTrajectory
+            An object providing access to the frames in the file
+        """
+        return XTCTrajectory(fileName, saveIndex)
+
     def __init__(self, fileName, topology, dt, firstStep=0, interval=1, append=False):
         """Create a XTC file, or open an existing file to append.
 
@@ -48,13 +76,18 @@ class XTCFile(object):
         self._firstStep = firstStep
         self._interval = interval
         self._modelCount = 0
+        self._indexFile = _getIndexFileName(fileName)
+        self._hasIndex = False
         if is_quantity(dt):
             dt = dt.value_in_unit(picoseconds)
         self._dt = dt
         if append:
             if not os.path.isfile(self._filename):
                 raise FileNotFoundError(f"The file '{self._filename}' does not exist.")
-            self._modelCount = get_xtc_nframes(self._filename.encode("utf-8"))
+            offsets, self._hasIndex = _loadFrameOffsets(self._filename)
+            self._modelCount = len(offsets) - 1
+            if not self._hasIndex:
+                self._indexFile = None
             natoms = get_xtc_natoms(self._filename.encode("utf-8"))
             if natoms != topology.getNumAtoms():
                 raise ValueError(
@@ -152,3 +185,215 @@ class XTCFile(object):
             np.float32(time),
             np.int32(step),
         )
+        self._updateIndex()
+
+    def _updateIndex(self):
+        """Record the end of the frame that was just written in the index file."""
+        if self._indexFile is None:
+            return
+        end = os.path.getsize(self._filename)
+        try:
+            if self._hasIndex:
+                with open(self._indexFile, "ab") as f:
+                    f.write(struct.pack("<q", end))
+            else:
+                # This is the first frame of a new file, so replace any index left over from an old one.
+                with open(self._indexFile, "wb") as f:
+                    f.write(struct.pack("<2q", 0, end))
+                self._hasIndex = True
+        except OSError:
+            # The index could not be written, so stop trying.  It will be rebuilt the next time it is needed.
+            self._indexFile = None
+
+
+def _getIndexFileName(fileName):
+    """Get the name of the file used to store the frame offsets for an XTC file."""
+    return fileName + ".offsets"
+
+
+def _loadFrameOffsets(fileName, saveIndex=True):
+    """Get the byte offsets of the frames in an XTC file.
+
+    The offsets are stored in a file next to the trajectory, as a list of little endian 64 bit integers.
+    If that file exists and is consistent with the trajectory, it is used and extended to cover any frames
+    that have been appended since it was written.  Otherwise the offsets are found by scanning the frame
+    headers.  The returned array has one more element than the number of frames: the offset just past the
+    end of the last frame.  This returns a tuple (offsets, saved), where saved indicates whether the index
+    file now matches the offsets.
+    """
+    import numpy as np
+
+    indexFile = _getIndexFileName(fileName)
+    fileSize = os.path.getsize(fileName)
+    offsets = None
+    if os.path.isfile(indexFile):
+        try:
+            with open(indexFile, "rb") as f:
+                data = f.read()
+            if len(data) > 0 and len(data) % 8 == 0:
+                offsets = np.frombuffer(data, dtype="<i8").astype(np.int64)
+        except OSError:
+            pass
+        if offsets is not None and not _isValidIndex(offsets, fileSize):
+            offsets = None
+    if offsets is not None:
+        # Rescan from the start of the last indexed frame.  This confirms that it really is a frame ending
+        # where the index says, and finds any frames appended after it, while reading only their headers.
+        try:
+            scanned = get_xtc_frame_offsets(fileName.encode("utf-8"), int(offsets[-2]))
+        except RuntimeError:
+            scanned = None
+        if scanned is None or len(scanned) < 2 or scanned[1] != offsets[-1]:
+            # The index does not match the trajectory, so it cannot be trusted.
+            offsets = None
+        else:
+            newOffsets = scanned[2:]
+            if len(newOffsets) == 0:
+                return offsets, True
+            offsets = np.concatenate([offsets, newOffsets])
+            mode = "ab"
+    if offsets is None:
+        offsets = get_xtc_frame_offsets(fileName.encode("utf-8"))
+        newOffsets = offsets
+        mode = "wb"
+    if not saveIndex:
+        return offsets, mode == "ab" and len(newOffsets) == 0
+    try:
+        with open(indexFile, mode) as f:
+            f.write(newOffsets.astype("<i8").tobytes())
+    except OSError:
+        return offsets, False
+    return offsets, True
+
+
+def _isValidIndex(offsets, fileSize):
+    """Check whether the offsets read from an index file could describe the trajectory.  This only checks
+    them against the file size, so it does not need to read the trajectory itself."""
+    import numpy as np
+
+    return len(offsets) > 1 and offsets[0] == 0 and offsets[-1] <= fileSize and not np.any(np.diff(offsets) <= 0)
+
+
+class XTCTrajectory(object):
+    """XTCTrajectory provides read access to the frames stored in a XTC file.
+
+    When it is created, it finds the byte offset of every frame by reading only the frame headers.  The
+    offsets are saved in a file next to the trajectory, so opening it again (even after more frames have
+    been appended) does not require scanning the whole file.  Frames can then be decoded individually or
+    in chunks, optionally keeping only a subset of the atoms, so a trajectory of any size can be processed
+    in constant memory.  Create it by calling XTCFile.read().
+    """
+
+    def __init__(self, fileName, saveIndex=True):
+        """Open a XTC file for reading.
+
+        Parameters
+        ----------
+        fileName : str
+            The name of the file to read
+        saveIndex : bool=True
+            If True, the index of frame offsets is saved to a file next to the
+            trajectory.
+        """
+        if not isinstance(fileName, str):
+            raise TypeError("fileName must be a string")
+        if not os.path.isfile(fileName):
+            raise FileNotFoundError(f"The file '{fileName}' does not exist.")
+        self._filename = fileName
+        self._offsets = _loadFrameOffsets(fileName, saveIndex)[0]
+        self._numAtoms = get_xtc_natoms(fileName.encode("utf-8")) if len(self._offsets) > 1 else 0
+
+    def __len__(self):
+        return self.getNumFrames()
+
+    def getNumFrames(self):
+        """Get the number of frames in the file."""
+        return len(self._offsets) - 1
+
+    def getNumAtoms(self):
+        """Get the number of atoms in each frame."""
+        return self._numAtoms
+
+    def readFrames(self, frames=None, atomSubset=None):
+        """Read a set of frames from the file.
+
+        Parameters
+        ----------
+        frames : int, slice, or list=None
+            The frames to read.  If None, all frames are read.
+        atomSubset : list=None
+            Indices of the atoms to return.  If None, all atoms are returned.
+
+        Returns
+        -------
+        tuple
+            (positions, boxVectors, time, step), where positions is a NumPy
+            array of shape (frames, atoms, 3) in nanometers, boxVectors has
+            shape (frames, 3, 3) in nanometers, time is in picoseconds, and
+            step contains the step index of each frame.
+        """
+        import numpy as np
+
+        indices = np.arange(self.getNumFrames())
+        if frames is not None:
+            indices = np.atleast_1d(indices[frames])
+        return read_xtc_frames(self._filename.encode("utf-8"), self._offsets[indices], self._numAtoms, atomSubset)
+
+    def iterChunks(self, chunkSize=100, atomSubset=None, stride=1):
+        """Iterate over the file, reading a limited number of frames at a time.
+
+        Parameters
+        ----------
+        chunkSize : int=100
+            The maximum number of frames to read at once
+        atomSubset : list=None
+            Indices of the atoms to return.  If None, all atoms are returned.
+        stride : int=1
+            Only every stride'th frame is read
+
+        Returns
+        -------
+        an iterator over tuples of the form returned by readFrames()
+        """
+        frames = range(0, self.getNumFrames(), stride)
+        for start in range(0, len(frames), chunkSize):
+            yield self.readFrames(list(frames[start:start+chunkSize]), atomSubset)
+
+    def getPositions(self, frame, atomSubset=None, asNumpy=False):
+        """Get the atom positions in a frame.
+
+        Parameters
+        ----------
+        frame : int
+            The index of the frame
+        atomSubset : list=None
+            Indices of the atoms to return.  If None, all atoms are returned.
+        asNumpy : bool=False
+            If true, the positions are returned as a NumPy array.  Otherwise they
+            are returned as a list of Vec3 objects.
+
+        Returns
+        -------
+        the positions in nanometers
+        """
+        positions = self.readFrames(frame, atomSubset)[0][0].astype("float64")
+        if asNumpy:
+            return positions * nanometers
+        return [Vec3(x, y, z) for x, y, z in positions] * nanometers
+
+    def getPeriodicBoxVectors(self, frame):
+        """Get the periodic box vectors for a frame.
+
+        Parameters
+        ----------
+        frame : int
+            The index of the frame
+
+        Returns
+        -------
+        the periodic box vectors, or None if the frame does not specify a box
+        """
+        box = self.readFrames(frame, [])[1][0]
+        if not box.any():
+            return None
+        return tuple(Vec3(*(float(x) for x in v)) for v in box) * nanometers
@@ -79,7 +79,7 @@ class XTCReporter(object):
             A dictionary describing the required information for the next report
         """
         steps = self._reportInterval - simulation.currentStep%self._reportInterval
-        return {'steps':steps, 'periodic':self._enforcePeriodicBox, 'include':['positions']}
+        return {'steps':steps, 'periodic':self._enforcePeriodicBox, 'include':['positions'], 'asynchronous':True}
 
     def report(self, simulation, state):
         """Generate a report.
@@ -671,8 +671,23 @@ class Quantity(object):
         except ValueError:
             pass
         if factor_is_identity:
-            # No multiplication required
-            result = Quantity(copy.deepcopy(self._value), new_unit)
+            # No multiplication required.  Immutable values can be shared, and sequences of them only
+            # need a shallow copy.
+            if _is_immutable(self._value):
+                result = Quantity(self._value, new_unit)
+            elif _is_sequence_of_immutables(self._value):
+                result = Quantity(type(self._value)(self._value), new_unit)
+            else:
+                result = Quantity(copy.deepcopy(self._value), new_unit)
+        elif _is_sequence_of_immutables(self._value):
+            # Scale each element into a new sequence, without first copying the original one.
+            if post_multiply:
+                value = [x*factor for x in self._value]
+            else:
+                value = [factor*x for x in self._value]
+            if isinstance(self._value, tuple):
+                value = tuple(value)
+            result = Quantity(value, new_unit)
         else:
             try:
                 # multiply operator, if it exists, is preferred
@@ -805,6 +820,25 @@ def is_dimensionless(x):
 
 # Strings can cause trouble
 # as can any container that has infinite levels of containment
+_immutable_types = (int, float, complex, bool)
+
+def _is_immutable(x):
+    """
+    Returns True if x is a number or Vec3, which never need to be copied.
+    """
+    from openmm.vec3 import Vec3
+    return type(x) in _immutable_types or type(x) is Vec3
+
+def _is_sequence_of_immutables(x):
+    """
+    Returns True if x is a list or tuple whose elements are all numbers or Vec3s.
+    """
+    if type(x) not in (list, tuple) or len(x) == 0:
+        return False
+    from openmm.vec3 import Vec3
+    types = set(map(type, x))
+    return types.issubset((Vec3,)+_immutable_types)
+
 def _is_string(x):
      # step 1) String is always a container
      # and its contents are themselves containers.
@@ -230,6 +230,7 @@ def buildKeywordDictionary(major_version_num=MAJOR_VERSION_NUM,
         extensionArgs["runtime_library_dirs"] = library_dirs
     setupKeywords["ext_modules"] = [Extension(**extensionArgs)]
     setupKeywords["ext_modules"] += cythonize('openmm/app/internal/*.pyx')
+    setupKeywords["ext_modules"] += cythonize('openmm/_vec3.pyx')
 
     setupKeywords["ext_modules"] +=cythonize(Extension(
         "openmm.app.internal.xtc_utils",
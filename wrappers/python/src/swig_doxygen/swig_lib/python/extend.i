@@ -251,7 +251,233 @@ Parameters:
         """
         return self.addException(particle1, particle2,
                                  chargeProd, rMin/RMIN_PER_SIGMA, epsilon)
+
+    def addParticles(self, parameters):
+        """Add many particles to the force at once.  This is equivalent to calling
+           addParticle() once for each row of the input, but is much faster when
+           adding a large number of particles.
+
+        Parameters
+        ----------
+        parameters : array of shape (numParticles, 3)
+            the charge (in elementary charge units), sigma (in nm), and epsilon
+            (in kJ/mol) of each particle
+
+        Returns
+        -------
+        the index of the first particle that was added
+        """
+        parameters = _bulkArray(parameters, numpy.float64, 3)
+        return self._addParticlesFromArray(parameters)
+
+    def addExceptions(self, particles, parameters, replace=False):
+        """Add many exceptions to the force at once.  This is equivalent to calling
+           addException() once for each row of the inputs, but is much faster when
+           adding a large number of exceptions.
+
+        Parameters
+        ----------
+        particles : array of shape (numExceptions, 2)
+            the indices of the two particles in each exception
+        parameters : array of shape (numExceptions, 3)
+            the charge product (in elementary charge units squared), sigma (in nm),
+            and epsilon (in kJ/mol) of each exception
+        replace : bool=False
+            determines the behavior if there is already an exception for the same
+            two particles, as for addException()
+
+        Returns
+        -------
+        the index of the first exception that was added
+        """
+        particles = _bulkArray(particles, numpy.int32, 2)
+        parameters = _bulkArray(parameters, numpy.float64, 3, len(particles))
+        return self._addExceptionsFromArrays(particles, parameters, replace)
+  %}
+
+  int _addParticlesFromArray(PyObject* parameters) {
+      int first = self->getNumParticles();
+      int num = PyArray_DIM((PyArrayObject*) parameters, 0);
+      const double* params = (const double*) PyArray_DATA((PyArrayObject*) parameters);
+      for (int i = 0; i < num; i++)
+          self->addParticle(params[3*i], params[3*i+1], params[3*i+2]);
+      return first;
+  }
+
+  int _addExceptionsFromArrays(PyObject* particles, PyObject* parameters, bool replace) {
+      int first = self->getNumExceptions();
+      int num = PyArray_DIM((PyArrayObject*) particles, 0);
+      const int* p = (const int*) PyArray_DATA((PyArrayObject*) particles);
+      const double* params = (const double*) PyArray_DATA((PyArrayObject*) parameters);
+      for (int i = 0; i < num; i++)
+          self->addException(p[2*i], p[2*i+1], params[3*i], params[3*i+1], params[3*i+2], replace);
+      return first;
+  }
+}
+
+%extend OpenMM::CustomNonbondedForce {
+  %pythoncode %{
+    def addExclusions(self, particles):
+        """Add many exclusions to the force at once.  This is equivalent to calling
+           addExclusion() once for each row of the input, but is much faster when
+           adding a large number of exclusions.
+
+        Parameters
+        ----------
+        particles : array of shape (numExclusions, 2)
+            the indices of the two particles in each excluded pair
+
+        Returns
+        -------
+        the index of the first exclusion that was added
+        """
+        particles = _bulkArray(particles, numpy.int32, 2)
+        return self._addExclusionsFromArray(particles)
+
+    def addParticles(self, parameters):
+        """Add many particles to the force at once.  This is equivalent to calling
+           addParticle() once for each row of the input, but is much faster when
+           adding a large number of particles.
+
+        Parameters
+        ----------
+        parameters : array of shape (numParticles, numPerParticleParameters)
+            the values of the per-particle parameters for each particle
+
+        Returns
+        -------
+        the index of the first particle that was added
+        """
+        parameters = _bulkArray(parameters, numpy.float64, self.getNumPerParticleParameters())
+        return self._addParticlesFromArray(parameters)
+  %}
+
+  int _addParticlesFromArray(PyObject* parameters) {
+      int first = self->getNumParticles();
+      int num = PyArray_DIM((PyArrayObject*) parameters, 0);
+      int width = PyArray_DIM((PyArrayObject*) parameters, 1);
+      const double* params = (const double*) PyArray_DATA((PyArrayObject*) parameters);
+      for (int i = 0; i < num; i++)
+          self->addParticle(std::vector<double>(params+width*i, params+width*(i+1)));
+      return first;
+  }
+
+  int _addExclusionsFromArray(PyObject* particles) {
+      int first = self->getNumExclusions();
+      int num = PyArray_DIM((PyArrayObject*) particles, 0);
+      const int* p = (const int*) PyArray_DATA((PyArrayObject*) particles);
+      for (int i = 0; i < num; i++)
+          self->addExclusion(p[2*i], p[2*i+1]);
+      return first;
+  }
+}
+
+%extend OpenMM::HarmonicBondForce {
+  %pythoncode %{
+    def addBonds(self, particles, parameters):
+        """Add many bonds to the force at once.  This is equivalent to calling
+           addBond() once for each row of the inputs, but is much faster when
+           adding a large number of bonds.
+
+        Parameters
+        ----------
+        particles : array of shape (numBonds, 2)
+            the indices of the two particles connected by each bond
+        parameters : array of shape (numBonds, 2)
+            the equilibrium length (in nm) and force constant (in kJ/mol/nm^2)
+            of each bond
+
+        Returns
+        -------
+        the index of the first bond that was added
+        """
+        particles = _bulkArray(particles, numpy.int32, 2)
+        parameters = _bulkArray(parameters, numpy.float64, 2, len(particles))
+        return self._addBondsFromArrays(particles, parameters)
   %}
+
+  int _addBondsFromArrays(PyObject* particles, PyObject* parameters) {
+      int first = self->getNumBonds();
+      int num = PyArray_DIM((PyArrayObject*) particles, 0);
+      const int* p = (const int*) PyArray_DATA((PyArrayObject*) particles);
+      const double* params = (const double*) PyArray_DATA((PyArrayObject*) parameters);
+      for (int i = 0; i < num; i++)
+          self->addBond(p[2*i], p[2*i+1], params[2*i], params[2*i+1]);
+      return first;
+  }
+}
+
+%extend OpenMM::HarmonicAngleForce {
+  %pythoncode %{
+    def addAngles(self, particles, parameters):
+        """Add many angles to the force at once.  This is equivalent to calling
+           addAngle() once for each row of the inputs, but is much faster when
+           adding a large number of angles.
+
+        Parameters
+        ----------
+        particles : array of shape (numAngles, 3)
+            the indices of the three particles forming each angle
+        parameters : array of shape (numAngles, 2)
+            the equilibrium angle (in radians) and force constant (in kJ/mol/radian^2)
+            of each angle
+
+        Returns
+        -------
+        the index of the first angle that was added
+        """
+        particles = _bulkArray(particles, numpy.int32, 3)
+        parameters = _bulkArray(parameters, numpy.float64, 2, len(particles))
+        return self._addAnglesFromArrays(particles, parameters)
+  %}
+
+  int _addAnglesFromArrays(PyObject* particles, PyObject* parameters) {
+      int first = self->getNumAngles();
+      int num = PyArray_DIM((PyArrayObject*) particles, 0);
+      const int* p = (const int*) PyArray_DATA((PyArrayObject*) particles);
+      const double* params = (const double*) PyArray_DATA((PyArrayObject*) parameters);
+      for (int i = 0; i < num; i++)
+          self->addAngle(p[3*i], p[3*i+1], p[3*i+2], params[2*i], params[2*i+1]);
+      return first;
+  }
+}
+
+%extend OpenMM::PeriodicTorsionForce {
+  %pythoncode %{
+    def addTorsions(self, particles, periodicity, parameters):
+        """Add many torsions to the force at once.  This is equivalent to calling
+           addTorsion() once for each row of the inputs, but is much faster when
+           adding a large number of torsions.
+
+        Parameters
+        ----------
+        particles : array of shape (numTorsions, 4)
+            the indices of the four particles forming each torsion
+        periodicity : array of shape (numTorsions,)
+            the periodicity of each torsion
+        parameters : array of shape (numTorsions, 2)
+            the phase offset (in radians) and force constant (in kJ/mol) of each torsion
+
+        Returns
+        -------
+        the index of the first torsion that was added
+        """
+        particles = _bulkArray(particles, numpy.int32, 4)
+        periodicity = _bulkArray(periodicity, numpy.int32, None, len(particles))
+        parameters = _bulkArray(parameters, numpy.float64, 2, len(particles))
+        return self._addTorsionsFromArrays(particles, periodicity, parameters)
+  %}
+
+  int _addTorsionsFromArrays(PyObject* particles, PyObject* periodicity, PyObject* parameters) {
+      int first = self->getNumTorsions();
+      int num = PyArray_DIM((PyArrayObject*) particles, 0);
+      const int* p = (const int*) PyArray_DATA((PyArrayObject*) particles);
+      const int* n = (const int*) PyArray_DATA((PyArrayObject*) periodicity);
+      const double* params = (const double*) PyArray_DATA((PyArrayObject*) parameters);
+      for (int i = 0; i < num; i++)
+          self->addTorsion(p[4*i], p[4*i+1], p[4*i+2], p[4*i+3], n[i], params[2*i], params[2*i+1]);
+      return first;
+  }
 }
 
 %extend OpenMM::System {
@@ -268,11 +494,67 @@ Parameters:
     def getForces(self):
         """Get the list of Forces in this System"""
         return [self.getForce(i) for i in range(self.getNumForces())]
+
+    def addParticles(self, masses):
+        """Add many particles to the System at once.  This is equivalent to calling
+           addParticle() once for each element of the input, but is much faster when
+           adding a large number of particles.
+
+        Parameters
+        ----------
+        masses : array of shape (numParticles,)
+            the mass of each particle (in atomic mass units)
+
+        Returns
+        -------
+        the index of the first particle that was added
+        """
+        masses = _bulkArray(masses, numpy.float64, None)
+        return self._addParticlesFromArray(masses)
+
+    def addConstraints(self, particles, distances):
+        """Add many constraints to the System at once.  This is equivalent to calling
+           addConstraint() once for each row of the inputs, but is much faster when
+           adding a large number of constraints.
+
+        Parameters
+        ----------
+        particles : array of shape (numConstraints, 2)
+            the indices of the two particles involved in each constraint
+        distances : array of shape (numConstraints,)
+            the required distance (in nm) between the particles of each constraint
+
+        Returns
+        -------
+        the index of the first constraint that was added
+        """
+        particles = _bulkArray(particles, numpy.int32, 2)
+        distances = _bulkArray(distances, numpy.float64, None, len(particles))
+        return self._addConstraintsFromArrays(particles, distances)
   %}
   %newobject __copy__;
   OpenMM::System* __copy__() {
       return OpenMM::XmlSerializer::clone<OpenMM::System>(*self);
   }
+
+  int _addParticlesFromArray(PyObject* masses) {
+      int first = self->getNumParticles();
+      int num = PyArray_DIM((PyArrayObject*) masses, 0);
+      const double* m = (const double*) PyArray_DATA((PyArrayObject*) masses);
+      for (int i = 0; i < num; i++)
+          self->addParticle(m[i]);
+      return first;
+  }
+
+  int _addConstraintsFromArrays(PyObject* particles, PyObject* distances) {
+      int first = self->getNumConstraints();
+      int num = PyArray_DIM((PyArrayObject*) particles, 0);
+      const int* p = (const int*) PyArray_DATA((PyArrayObject*) particles);
+      const double* d = (const double*) PyArray_DATA((PyArrayObject*) distances);
+      for (int i = 0; i < num; i++)
+          self->addConstraint(p[2*i], p[2*i+1], d[i]);
+      return first;
+  }
 }
 
 %extend OpenMM::XmlSerializer {
@@ -515,13 +797,21 @@ Parameters:
             vectors = numpy.array(vectors)
         return vectors*unit.nanometers
 
-    def getPositions(self, asNumpy=False):
+    def getPositions(self, asNumpy=False, out=None):
         """Get the position of each particle with units.
            Raises an exception if positions where not requested in
            the context.getState() call.
            Returns a list of Vec3s, unless asNumpy is True, in
            which  case a Numpy array of arrays will be returned.
+
+           If out is specified, it must be a C-contiguous Numpy array
+           of shape (number of particles, 3) with dtype float64 or
+           float32.  The positions are copied into it in nanometers,
+           and it is returned without units.  This avoids allocating
+           new memory each time positions are retrieved.
            """
+        if out is not None:
+            return self._copyVectorToArray(State.Positions, out)
         if asNumpy:
             if '_positionsNumpy' not in dir(self):
                 self._positionsNumpy = numpy.empty([self._getNumParticles(), 3], numpy.float64)
@@ -532,13 +822,20 @@ Parameters:
             self._positions = self._getVectorAsVec3(State.Positions)*unit.nanometers
         return self._positions
 
-    def getVelocities(self, asNumpy=False):
+    def getVelocities(self, asNumpy=False, out=None):
         """Get the velocity of each particle with units.
            Raises an exception if velocities where not requested in
            the context.getState() call.
            Returns a list of Vec3s if asNumpy is False, or a Numpy
            array if asNumpy is True.
+
+           If out is specified, it must be a C-contiguous Numpy array
+           of shape (number of particles, 3) with dtype float64 or
+           float32.  The velocities are copied into it in nm/ps, and
+           it is returned without units.
            """
+        if out is not None:
+            return self._copyVectorToArray(State.Velocities, out)
         if asNumpy:
             if '_velocitiesNumpy' not in dir(self):
                 self._velocitiesNumpy = numpy.empty([self._getNumParticles(), 3], numpy.float64)
@@ -549,13 +846,20 @@ Parameters:
             self._velocities = self._getVectorAsVec3(State.Velocities)*unit.nanometers/unit.picosecond
         return self._velocities
 
-    def getForces(self, asNumpy=False):
+    def getForces(self, asNumpy=False, out=None):
         """Get the force acting on each particle with units.
            Raises an exception if forces where not requested in
            the context.getState() call.
            Returns a list of Vec3s if asNumpy is False, or a Numpy
            array if asNumpy is True.
+
+           If out is specified, it must be a C-contiguous Numpy array
+           of shape (number of particles, 3) with dtype float64 or
+           float32.  The forces are copied into it in kJ/mol/nm, and
+           it is returned without units.
            """
+        if out is not None:
+            return self._copyVectorToArray(State.Forces, out)
         if asNumpy:
             if '_forcesNumpy' not in dir(self):
                 self._forcesNumpy = numpy.empty([self._getNumParticles(), 3], numpy.float64)
@@ -565,6 +869,19 @@ Parameters:
         if '_forces' not in dir(self):
             self._forces = self._getVectorAsVec3(State.Forces)*unit.kilojoules_per_mole/unit.nanometer
         return self._forces
+
+    def _copyVectorToArray(self, type, out):
+        """Copy positions, velocities, or forces into a caller supplied array."""
+        if not isinstance(out, numpy.ndarray):
+            raise TypeError('out must be a Numpy array')
+        if out.shape != (self._getNumParticles(), 3):
+            raise ValueError('out has shape %s, but it must be (%d, 3)' % (out.shape, self._getNumParticles()))
+        if out.dtype not in (numpy.float64, numpy.float32):
+            raise ValueError('out must have dtype float64 or float32')
+        if not out.flags.c_contiguous or not out.flags.writeable:
+            raise ValueError('out must be C-contiguous and writeable')
+        self._getVectorAsNumpy(type, out)
+        return out
   %}
   
   int _getNumParticles() {
@@ -601,7 +918,14 @@ Parameters:
         return;
       }
       void* data = PyArray_DATA((PyArrayObject*) output);
-      memcpy(data, &array[0][0], 3*sizeof(double)*array->size());
+      if (PyArray_TYPE((PyArrayObject*) output) == NPY_FLOAT) {
+          float* values = (float*) data;
+          for (int i = 0; i < array->size(); i++)
+              for (int j = 0; j < 3; j++)
+                  values[3*i+j] = (float) (*array)[i][j];
+      }
+      else
+          memcpy(data, &array[0][0], 3*sizeof(double)*array->size());
   }
 
   %newobject __copy__;
@@ -20,6 +20,20 @@ else:
 import openmm.unit as unit
 from openmm.vec3 import Vec3
 
+def _bulkArray(values, dtype, width, length=None):
+    """Convert the input to one of the bulk methods (such as HarmonicBondForce.addBonds())
+    into a contiguous array of the type and shape expected by the C++ code."""
+    if unit.is_quantity(values):
+        values = values.value_in_unit_system(unit.md_unit_system)
+    array = numpy.ascontiguousarray(values, dtype=dtype)
+    if width is None:
+        array = array.reshape(-1)
+    else:
+        array = array.reshape(-1, width)
+    if length is not None and len(array) != length:
+        raise ValueError('Inconsistent number of entries in arrays: expected %d, found %d' % (length, len(array)))
+    return array
+
 
 %}
 
@@ -4,6 +4,7 @@ from openmm.app import *
 from openmm import *
 from openmm.unit import *
 import openmm.app.element as elem
+from openmm.app.internal.amber_file_parser import readAmberCoordinates
 try:
     from scipy.io import netcdf_file
     SCIPY_IMPORT_FAILED = False
@@ -46,6 +47,18 @@ class TestAmberInpcrdFile(unittest.TestCase):
         self.assertAlmostEqual(inpcrd.boxVectors[0][0].value_in_unit(angstroms),
                                30.2642725, places=6)
 
+    def test_Numpy(self):
+        """ Test reading ASCII restarts as numpy arrays """
+        inpcrd = AmberInpcrdFile('systems/crds_vels_box.rst7')
+        positions, velocities, boxVectors = readAmberCoordinates('systems/crds_vels_box.rst7', asNumpy=True)
+        self.assertEqual((2101, 3), positions.value_in_unit(angstroms).shape)
+        self.assertEqual((2101, 3), velocities.value_in_unit(angstroms/picoseconds).shape)
+        for p1, p2, p3 in zip(inpcrd.positions, positions, inpcrd.getPositions(asNumpy=True)):
+            self.assertEqual(p1, Vec3(*p2.value_in_unit(angstroms))*angstroms)
+            self.assertEqual(p1.value_in_unit(nanometers), Vec3(*p3.value_in_unit(nanometers)))
+        for v1, v2 in zip(inpcrd.velocities, velocities):
+            self.assertEqual(v1, Vec3(*v2.value_in_unit(angstroms/picoseconds))*angstroms/picoseconds)
+
     def test_CrdBox(self):
         """ Test parsing ASCII restarts with only crds and box """
         inpcrd = AmberInpcrdFile('systems/crds_box.rst7')
@@ -502,5 +502,28 @@ class TestAmberPrmtopFile(unittest.TestCase):
             else:
                 self.assertAlmostEqual(energies[True][i], energies[False][i], delta=delta)
 
+    def testSectionParsing(self):
+        """Test that numeric sections are decoded into arrays, and that every term in the file is added to the System."""
+        loader = prmtop5._prmtop
+        self.assertEqual('int64', loader._raw_data['POINTERS'].dtype)
+        self.assertEqual('float64', loader._raw_data['CHARGE'].dtype)
+        self.assertEqual('N', loader.getAtomName(0))
+        self.assertEqual(loader.getNumAtoms(), len(loader.getCharges()))
+        system = prmtop5.createSystem(nonbondedMethod=PME, rigidWater=False)
+        numBonds = int(loader._getPointerValue('NBONH') + loader._getPointerValue('MBONA'))
+        numAngles = int(loader._getPointerValue('NTHETH') + loader._getPointerValue('MTHETA'))
+        numTorsions = int(loader._getPointerValue('NPHIH') + loader._getPointerValue('MPHIA'))
+        for f in system.getForces():
+            if isinstance(f, HarmonicBondForce):
+                self.assertEqual(numBonds, f.getNumBonds())
+            elif isinstance(f, HarmonicAngleForce):
+                self.assertEqual(numAngles, f.getNumAngles())
+            elif isinstance(f, PeriodicTorsionForce):
+                self.assertEqual(numTorsions, f.getNumTorsions())
+            elif isinstance(f, NonbondedForce):
+                self.assertEqual(loader.getNumAtoms(), f.getNumParticles())
+                numExclusions = len([j for atoms in loader.getExcludedAtoms() for j in atoms])
+                self.assertTrue(f.getNumExceptions() <= numExclusions)
+
 if __name__ == '__main__':
     unittest.main()
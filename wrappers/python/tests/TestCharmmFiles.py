@@ -730,6 +730,49 @@ END""", file=prm_file)
             self.assertAlmostEqual(system_charmm.getConstraintParameters(i)[2],
                                    system_openmm.getConstraintParameters(i)[2], delta=1e-7 * nanometers)
 
+    def test_Snapshot(self):
+        """Test saving and loading a parameter set snapshot."""
+        with tempfile.TemporaryDirectory() as tempdir:
+            parfile = os.path.join(tempdir, 'charmm22.par')
+            with open('systems/charmm22.par') as input:
+                parameters = input.read()
+            with open(parfile, 'w') as output:
+                output.write(parameters)
+            snapshot = os.path.join(tempdir, 'params.pkl')
+            params1 = CharmmParameterSet.loadSet('systems/charmm22.rtf', parfile, snapshot=snapshot)
+            self.assertTrue(os.path.isfile(snapshot))
+            with open(snapshot, 'rb') as input:
+                contents = input.read()
+
+            # Loading the same files again should use the snapshot without modifying it.
+
+            params2 = CharmmParameterSet.loadSet('systems/charmm22.rtf', parfile, snapshot=snapshot)
+            with open(snapshot, 'rb') as input:
+                self.assertEqual(contents, input.read())
+            system1 = self.psf_c.createSystem(params1)
+            system2 = self.psf_c.createSystem(params2)
+            self.assertEqual(XmlSerializer.serialize(system1), XmlSerializer.serialize(system2))
+            self.assertEqual(sorted(params1.atom_types_str), sorted(params2.atom_types_str))
+            self.assertEqual(sorted(params1.bond_types), sorted(params2.bond_types))
+
+            # Changing a file should cause the snapshot to be regenerated.
+
+            with open(parfile, 'w') as output:
+                output.write(parameters.replace('CT2  CT1   222.500     1.5380', 'CT2  CT1   250.000     1.5380'))
+            params3 = CharmmParameterSet.loadSet('systems/charmm22.rtf', parfile, snapshot=snapshot)
+            self.assertEqual(250.0, params3.bond_types[('CT1', 'CT2')].k)
+            with open(snapshot, 'rb') as input:
+                self.assertNotEqual(contents, input.read())
+            params4 = CharmmParameterSet.loadSet('systems/charmm22.rtf', parfile, snapshot=snapshot)
+            self.assertEqual(250.0, params4.bond_types[('CT1', 'CT2')].k)
+
+            # A damaged snapshot should be ignored.
+
+            with open(snapshot, 'wb') as output:
+                output.write(b'not a snapshot')
+            params5 = CharmmParameterSet.loadSet('systems/charmm22.rtf', parfile, snapshot=snapshot)
+            self.assertEqual(250.0, params5.bond_types[('CT1', 'CT2')].k)
+
 if __name__ == '__main__':
     unittest.main()
 
@@ -39,6 +39,87 @@ class TestDCDFile(unittest.TestCase):
                 dcd.writeModel([mm.Vec3(random(), random(), random()) for j in range(natom)]*unit.angstroms)
         os.remove(fname)
     
+    def testBuffering(self):
+        """Test that buffering models produces the same file as writing them one at a time."""
+        pdbfile = app.PDBFile('systems/alanine-dipeptide-explicit.pdb')
+        natom = pdbfile.topology.getNumAtoms()
+        frames = [[mm.Vec3(random(), random(), random()) for j in range(natom)]*unit.nanometers for i in range(7)]
+        contents = []
+        for bufferSize in (1, 3):
+            fname = tempfile.mktemp(suffix='.dcd')
+            with open(fname, 'w+b') as f:
+                dcd = app.DCDFile(f, pdbfile.topology, 0.001, bufferSize=bufferSize)
+                for i, positions in enumerate(frames):
+                    dcd.writeModel(positions)
+                    if bufferSize == 3 and i == 4:
+                        # Only the first three models should have been written so far.
+                        self.assertEqual((3, 2), _read_dcd_header(fname))
+                dcd.flush()
+            modelCount, currStep = _read_dcd_header(fname)
+            self.assertEqual(7, modelCount)
+            with open(fname, 'rb') as f:
+                contents.append(f.read())
+            os.remove(fname)
+        # Skip the comment containing the creation time when comparing them.
+        self.assertEqual(contents[0][:180], contents[1][:180])
+        self.assertEqual(contents[0][260:], contents[1][260:])
+
+    def testRead(self):
+        """Test reading back a DCD file."""
+        fname = tempfile.mktemp(suffix='.dcd')
+        pdbfile = app.PDBFile('systems/alanine-dipeptide-explicit.pdb')
+        natom = pdbfile.topology.getNumAtoms()
+        frames = [[mm.Vec3(random(), random(), random()) for j in range(natom)]*unit.nanometers for i in range(5)]
+        boxVectors = [(mm.Vec3(3+0.1*i, 0, 0), mm.Vec3(0.5, 3, 0), mm.Vec3(-0.4, 0.6, 3.5))*unit.nanometers for i in range(5)]
+        with open(fname, 'wb') as f:
+            dcd = app.DCDFile(f, pdbfile.topology, 0.002*unit.picoseconds, firstStep=100, interval=50)
+            for positions, box in zip(frames, boxVectors):
+                dcd.writeModel(positions, periodicBoxVectors=box)
+        traj = app.DCDFile.read(fname)
+        self.assertEqual(5, traj.getNumFrames())
+        self.assertEqual(natom, traj.getNumAtoms())
+        self.assertEqual(100, traj.getFirstStep())
+        self.assertEqual(50, traj.getInterval())
+        self.assertAlmostEqual(0.002, traj.getTimeStep().value_in_unit(unit.picoseconds), places=6)
+        self.assertEqual((5, natom, 3), traj.coordinates.shape)
+        for i in range(5):
+            positions = traj.getPositions(i)
+            self.assertEqual(natom, len(positions))
+            for p1, p2 in zip(frames[i], positions):
+                for j in range(3):
+                    self.assertAlmostEqual(p1[j].value_in_unit(unit.nanometers), p2[j].value_in_unit(unit.nanometers), places=5)
+            box = traj.getPeriodicBoxVectors(i)
+            for v1, v2 in zip(boxVectors[i], box):
+                for j in range(3):
+                    self.assertAlmostEqual(v1[j].value_in_unit(unit.nanometers), v2[j].value_in_unit(unit.nanometers), places=5)
+
+        # Select a subset of frames and atoms.
+
+        subset = traj.getPositions(slice(1, None, 2), atomSubset=[3, 0, 7]).value_in_unit(unit.nanometers)
+        self.assertEqual((2, 3, 3), subset.shape)
+        for i, frame in enumerate([1, 3]):
+            for j, atom in enumerate([3, 0, 7]):
+                for k in range(3):
+                    self.assertAlmostEqual(frames[frame][atom][k].value_in_unit(unit.nanometers), subset[i, j, k], places=5)
+        traj.close()
+        os.remove(fname)
+
+    def testReadEmpty(self):
+        """Test reading a DCD file that has a header but no frames."""
+        fname = tempfile.mktemp(suffix='.dcd')
+        pdbfile = app.PDBFile('systems/alanine-dipeptide-explicit.pdb')
+        natom = pdbfile.topology.getNumAtoms()
+        with open(fname, 'wb') as f:
+            dcd = app.DCDFile(f, pdbfile.topology, 0.001, bufferSize=5)
+            dcd.writeModel([mm.Vec3(random(), random(), random()) for j in range(natom)]*unit.nanometers)
+        traj = app.DCDFile.read(fname)
+        self.assertEqual(0, traj.getNumFrames())
+        self.assertEqual(natom, traj.getNumAtoms())
+        self.assertEqual((0, natom, 3), traj.coordinates.shape)
+        self.assertEqual((0, natom, 3), traj.getPositions(slice(None)).shape)
+        traj.close()
+        os.remove(fname)
+
     def testAppend(self):
         """Test appending to an existing trajectory."""
         fname = tempfile.mktemp(suffix='.dcd')
@@ -83,6 +164,31 @@ class TestDCDFile(unittest.TestCase):
         self.assertEqual(20, currStep)
         os.remove(fname)
 
+    def testFlushOnCheckpoint(self):
+        """Test that buffered frames are written when the simulation saves a checkpoint or state."""
+        with tempfile.TemporaryDirectory() as temp:
+            fname = os.path.join(temp, 'traj.dcd')
+            pdb = app.PDBFile('systems/alanine-dipeptide-implicit.pdb')
+            ff = app.ForceField('amber99sb.xml')
+            system = ff.createSystem(pdb.topology)
+            integrator = mm.VerletIntegrator(0.001*unit.picoseconds)
+            simulation = app.Simulation(pdb.topology, system, integrator, mm.Platform.getPlatform('Reference'))
+            dcd = app.DCDReporter(fname, 2, bufferSize=10)
+            simulation.reporters.append(dcd)
+            simulation.context.setPositions(pdb.positions)
+            simulation.step(6)
+            self.assertEqual(3, len(dcd._dcd._buffer))
+            simulation.saveCheckpoint(os.path.join(temp, 'checkpoint.chk'))
+            self.assertEqual((3, 6), _read_dcd_header(fname))
+            traj = app.DCDFile.read(fname)
+            self.assertEqual(3, traj.getNumFrames())
+            traj.close()
+            simulation.step(4)
+            simulation.saveState(os.path.join(temp, 'state.xml'))
+            self.assertEqual((5, 10), _read_dcd_header(fname))
+            dcd.close()
+            dcd.close()
+
     def testAtomSubset(self):
         """Test writing a DCD file containing a subset of atoms"""
         fname = tempfile.mktemp(suffix='.dcd')
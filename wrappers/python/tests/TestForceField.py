@@ -831,6 +831,83 @@ class TestForceField(unittest.TestCase):
         self.assertEqual(templates[1].name, 'ALA')
         self.assertEqual(templates[2].name, 'CALA')
 
+    def test_residueMatchCache(self):
+        """Test that identical residues share a cached template match, and different ones do not."""
+        data = ForceField._SystemData(self.topology1)
+        residues = list(self.topology1.residues())
+        waters = [res for res in residues if res.name == 'HOH']
+        keys = set(forcefield._createResidueGraphSignature(res, data.bondedToAtom) for res in waters)
+        self.assertEqual(1, len(keys))
+        self.assertNotEqual(forcefield._createResidueGraphSignature(residues[0], data.bondedToAtom),
+                            forcefield._createResidueGraphSignature(residues[1], data.bondedToAtom))
+
+        # Every water should be assigned the same types as the first one.
+
+        data = ForceField._SystemData(self.topology1)
+        self.forcefield1._matchAllResiduesToTemplates(data, self.topology1, dict(), False)
+        firstTypes = [data.atomType[atom] for atom in waters[0].atoms()]
+        for res in waters[1:]:
+            self.assertEqual(firstTypes, [data.atomType[atom] for atom in res.atoms()])
+
+    def test_SystemCache(self):
+        """Test caching Systems on disk."""
+        with tempfile.TemporaryDirectory() as cacheDir:
+            system1 = self.forcefield1.createSystem(self.topology1, nonbondedMethod=PME, cacheDir=cacheDir)
+            self.assertEqual(1, len(os.listdir(cacheDir)))
+            system2 = self.forcefield1.createSystem(self.topology1, nonbondedMethod=PME, cacheDir=cacheDir)
+            self.assertEqual(1, len(os.listdir(cacheDir)))
+            self.assertEqual(XmlSerializer.serialize(system1), XmlSerializer.serialize(system2))
+
+            # Changing the arguments or the force field should produce a different System.
+
+            system3 = self.forcefield1.createSystem(self.topology1, nonbondedMethod=PME, constraints=HBonds, cacheDir=cacheDir)
+            self.assertEqual(2, len(os.listdir(cacheDir)))
+            self.assertNotEqual(system1.getNumConstraints(), system3.getNumConstraints())
+            forcefield = ForceField('amber14-all.xml', 'amber14/tip3p.xml')
+            forcefield.createSystem(self.topology1, nonbondedMethod=PME, cacheDir=cacheDir)
+            self.assertEqual(3, len(os.listdir(cacheDir)))
+
+            # Invalid arguments should be detected even when the System is in the cache.
+
+            with self.assertRaises(ValueError):
+                self.forcefield1.createSystem(self.topology1, nonbondedMethod=PME, cacheDir=cacheDir, nonbondedCutof=1.0)
+            forcefield.createSystem(self.topology1, nonbondedMethod=PME, cacheDir=cacheDir)
+            self.assertEqual(3, len(os.listdir(cacheDir)))
+            with self.assertRaises(ValueError):
+                forcefield.createSystem(self.topology1, nonbondedMethod=PME, cacheDir=cacheDir, nonbondedCutof=1.0)
+
+            # Registering a template generator or template should invalidate the cache.
+
+            forcefield.registerTemplateGenerator(lambda forcefield, residue: False)
+            forcefield.createSystem(self.topology1, nonbondedMethod=PME, cacheDir=cacheDir)
+            self.assertEqual(4, len(os.listdir(cacheDir)))
+            template = ForceField._TemplateData('XYZ')
+            template.addAtom(ForceField._TemplateAtomData('C1', 'protein-CT', elem.carbon))
+            forcefield.registerResidueTemplate(template)
+            forcefield.createSystem(self.topology1, nonbondedMethod=PME, cacheDir=cacheDir)
+            self.assertEqual(5, len(os.listdir(cacheDir)))
+
+    def test_ParallelTemplateMatching(self):
+        """Test that matching templates with multiple processes gives the same System as a single process."""
+        pdb = PDBFile('systems/bpti.pdb')
+        forcefield = ForceField('charmm36.xml')
+        system1 = forcefield.createSystem(pdb.topology)
+        system2 = forcefield.createSystem(pdb.topology, numWorkers=2)
+        self.assertEqual(XmlSerializer.serialize(system1), XmlSerializer.serialize(system2))
+
+    def test_findExclusions(self):
+        """Test identifying pairs of atoms separated by a small number of bonds."""
+        # A five membered ring with a two atom tail, and a separate molecule.
+
+        bonds = [(0, 1), (1, 2), (2, 3), (3, 4), (4, 0), (4, 5), (6, 5), (7, 8)]
+        pairs = forcefield._findExclusions(bonds, 3, 9)
+        expected = [(0, 1, 1), (0, 2, 2), (0, 3, 2), (0, 4, 1), (0, 5, 2), (0, 6, 3), (1, 2, 1), (1, 3, 2), (1, 4, 2),
+                    (1, 5, 3), (2, 3, 1), (2, 4, 2), (2, 5, 3), (3, 4, 1), (3, 5, 2), (3, 6, 3), (4, 5, 1), (4, 6, 2),
+                    (5, 6, 1), (7, 8, 1)]
+        self.assertEqual(expected, pairs)
+        self.assertEqual([p for p in expected if p[2] == 1], forcefield._findExclusions(bonds, 1, 9))
+        self.assertEqual([], forcefield._findExclusions([], 3, 4))
+
     def test_matchErrorMessages(self):
         """Test match error detection and diagnostics"""
 
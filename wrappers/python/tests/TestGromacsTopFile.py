@@ -1,3 +1,5 @@
+import os
+import tempfile
 import unittest
 from validateConstraints import *
 from openmm.app import *
@@ -210,6 +212,26 @@ class TestGromacsTopFile(unittest.TestCase):
         # the energy output is from gromacs and it only prints out 6 sig digits.
         self.assertAlmostEqual(ene.value_in_unit(kilojoules_per_mole), 1.88855e+02, places=3)
 
+    def test_MultipleCopies(self):
+        """Test that many copies of a molecule give the same System as listing each copy separately."""
+        for topfile in ['bnz.top', 'tip4pew.top', 'apgr.nbfix.pairs.comb2.top', 'apgr.nonbfix.pairs.comb1.top']:
+            with open(os.path.join('systems', topfile)) as f:
+                header, molecules = f.read().split('[ molecules ]')
+            names = [line.split()[0] for line in molecules.splitlines() if len(line.split()) == 2 and not line.startswith(';')]
+            copies = ''.join('%s 3\n' % name for name in names)
+            separate = ''.join('%s 1\n' % name for name in names for i in range(3))
+            serialized = []
+            with tempfile.TemporaryDirectory() as tempdir:
+                for molecules in (copies, separate):
+                    filename = os.path.join(tempdir, topfile)
+                    with open(filename, 'w') as f:
+                        f.write(header+'[ molecules ]\n'+molecules)
+                    top = GromacsTopFile(filename)
+                    system = top.createSystem(constraints=HBonds)
+                    serialized.append(XmlSerializer.serialize(system))
+            self.assertEqual(3*len(names), len(list(top.topology.chains())))
+            self.assertEqual(serialized[0], serialized[1])
+
     def test_Vsite3Func1(self):
         """Test a three particle virtual site."""
         top = GromacsTopFile('systems/tip4pew.top')
@@ -1,5 +1,6 @@
 from collections import defaultdict
 import unittest
+from unittest import mock
 import random
 
 from validateModeller import *
@@ -391,6 +392,34 @@ class TestModeller(unittest.TestCase):
         self.assertAlmostEqual(0.707, dodecVolume/cubeVolume, places=3)
         self.assertAlmostEqual(0.770, octVolume/cubeVolume, places=3)
 
+    def test_addSolventBatches(self):
+        """Test that addSolvent() gives the same result when the water box tiles are processed in many batches."""
+
+        # The expected values were computed with the original implementation, which placed one water molecule at a time.
+
+        expected = [(dict(boxSize=Vec3(3.5, 4.5, 5.5)*nanometers), 2765, 5545, (13468.761, 13446.1005, 13140.9985), (3.0501, 3.0072, 1.9891)),
+                    (dict(numAdded=1000), 1003, 2021, (4987.824554, 4930.983354, 4788.547154), (0.697291, 0.023791, 1.398291))]
+        for options, numResidues, numBonds, positionSum, lastPosition in expected:
+            results = []
+            # A limit of one candidate per batch means every tile of the water box is processed in a separate batch.
+            for maxCandidates in (Modeller._maxSolventCandidatesPerBatch, 1):
+                with mock.patch.object(Modeller, '_maxSolventCandidatesPerBatch', maxCandidates):
+                    modeller = Modeller(self.pdb.topology, self.positions)
+                    modeller.deleteWater()
+                    modeller.addSolvent(self.forcefield, **options)
+                topology = modeller.getTopology()
+                positions = modeller.getPositions().value_in_unit(nanometers)
+                self.assertEqual(numResidues, topology.getNumResidues())
+                self.assertEqual(numBonds, topology.getNumBonds())
+                for i in range(3):
+                    self.assertAlmostEqual(positionSum[i], sum([pos[i] for pos in positions]), places=4)
+                self.assertVecAlmostEqual(Vec3(*lastPosition), positions[-1], tol=1e-5)
+                results.append((topology, positions))
+            (topology1, positions1), (topology2, positions2) = results
+            self.assertEqual([(r.name, len(r)) for r in topology1.residues()], [(r.name, len(r)) for r in topology2.residues()])
+            self.assertEqual([(b[0].index, b[1].index) for b in topology1.bonds()], [(b[0].index, b[1].index) for b in topology2.bonds()])
+            self.assertEqual(positions1, positions2)
+
     def test_addSolventNeutralSolvent(self):
         """ Test the addSolvent() method; test adding ions to neutral solvent. """
 
@@ -568,6 +597,41 @@ class TestModeller(unittest.TestCase):
             self.assertEqual(positive_ion_count, expected_ions)
             self.assertEqual(chlorine_count, expected_ions)
 
+    def test_cellList(self):
+        """Test that _CellList finds the same neighbors as a brute force search."""
+        import numpy as np
+        from openmm.app.modeller import _CellList
+        random.seed(10)
+        vectors = [Vec3(3.0, 0, 0), Vec3(1.0, 2.5, 0), Vec3(-1.2, 0.9, 2.8)]
+        positions = [Vec3(random.uniform(-1, 4), random.uniform(-1, 4), random.uniform(-1, 4)) for i in range(300)]
+        points = [Vec3(random.uniform(-1, 4), random.uniform(-1, 4), random.uniform(-1, 4)) for i in range(100)]
+        cutoff = 0.8
+        for periodic in (True, False):
+            cells = _CellList(positions, cutoff, vectors, periodic)
+            pointIndices, atomIndices, distances = cells.query(points)
+            found = set(zip(pointIndices, atomIndices))
+            self.assertEqual(len(found), len(pointIndices))
+            expected = set()
+            for i, p1 in enumerate(points):
+                for j, p2 in enumerate(positions):
+                    delta = p1-p2
+                    if periodic:
+                        for k in (2, 1, 0):
+                            delta -= vectors[k]*round(delta[k]/vectors[k][k])
+                    if norm(delta) < cutoff:
+                        expected.add((i, j))
+            self.assertEqual(expected, found)
+
+    def test_computeTotalCharge(self):
+        """Test that the total charge found from templates matches the one in a System."""
+        modeller = Modeller(self.topology_start2, self.positions2)
+        system = self.forcefield.createSystem(modeller.topology)
+        nonbonded = [f for f in system.getForces() if isinstance(f, NonbondedForce)][0]
+        expected = 0.0
+        for i in range(nonbonded.getNumParticles()):
+            expected += nonbonded.getParticleParameters(i)[0].value_in_unit(elementary_charge)
+        self.assertAlmostEqual(expected, modeller._computeTotalCharge(self.forcefield, {}))
+
     def test_addHydrogensPdb2(self):
         """ Test the addHydrogens() method on the T4-lysozyme-L99A pdb file. """
 
@@ -59,6 +59,29 @@ class TestNumpyCompatibility(unittest.TestCase):
         np.testing.assert_array_almost_equal(input.value_in_unit(unit.angstroms / unit.femtoseconds),
                                              output.value_in_unit(unit.angstroms / unit.femtoseconds))
 
+    def test_getVectorsIntoArray(self):
+        n_particles = self.simulation.context.getSystem().getNumParticles()
+        positions = np.random.randn(n_particles, 3)
+        velocities = np.random.randn(n_particles, 3)
+        self.simulation.context.setPositions(positions)
+        self.simulation.context.setVelocities(velocities)
+        state = self.simulation.context.getState(getPositions=True, getVelocities=True, getForces=True)
+        for dtype in (np.float64, np.float32):
+            out = np.zeros((n_particles, 3), dtype)
+            self.assertIs(out, state.getPositions(out=out))
+            np.testing.assert_array_almost_equal(positions, out, decimal=5)
+            state.getVelocities(out=out)
+            np.testing.assert_array_almost_equal(velocities, out, decimal=5)
+            state.getForces(out=out)
+            forces = state.getForces(asNumpy=True).value_in_unit(unit.kilojoules_per_mole/unit.nanometer)
+            np.testing.assert_allclose(forces, out, rtol=1e-5)
+        with self.assertRaises(ValueError):
+            state.getPositions(out=np.zeros((n_particles+1, 3)))
+        with self.assertRaises(ValueError):
+            state.getPositions(out=np.zeros((3, n_particles)).T)
+        with self.assertRaises(ValueError):
+            state.getPositions(out=np.zeros((n_particles, 3), np.int32))
+
     def test_periodicBoxVectors(self):
         output = self.simulation.context.getState(getVelocities=True).getPeriodicBoxVectors(asNumpy=True)
         systemBox = self.simulation.system.getDefaultPeriodicBoxVectors()
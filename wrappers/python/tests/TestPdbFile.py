@@ -166,6 +166,49 @@ class TestPdbFile(unittest.TestCase):
         for atom1, atom2 in pdb.topology.bonds():
             assert tuple(sorted((atom1.index, atom2.index))) in bonds
 
+    def test_MultipleModels(self):
+        """Write and read a file containing multiple models."""
+        pdb = PDBFile('systems/alanine-dipeptide-implicit.pdb')
+        output = StringIO()
+        PDBFile.writeHeader(pdb.topology, output)
+        for i in range(3):
+            positions = [p+Vec3(i, 0, 0) for p in pdb.positions.value_in_unit(nanometers)]*nanometers
+            PDBFile.writeModel(pdb.topology, positions, output, modelIndex=i+1)
+        PDBFile.writeFooter(pdb.topology, output)
+        pdb2 = PDBFile(StringIO(output.getvalue()))
+        self.assertEqual(3, pdb2.getNumFrames())
+        self.assertEqual(pdb.topology.getNumAtoms(), pdb2.topology.getNumAtoms())
+        for i in range(3):
+            positions = pdb2.getPositions(frame=i)
+            numpyPositions = pdb2.getPositions(asNumpy=True, frame=i)
+            for p1, p2, p3 in zip(pdb.positions, positions, numpyPositions):
+                self.assertVecAlmostEqual(p1+Vec3(i, 0, 0)*nanometers, p2, 1e-4)
+                self.assertVecAlmostEqual(p2, Vec3(*p3.value_in_unit(nanometers))*nanometers)
+
+        # If a later model contains different atoms, each model should still get its own positions.
+
+        lines = output.getvalue().splitlines()
+        lastAtom = max(i for i, line in enumerate(lines) if line.startswith('ATOM'))
+        del lines[lastAtom]
+        pdb3 = PDBFile(StringIO('\n'.join(lines)))
+        self.assertEqual(3, pdb3.getNumFrames())
+        self.assertEqual(pdb.topology.getNumAtoms(), pdb3.topology.getNumAtoms())
+        self.assertEqual(pdb.topology.getNumAtoms()-1, len(pdb3.getPositions(frame=2)))
+
+    def test_WriteLargeCoordinates(self):
+        """Test writing coordinates that need reduced precision to fit in the fixed width columns."""
+        pdb = PDBFile('systems/triclinic.pdb')
+        positions = [Vec3(5000.0, -50.0, 0.5)]*len(pdb.positions)*nanometers
+        output = StringIO()
+        PDBFile.writeFile(pdb.topology, positions, output)
+        lines = [line for line in output.getvalue().splitlines() if line.startswith('HETATM')]
+        self.assertEqual(8, len(lines))
+        for line in lines:
+            self.assertEqual(80, len(line))
+            self.assertEqual('50000.00-500.000   5.000', line[30:54])
+        with self.assertRaises(ValueError):
+            PDBFile.writeFile(pdb.topology, [Vec3(1e7, 0, 0)]*len(pdb.positions)*nanometers, StringIO())
+
     def assertVecAlmostEqual(self, p1, p2, tol=1e-7):
         unit = p1.unit
         p1 = p1.value_in_unit(unit)
@@ -71,22 +71,23 @@ class TestPdbxFile(unittest.TestCase):
         sim = Simulation(parm.topology, system, VerletIntegrator(1*femtoseconds),
                          Platform.getPlatform('Reference'))
         sim.context.setPositions(PDBFile('systems/alanine-dipeptide-implicit.pdb').getPositions())
-        sim.reporters.append(PDBxReporter('test.cif', 1))
-        sim.step(10)
-        pdb = PDBxFile('test.cif')
-        self.assertEqual(len(list(pdb.topology.atoms())), len(list(parm.topology.atoms())))
-        self.assertEqual(len(list(pdb.topology.residues())), len(list(parm.topology.residues())))
-        for res1, res2 in zip(pdb.topology.residues(), parm.topology.residues()):
-            self.assertEqual(res1.name, res2.name)
-            for atom1, atom2 in zip(res1.atoms(), res2.atoms()):
-                self.assertEqual(atom1.name, atom2.name)
-        positions = pdb.getPositions(frame=9)
-        self.assertFalse(all(x1 == x2 for x1, x2 in zip(positions, pdb.getPositions(frame=0))))
-        # There should only be 10 frames (0 through 9)
-        self.assertRaises(IndexError, lambda: pdb.getPositions(frame=10))
-        self.assertIs(pdb.topology.getPeriodicBoxVectors(), None)
-        del sim
-        os.unlink('test.cif')
+        with tempfile.TemporaryDirectory() as tempdir:
+            filename = os.path.join(tempdir, 'test.cif')
+            sim.reporters.append(PDBxReporter(filename, 1))
+            sim.step(10)
+            pdb = PDBxFile(filename)
+            self.assertEqual(len(list(pdb.topology.atoms())), len(list(parm.topology.atoms())))
+            self.assertEqual(len(list(pdb.topology.residues())), len(list(parm.topology.residues())))
+            for res1, res2 in zip(pdb.topology.residues(), parm.topology.residues()):
+                self.assertEqual(res1.name, res2.name)
+                for atom1, atom2 in zip(res1.atoms(), res2.atoms()):
+                    self.assertEqual(atom1.name, atom2.name)
+            positions = pdb.getPositions(frame=9)
+            self.assertFalse(all(x1 == x2 for x1, x2 in zip(positions, pdb.getPositions(frame=0))))
+            # There should only be 10 frames (0 through 9)
+            self.assertRaises(IndexError, lambda: pdb.getPositions(frame=10))
+            self.assertIs(pdb.topology.getPeriodicBoxVectors(), None)
+            del sim
 
     def assertAlmostEqualVec(self, vec1, vec2, *args, **kwargs):
         if is_quantity(vec1):
@@ -105,30 +106,31 @@ class TestPdbxFile(unittest.TestCase):
         orig_pdb = PDBFile('systems/alanine-dipeptide-explicit.pdb')
         sim.context.setPositions(orig_pdb.getPositions())
         sim.context.setPeriodicBoxVectors(*parm.topology.getPeriodicBoxVectors())
-        sim.reporters.append(PDBxReporter('test.cif', 1))
-        sim.step(10)
-        pdb = PDBxFile('test.cif')
-        self.assertEqual(len(list(pdb.topology.atoms())), len(list(parm.topology.atoms())))
-        self.assertEqual(len(list(pdb.topology.residues())), len(list(parm.topology.residues())))
-        for res1, res2 in zip(pdb.topology.residues(), parm.topology.residues()):
-            self.assertEqual(res1.name, res2.name)
-            for atom1, atom2 in zip(res1.atoms(), res2.atoms()):
-                self.assertEqual(atom1.name, atom2.name)
-        positions = pdb.getPositions(frame=9)
-        self.assertFalse(all(x1 == x2 for x1, x2 in zip(positions, pdb.getPositions(frame=0))))
-        # There should only be 10 frames (0 through 9)
-        self.assertRaises(IndexError, lambda: pdb.getPositions(frame=10))
-        self.assertAlmostEqualVec(parm.topology.getPeriodicBoxVectors()[0],
-                                  pdb.topology.getPeriodicBoxVectors()[0],
-                                  places=5)
-        self.assertAlmostEqualVec(parm.topology.getPeriodicBoxVectors()[1],
-                                  pdb.topology.getPeriodicBoxVectors()[1],
-                                  places=5)
-        self.assertAlmostEqualVec(parm.topology.getPeriodicBoxVectors()[2],
-                                  pdb.topology.getPeriodicBoxVectors()[2],
-                                  places=5)
-        del sim
-        os.unlink('test.cif')
+        with tempfile.TemporaryDirectory() as tempdir:
+            filename = os.path.join(tempdir, 'test.cif')
+            sim.reporters.append(PDBxReporter(filename, 1))
+            sim.step(10)
+            pdb = PDBxFile(filename)
+            self.assertEqual(len(list(pdb.topology.atoms())), len(list(parm.topology.atoms())))
+            self.assertEqual(len(list(pdb.topology.residues())), len(list(parm.topology.residues())))
+            for res1, res2 in zip(pdb.topology.residues(), parm.topology.residues()):
+                self.assertEqual(res1.name, res2.name)
+                for atom1, atom2 in zip(res1.atoms(), res2.atoms()):
+                    self.assertEqual(atom1.name, atom2.name)
+            positions = pdb.getPositions(frame=9)
+            self.assertFalse(all(x1 == x2 for x1, x2 in zip(positions, pdb.getPositions(frame=0))))
+            # There should only be 10 frames (0 through 9)
+            self.assertRaises(IndexError, lambda: pdb.getPositions(frame=10))
+            self.assertAlmostEqualVec(parm.topology.getPeriodicBoxVectors()[0],
+                                      pdb.topology.getPeriodicBoxVectors()[0],
+                                      places=5)
+            self.assertAlmostEqualVec(parm.topology.getPeriodicBoxVectors()[1],
+                                      pdb.topology.getPeriodicBoxVectors()[1],
+                                      places=5)
+            self.assertAlmostEqualVec(parm.topology.getPeriodicBoxVectors()[2],
+                                      pdb.topology.getPeriodicBoxVectors()[2],
+                                      places=5)
+            del sim
 
     def testBonds(self):
         """Test reading and writing a file that includes bonds."""
@@ -210,5 +212,41 @@ class TestPdbxFile(unittest.TestCase):
             self.assertEqual(id, res.id)
             self.assertEqual(code, res.insertionCode)
 
+    def testReadSelectedCategories(self):
+        """Test reading only selected categories with the low level reader."""
+        from openmm.app.internal.pdbx.reader.PdbxReader import PdbxReader
+        with open('systems/6mvz.cif') as input:
+            allData = []
+            PdbxReader(input).read(allData)
+        with open('systems/6mvz.cif') as input:
+            selectedData = []
+            PdbxReader(input).read(selectedData, selectList=['atom_site', 'cell', 'struct_conn'])
+        self.assertEqual(len(allData), len(selectedData))
+        self.assertEqual(['atom_site', 'cell', 'struct_conn'], sorted(selectedData[0].getObjNameList()))
+        for name in ('atom_site', 'cell', 'struct_conn'):
+            obj1 = allData[0].getObj(name)
+            obj2 = selectedData[0].getObj(name)
+            self.assertEqual(obj1.getAttributeList(), obj2.getAttributeList())
+            self.assertEqual(obj1.getRowList(), obj2.getRowList())
+
+    def testMultipleModels(self):
+        """Write and read a file containing multiple models."""
+        pdb = PDBFile('systems/alanine-dipeptide-implicit.pdb')
+        output = StringIO()
+        PDBxFile.writeHeader(pdb.topology, output)
+        for i in range(3):
+            positions = [p+Vec3(i, 0, 0) for p in pdb.positions.value_in_unit(nanometers)]*nanometers
+            PDBxFile.writeModel(pdb.topology, positions, output, modelIndex=i+1)
+        pdbx = PDBxFile(StringIO(output.getvalue()))
+        self.assertEqual(3, pdbx.getNumFrames())
+        for i in range(3):
+            positions = pdbx.getPositions(frame=i)
+            numpyPositions = pdbx.getPositions(asNumpy=True, frame=i)
+            for p1, p2, p3 in zip(pdb.positions, positions, numpyPositions):
+                p1 = p1.value_in_unit(nanometers)+Vec3(i, 0, 0)
+                for j in range(3):
+                    self.assertAlmostEqual(p1[j], p2[j].value_in_unit(nanometers), places=4)
+                    self.assertAlmostEqual(p2[j].value_in_unit(nanometers), p3[j].value_in_unit(nanometers))
+
 if __name__ == '__main__':
     unittest.main()
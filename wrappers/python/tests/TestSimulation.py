@@ -1,5 +1,9 @@
+import gc
 import unittest
 import tempfile
+import threading
+import time
+import weakref
 from datetime import datetime, timedelta
 from io import BytesIO, StringIO
 from openmm import *
@@ -269,6 +273,106 @@ class TestSimulation(unittest.TestCase):
         
         simulation.step(500)
 
+    def testAsyncReporting(self):
+        """Test running reporters on a background thread."""
+        pdb = PDBFile('systems/alanine-dipeptide-implicit.pdb')
+        ff = ForceField('amber99sb.xml', 'tip3p.xml')
+        system = ff.createSystem(pdb.topology)
+        integrator = VerletIntegrator(0.001*picoseconds)
+
+        class RecordingReporter(object):
+            def __init__(self, interval, asynchronous):
+                self.interval = interval
+                self.asynchronous = asynchronous
+                self.steps = []
+                self.threads = set()
+
+            def describeNextReport(self, simulation):
+                steps = self.interval - simulation.currentStep%self.interval
+                return {'steps':steps, 'periodic':None, 'include':['positions'], 'asynchronous':self.asynchronous}
+
+            def report(self, simulation, state):
+                assert simulation.currentStep == state.getStepCount()
+                self.steps.append(simulation.currentStep)
+                self.threads.add(threading.get_ident())
+
+        class FailingReporter(RecordingReporter):
+            def report(self, simulation, state):
+                raise ValueError('Failed to write report')
+
+        simulation = Simulation(pdb.topology, system, integrator, Platform.getPlatform('Reference'), asyncReporting=True, reportQueueSize=2)
+        simulation.context.setPositions(pdb.positions)
+        asyncReporter = RecordingReporter(3, True)
+        syncReporter = RecordingReporter(5, False)
+        simulation.reporters.append(asyncReporter)
+        simulation.reporters.append(syncReporter)
+
+        # All reports should be complete, and in order, as soon as step() returns.
+
+        simulation.step(30)
+        self.assertEqual(list(range(3, 31, 3)), asyncReporter.steps)
+        self.assertEqual(list(range(5, 31, 5)), syncReporter.steps)
+        self.assertEqual({threading.get_ident()}, syncReporter.threads)
+        self.assertNotIn(threading.get_ident(), asyncReporter.threads)
+
+        # Errors in a background reporter should be raised in the calling thread.
+
+        simulation.reporters.append(FailingReporter(2, True))
+        with self.assertRaises(ValueError):
+            simulation.step(10)
+
+        # An error in the simulation itself should not be replaced by an error in a background reporter.
+
+        class InterruptingReporter(RecordingReporter):
+            def report(self, simulation, state):
+                raise KeyError('Simulation failed')
+
+        simulation.reporters[-1] = FailingReporter(7, True)
+        simulation.reporters.append(InterruptingReporter(7, False))
+        with self.assertRaises(KeyError):
+            simulation.step(10)
+
+        # The background thread should be reused by later calls to step(), should not keep the Simulation alive,
+        # and should exit once the Simulation is deleted.
+
+        del simulation.reporters[-2:]
+        thread = simulation._reportThread
+        simulation.step(10)
+        self.assertIs(thread, simulation._reportThread)
+        self.assertTrue(thread.is_alive())
+        ref = weakref.ref(simulation)
+        del simulation
+        gc.collect()
+        self.assertIsNone(ref())
+        thread.join(10)
+        self.assertFalse(thread.is_alive())
+
+    def testAsyncReportingClockTime(self):
+        """Test that background reporters measure the clock time when the report was requested."""
+        pdb = PDBFile('systems/alanine-dipeptide-implicit.pdb')
+        ff = ForceField('amber99sb.xml', 'tip3p.xml')
+        system = ff.createSystem(pdb.topology)
+        integrator = VerletIntegrator(0.001*picoseconds)
+
+        class SlowReporter(object):
+            def describeNextReport(self, simulation):
+                return {'steps':1, 'periodic':None, 'include':[], 'asynchronous':True}
+
+            def report(self, simulation, state):
+                time.sleep(0.05)
+
+        # The reports are all queued almost immediately, but take at least 0.5 seconds to process.
+
+        simulation = Simulation(pdb.topology, system, integrator, Platform.getPlatform('Reference'), asyncReporting=True, reportQueueSize=100)
+        simulation.context.setPositions(pdb.positions)
+        output = StringIO()
+        simulation.reporters.append(SlowReporter())
+        simulation.reporters.append(StateDataReporter(output, 1, step=True, elapsedTime=True, separator=' '))
+        simulation.step(10)
+        lines = output.getvalue().splitlines()[1:]
+        self.assertEqual(10, len(lines))
+        self.assertLess(float(lines[-1].split()[1]), 0.25)
+
     def testMinimizationReporter(self):
         """Test invoking a reporter during minimization."""
         pdb = PDBFile('systems/alanine-dipeptide-implicit.pdb')
@@ -1,5 +1,6 @@
 import unittest
 import openmm as mm
+import openmm.unit as unit
 
 
 class TestSwigWrappers(unittest.TestCase):
@@ -11,5 +12,68 @@ class TestSwigWrappers(unittest.TestCase):
             system = mm.System()
             system.getDefaultPeriodicBoxVectors()
 
+    def testBulkAdd(self):
+        """Test the methods for adding many terms to a force at once."""
+        bonds = mm.HarmonicBondForce()
+        bonds.addBond(0, 1, 0.1, 100.0)
+        self.assertEqual(1, bonds.addBonds([(1, 2), (2, 3)], [(0.15, 200.0), (0.2, 300.0)]))
+        self.assertEqual(3, bonds.getNumBonds())
+        p1, p2, length, k = bonds.getBondParameters(2)
+        self.assertEqual((2, 3), (p1, p2))
+        self.assertAlmostEqual(0.2, length.value_in_unit(unit.nanometers))
+        self.assertAlmostEqual(300.0, k.value_in_unit(unit.kilojoules_per_mole/unit.nanometers**2))
+        with self.assertRaises(ValueError):
+            bonds.addBonds([(1, 2), (2, 3)], [(0.15, 200.0)])
+
+        angles = mm.HarmonicAngleForce()
+        self.assertEqual(0, angles.addAngles([(0, 1, 2)], [(1.5, 50.0)]))
+        p1, p2, p3, angle, k = angles.getAngleParameters(0)
+        self.assertEqual((0, 1, 2), (p1, p2, p3))
+        self.assertAlmostEqual(1.5, angle.value_in_unit(unit.radians))
+
+        torsions = mm.PeriodicTorsionForce()
+        self.assertEqual(0, torsions.addTorsions([(0, 1, 2, 3), (3, 2, 1, 0)], [2, 3], [(0.5, 1.0), (1.5, 2.0)]))
+        p1, p2, p3, p4, periodicity, phase, k = torsions.getTorsionParameters(1)
+        self.assertEqual((3, 2, 1, 0, 3), (p1, p2, p3, p4, periodicity))
+        self.assertAlmostEqual(2.0, k.value_in_unit(unit.kilojoules_per_mole))
+
+        nonbonded = mm.NonbondedForce()
+        self.assertEqual(0, nonbonded.addParticles([(0.5, 0.3, 1.0), (-0.5, 0.2, 0.5)]))
+        self.assertEqual(2, nonbonded.getNumParticles())
+        charge, sigma, epsilon = nonbonded.getParticleParameters(1)
+        self.assertAlmostEqual(-0.5, charge.value_in_unit(unit.elementary_charge))
+        self.assertEqual(2, nonbonded.addParticles([]))
+        nonbonded.addParticles([(0.0, 0.1, 0.0)]*2)
+        self.assertEqual(0, nonbonded.addExceptions([(0, 1), (2, 3)], [(0.25, 0.3, 0.5), (0.0, 0.1, 0.0)]))
+        self.assertEqual(2, nonbonded.getNumExceptions())
+        p1, p2, chargeProd, sigma, epsilon = nonbonded.getExceptionParameters(0)
+        self.assertEqual((0, 1), (p1, p2))
+        self.assertAlmostEqual(0.25, chargeProd.value_in_unit(unit.elementary_charge**2))
+        self.assertAlmostEqual(0.5, epsilon.value_in_unit(unit.kilojoules_per_mole))
+        with self.assertRaises(Exception):
+            nonbonded.addExceptions([(1, 0)], [(0.0, 0.1, 0.0)])
+        nonbonded.addExceptions([(1, 0)], [(0.0, 0.1, 0.0)], replace=True)
+        self.assertEqual(2, nonbonded.getNumExceptions())
+
+        custom = mm.CustomNonbondedForce('a1*a2*b1*b2/r')
+        custom.addPerParticleParameter('a')
+        custom.addPerParticleParameter('b')
+        self.assertEqual(0, custom.addParticles([(1.0, 2.0), (3.0, 4.0)]))
+        self.assertEqual(2, custom.getNumParticles())
+        self.assertEqual((3.0, 4.0), tuple(custom.getParticleParameters(1)))
+        with self.assertRaises(ValueError):
+            custom.addParticles([1.0, 2.0, 3.0])
+
+        system = mm.System()
+        self.assertEqual(0, system.addParticles([12.0, 1.0, 1.0]))
+        self.assertEqual(3, system.getNumParticles())
+        self.assertAlmostEqual(12.0, system.getParticleMass(0).value_in_unit(unit.amu))
+        self.assertEqual(0, system.addConstraints([(0, 1), (0, 2)], [0.1, 0.11]))
+        p1, p2, distance = system.getConstraintParameters(1)
+        self.assertEqual((0, 2), (p1, p2))
+        self.assertAlmostEqual(0.11, distance.value_in_unit(unit.nanometers))
+        with self.assertRaises(ValueError):
+            system.addConstraints([(0, 1)], [0.1, 0.2])
+
 if __name__ == '__main__':
     unittest.main()
@@ -59,5 +59,52 @@ class TestTopology(unittest.TestCase):
         self.assertEqual(internal_bonds, [ (atom_B1, atom_B2) ])
         self.assertEqual(external_bonds, [ (atom_A1, atom_B1), (atom_B2, atom_C1) ])
 
+    def test_interleaved_residue_bonds(self):
+        """Test retrieving bonds for residues whose atoms are not contiguous."""
+        # atom order = A1 B1 A2 B2, connectivity = A1-A2, B1-B2, A2-|-B2
+        # addAtom() requires contiguous atoms, so reassign B1 and A2 to interleave the residues.
+        topology = Topology()
+        chain = topology.addChain(id='A')
+        residue1 = topology.addResidue('AAA', chain)
+        residue2 = topology.addResidue('BBB', chain)
+        atom_A1 = topology.addAtom('A1', element.carbon, residue1)
+        atom_B1 = topology.addAtom('B1', element.carbon, residue1)
+        atom_A2 = topology.addAtom('A2', element.carbon, residue2)
+        atom_B2 = topology.addAtom('B2', element.carbon, residue2)
+        residue1._atoms = [atom_A1, atom_A2]
+        residue2._atoms = [atom_B1, atom_B2]
+        atom_B1.residue = residue2
+        atom_A2.residue = residue1
+        topology.addBond(atom_A1, atom_A2)
+        topology.addBond(atom_B1, atom_B2)
+        topology.addBond(atom_A2, atom_B2)
+        self.assertEqual(list(residue1.bonds()), [ (atom_A1, atom_A2), (atom_A2, atom_B2) ])
+        self.assertEqual(list(residue1.internal_bonds()), [ (atom_A1, atom_A2) ])
+        self.assertEqual(list(residue1.external_bonds()), [ (atom_A2, atom_B2) ])
+        self.assertEqual(list(residue2.internal_bonds()), [ (atom_B1, atom_B2) ])
+        self.assertEqual(list(residue2.external_bonds()), [ (atom_A2, atom_B2) ])
+
+    def test_arrays(self):
+        """Test the arrays returned by atomArrays() and bondArray()."""
+        pdb = PDBFile('systems/1T2Y.pdb')
+        top = pdb.topology
+        atoms = list(top.atoms())
+        arrays = top.atomArrays()
+        self.assertEqual(len(atoms), len(arrays.element))
+        for i, atom in enumerate(atoms):
+            self.assertEqual(atom.element.atomic_number, arrays.element[i])
+            self.assertEqual(atom.residue.index, arrays.residueIndex[i])
+            self.assertEqual(atom.residue.chain.index, arrays.chainIndex[i])
+            self.assertEqual(atom.name, arrays.names[arrays.nameIndex[i]])
+        bonds = top.bondArray()
+        self.assertEqual((top.getNumBonds(), 2), bonds.shape)
+        for bond, indices in zip(top.bonds(), bonds):
+            self.assertEqual([bond[0].index, bond[1].index], list(indices))
+
+        # Adding a bond should update the array.
+
+        top.addBond(atoms[0], atoms[5])
+        self.assertEqual([0, 5], list(top.bondArray()[-1]))
+
 if __name__ == '__main__':
     unittest.main()
@@ -642,6 +642,25 @@ class TestUnits(QuantityTestCase):
         self.assertEqual(str(u.meters*u.meters), 'meter**2')
         self.assertEqual(str(u.meter*u.meter), 'meter**2')
 
+    def testConvertSequenceWithoutDeepCopy(self):
+        """ Tests that lists of numbers and Vec3s are converted without deep copies """
+        from openmm import Vec3
+        from unittest import mock
+        positions = [Vec3(i, 2*i, 3*i) for i in range(100)]*u.nanometers
+        numbers = (1.0, 2.0, 3)*u.nanometers
+        with mock.patch('copy.deepcopy', side_effect=AssertionError('deepcopy should not be called')):
+            same = positions.value_in_unit(u.nanometers)
+            scaled = positions.value_in_unit(u.angstroms)
+            scaledNumbers = numbers.in_units_of(u.angstroms)
+        self.assertIsNot(same, positions._value)
+        self.assertEqual(same, positions._value)
+        self.assertIsInstance(scaled, list)
+        self.assertIsInstance(scaled[1], Vec3)
+        for i in range(100):
+            self.assertAlmostEqual(scaled[i][2], 30*i)
+        self.assertIsInstance(scaledNumbers._value, tuple)
+        self.assertAlmostEqualQuantities(scaledNumbers[2], 30*u.angstroms)
+
 @unittest.skipIf(np is None, 'Skipping numpy units tests')
 class TestNumpyUnits(QuantityTestCase):
 
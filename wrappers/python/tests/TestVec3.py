@@ -52,3 +52,35 @@ class TestVectors(TestCase):
         self.assertEqual(vec1 / factor, result)
         with self.assertRaises(TypeError):
             2 / vec1
+
+    def testVec3Pickle(self):
+        import copy, pickle
+        vec1 = Vec3(1.5, 2, 3)
+        for vec2 in (pickle.loads(pickle.dumps(vec1)), copy.deepcopy(vec1), copy.copy(vec1)):
+            self.assertEqual(vec1, vec2)
+            self.assertIs(type(vec2), Vec3)
+        self.assertEqual(vec1._asdict(), {'x': 1.5, 'y': 2, 'z': 3})
+        self.assertEqual(vec1._replace(y=5), Vec3(1.5, 5, 3))
+
+    def testArrayConversion(self):
+        import numpy as np
+        from openmm import unit
+        from openmm.vec3 import arrayToVec3List, vec3ListToArray
+        array = np.arange(30.0).reshape((10, 3))
+        vectors = arrayToVec3List(array)
+        self.assertEqual(10, len(vectors))
+        for i in range(10):
+            self.assertIs(type(vectors[i]), Vec3)
+            self.assertEqual(vectors[i], Vec3(3*i, 3*i+1, 3*i+2))
+        np.testing.assert_array_equal(array, vec3ListToArray(vectors))
+        np.testing.assert_array_equal(array, vec3ListToArray([tuple(v) for v in vectors]))
+        quantity = vec3ListToArray(vectors*unit.nanometers)
+        self.assertEqual(unit.nanometers, quantity.unit)
+        np.testing.assert_array_equal(array, quantity._value)
+        self.assertEqual(vectors, arrayToVec3List(array*unit.angstroms).value_in_unit(unit.angstroms))
+        for shape in [(3, 4), (3, 2), (12,), (2, 2, 3)]:
+            badArray = np.zeros(shape)
+            with self.assertRaises(ValueError):
+                arrayToVec3List(badArray)
+            with self.assertRaises(ValueError):
+                vec3ListToArray(badArray)
@@ -8,7 +8,7 @@ from openmm import app
 from random import random
 import openmm as mm
 import numpy as np
-from openmm.app.internal.xtc_utils import read_xtc
+from openmm.app.internal.xtc_utils import read_xtc, get_xtc_frame_offsets
 
 class TestXtcFile(unittest.TestCase):
     def test_xtc_triclinic(self):
@@ -177,6 +177,86 @@ class TestXtcFile(unittest.TestCase):
             )
             self.assertTrue(np.allclose(step, np.arange(0, nframes), atol=1e-5))
 
+    def testRead(self):
+        """Test reading frames and chunks of frames with XTCFile.read()"""
+        with tempfile.TemporaryDirectory() as temp:
+            fname = os.path.join(temp, "traj.xtc")
+            pdbfile = app.PDBFile("systems/alanine-dipeptide-implicit.pdb")
+            pdbfile.topology.setUnitCellDimensions([10, 10, 10])
+            natom = pdbfile.topology.getNumAtoms()
+            nframes = 11
+            xtc = app.XTCFile(fname, pdbfile.topology, 0.001, firstStep=5, interval=2)
+            coords = []
+            for i in range(nframes):
+                coords.append(np.random.random((natom, 3)))
+                xtc.writeModel(coords[i] * unit.nanometers, unitCellDimensions=mm.Vec3(1 + i, 2, 3) * unit.nanometers)
+            coords = np.array(coords)
+            traj = app.XTCFile.read(fname)
+            self.assertEqual(nframes, len(traj))
+            self.assertEqual(natom, traj.getNumAtoms())
+            self.assertTrue(os.path.isfile(fname + ".offsets"))
+
+            # Read individual frames.
+
+            for i in (0, 7, 10):
+                positions = traj.getPositions(i, asNumpy=True).value_in_unit(unit.nanometers)
+                self.assertTrue(np.allclose(coords[i], positions, atol=1e-3))
+                box = traj.getPeriodicBoxVectors(i).value_in_unit(unit.nanometers)
+                self.assertTrue(np.allclose(np.diag([1 + i, 2, 3]), np.array(box), atol=1e-3))
+
+            # Read the file in chunks with a stride and an atom subset.
+
+            atoms = [4, 0, 9]
+            chunks = list(traj.iterChunks(chunkSize=2, atomSubset=atoms, stride=3))
+            self.assertEqual([2, 2], [len(c[0]) for c in chunks])
+            positions = np.concatenate([c[0] for c in chunks])
+            self.assertTrue(np.allclose(coords[::3][:, atoms], positions, atol=1e-3))
+            self.assertTrue(np.array_equal([5, 11, 17, 23], np.concatenate([c[3] for c in chunks])))
+
+            # Append more frames and make sure the saved index is extended.
+
+            xtc = app.XTCFile(fname, pdbfile.topology, 0.001, append=True)
+            self.assertEqual(nframes, xtc._modelCount)
+            xtc.writeModel(coords[0] * unit.nanometers)
+            index = np.fromfile(fname + ".offsets", dtype="<i8")
+            self.assertTrue(np.array_equal(get_xtc_frame_offsets(fname.encode("utf-8")), index))
+            traj = app.XTCFile.read(fname)
+            self.assertEqual(nframes + 1, traj.getNumFrames())
+            positions = traj.readFrames(-1)[0][0]
+            self.assertTrue(np.allclose(coords[0], positions, atol=1e-3))
+
+    def testAppendWithStaleIndex(self):
+        """Test that an index which does not match the trajectory is rebuilt"""
+        with tempfile.TemporaryDirectory() as temp:
+            fname = os.path.join(temp, "traj.xtc")
+            pdbfile = app.PDBFile("systems/alanine-dipeptide-implicit.pdb")
+            natom = pdbfile.topology.getNumAtoms()
+            xtc = app.XTCFile(fname, pdbfile.topology, 0.001)
+            for i in range(3):
+                xtc.writeModel(np.random.random((natom, 3)) * unit.nanometers)
+
+            # Write an index claiming the file is longer than it really is.
+
+            with open(fname + ".offsets", "wb") as f:
+                f.write(np.arange(10, dtype="<i8").tobytes() * 1000)
+            xtc = app.XTCFile(fname, pdbfile.topology, 0.001, append=True)
+            self.assertEqual(3, xtc._modelCount)
+            xtc.writeModel(np.random.random((natom, 3)) * unit.nanometers)
+            self.assertEqual(4, xtc._getNumFrames())
+            index = np.fromfile(fname + ".offsets", dtype="<i8")
+            self.assertTrue(np.array_equal(get_xtc_frame_offsets(fname.encode("utf-8")), index))
+
+            # Indices whose first and last entries are plausible but whose last frame does not match the file.
+
+            offsets = get_xtc_frame_offsets(fname.encode("utf-8"))
+            for badIndex in ([0, 4], [0, offsets[-1]], [0, offsets[1], offsets[2] + 4], [0, offsets[1] + 4, offsets[2]]):
+                with open(fname + ".offsets", "wb") as f:
+                    f.write(np.array(badIndex, dtype="<i8").tobytes())
+                traj = app.XTCFile.read(fname)
+                self.assertEqual(4, traj.getNumFrames())
+                index = np.fromfile(fname + ".offsets", dtype="<i8")
+                self.assertTrue(np.array_equal(offsets, index))
+
     def testLongTrajectory(self):
         """Test writing a trajectory that has more than 2^31 steps."""
         with tempfile.TemporaryDirectory() as temp: